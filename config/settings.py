@@ -124,6 +124,34 @@ class Settings:
         return get_env_var("MCP_TOOLS_DIRECTORY", 
                          self.config.get("tools_directory", "./tools"))
     
+    @property
+    def resource_roots(self) -> List[str]:
+        """Get directories exposed as resources.
+        
+        Returns:
+            List of resource root directories
+        """
+        roots_env = get_env_var("MCP_RESOURCE_ROOTS", None)
+        if roots_env:
+            return [r for r in roots_env.split(os.pathsep) if r]
+        return self.config.get("resource_roots", [])
+    
+    @property
+    def max_file_size_mb(self) -> float:
+        """Get the maximum size of a single resource read.
+        
+        Returns:
+            Maximum read size in megabytes
+        """
+        size_env = get_env_var("MCP_MAX_FILE_SIZE_MB", None)
+        if size_env:
+            try:
+                return float(size_env)
+            except ValueError:
+                logging.error(f"Invalid MCP_MAX_FILE_SIZE_MB: {size_env}")
+        security = self.config.get("security", {})
+        return self.config.get("max_file_size_mb", security.get("max_file_size_mb", 10))
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert settings to dictionary.
         
@@ -137,5 +165,7 @@ class Settings:
             "rate_limit": self.rate_limit,
             "cors_origins": self.cors_origins,
             "tools_directory": self.tools_directory,
+            "resource_roots": self.resource_roots,
+            "max_file_size_mb": self.max_file_size_mb,
             # Don't include API keys for security
         }
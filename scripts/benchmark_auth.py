@@ -0,0 +1,53 @@
+"""Benchmark API key verification against the number of configured keys."""
+
+import argparse
+import hmac
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.server.auth import Authentication
+
+
+def linear_verify(api_keys, api_key: str) -> bool:
+    """Verify a key by comparing it with every configured key, as before indexing."""
+    return any(hmac.compare_digest(key, api_key) for key in api_keys)
+
+
+def time_per_call(func, iterations: int) -> float:
+    """Run func iterations times and return the mean time per call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    """Print verification latency for growing key counts."""
+    parser = argparse.ArgumentParser(description="Benchmark API key verification")
+    parser.add_argument("--sizes", type=str, default="1,10,100,1000,10000,100000",
+                        help="Comma-separated numbers of configured keys")
+    parser.add_argument("--iterations", type=int, default=2000,
+                        help="Verifications per measurement")
+    args = parser.parse_args()
+
+    print(f"{'keys':>8} {'indexed hit':>13} {'indexed miss':>13} {'linear hit':>12} {'linear miss':>12}  (µs/call)")
+    for size in (int(s) for s in args.sizes.split(",")):
+        keys = [Authentication.generate_key() for _ in range(size)]
+        auth = Authentication(keys)
+        # Worst case for the linear scan: the last key, or no match at all
+        hit, miss = keys[-1], Authentication.generate_key()
+        # Keep the linear runs short for large key counts
+        linear_iterations = max(10, args.iterations * 100 // max(size, 100))
+
+        print(f"{size:>8} "
+              f"{time_per_call(lambda: auth.verify_key(hit), args.iterations):>13.2f} "
+              f"{time_per_call(lambda: auth.verify_key(miss), args.iterations):>13.2f} "
+              f"{time_per_call(lambda: linear_verify(keys, hit), linear_iterations):>12.2f} "
+              f"{time_per_call(lambda: linear_verify(keys, miss), linear_iterations):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark the rate limiting algorithms against the per-client limit."""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.server.rate_limiter import ALGORITHMS, RateLimiter
+
+
+def time_per_call(limiter: RateLimiter, limit: int, iterations: int) -> float:
+    """Check one client iterations times and return the mean time per call in microseconds."""
+    check = limiter.check_rate_limit
+    start = time.perf_counter()
+    for _ in range(iterations):
+        check("client", limit)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bytes_per_client(algorithm: str, limit: int, clients: int) -> float:
+    """Measure the memory held per client once each has used its whole limit."""
+    tracemalloc.start()
+    limiter = RateLimiter(limit=limit, algorithm=algorithm)
+    before = tracemalloc.get_traced_memory()[0]
+    for client in range(clients):
+        client_id = f"client-{client}"
+        for _ in range(limit):
+            limiter.check_rate_limit(client_id)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / clients
+
+
+def throughput(shards: int, threads: int, checks_per_thread: int) -> float:
+    """Run concurrent checks on distinct clients and return checks per second."""
+    limiter = RateLimiter(limit=10 ** 9, algorithm="gcra", shards=shards)
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index: int):
+        client_ids = [f"client-{index}-{i}" for i in range(64)]
+        check = limiter.check_rate_limit
+        barrier.wait()
+        for i in range(checks_per_thread):
+            check(client_ids[i & 63])
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * checks_per_thread / (time.perf_counter() - start)
+
+
+def main():
+    """Print check latency and memory per client for growing limits, and throughput by thread count."""
+    parser = argparse.ArgumentParser(description="Benchmark rate limiting algorithms")
+    parser.add_argument("--limits", type=str, default="10,100,1000,10000",
+                        help="Comma-separated requests-per-minute limits")
+    parser.add_argument("--iterations", type=int, default=100000,
+                        help="Checks per latency measurement")
+    parser.add_argument("--clients", type=int, default=50,
+                        help="Clients filled to their limit for the memory measurement")
+    parser.add_argument("--threads", type=str, default="1,2,4,8,16",
+                        help="Comma-separated thread counts for the throughput measurement")
+    parser.add_argument("--shards", type=str, default="1,16",
+                        help="Comma-separated stripe counts for the throughput measurement")
+    args = parser.parse_args()
+
+    header = " ".join(f"{a + ' µs':>20} {a + ' B/client':>24}" for a in ALGORITHMS)
+    print(f"{'limit':>8} {header}")
+    for limit in (int(s) for s in args.limits.split(",")):
+        row = []
+        for algorithm in ALGORITHMS:
+            # Most checks run past the limit, as for a client held at its limit
+            latency = time_per_call(RateLimiter(limit=limit, algorithm=algorithm), limit, args.iterations)
+            memory = bytes_per_client(algorithm, limit, args.clients)
+            row.append(f"{latency:>20.2f} {memory:>24.0f}")
+        print(f"{limit:>8} {' '.join(row)}")
+
+    shard_counts = [int(s) for s in args.shards.split(",")]
+    print()
+    print(f"{'threads':>8} " + " ".join(f"{f'{n} shard(s) checks/s':>24}" for n in shard_counts))
+    for threads in (int(s) for s in args.threads.split(",")):
+        # Keep the total work the same for every thread count
+        per_thread = max(1, args.iterations // threads)
+        print(f"{threads:>8} " + " ".join(f"{throughput(n, threads, per_thread):>24,.0f}" for n in shard_counts))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,39 @@
 
 """Authentication module for the secure MCP server."""
 
-import hmac
+import hashlib
 import secrets
-from typing import List, Optional, Tuple
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .policy import DEFAULT_POLICY, KeyPolicy
+
+
+class KeyRecord:
+    """Index entry of one API key: its digest, identifier and policy."""
+    
+    __slots__ = ('digest', 'key_id', 'policy')
+    
+    def __init__(self, digest: bytes, policy: KeyPolicy):
+        self.digest = digest
+        self.key_id = digest.hex()[:16]
+        self.policy = policy
 
 
 class Authentication:
-    """Handles API key authentication for the secure MCP server."""
+    """Handles API key authentication for the secure MCP server.
+    
+    Keys are indexed by their SHA-256 digest, so verifying a key is a
+    single dictionary lookup however many keys are configured. The lookup
+    is not constant time, but it compares digests rather than the keys
+    themselves, so timing can only reveal how the SHA-256 digest of a
+    guess relates to the stored digests, which does not help construct
+    a valid key.
+    
+    The index is never modified in place: changes build a new index and
+    swap it in with a single assignment, so verification never waits on
+    a lock while keys are reloaded.
+    """
 
     def __init__(self, api_keys: List[str]):
         """Initialize with a list of valid API keys.
@@ -15,7 +41,53 @@ class Authentication:
         Args:
             api_keys: List of valid API keys
         """
-        self.api_keys = api_keys
+        self._write_lock = threading.Lock()
+        self.replace_keys(api_keys)
+    
+    @staticmethod
+    def _digest(api_key: str) -> bytes:
+        """Hash an API key for the lookup index."""
+        return hashlib.sha256(api_key.encode('utf-8')).digest()
+    
+    def replace_keys(self, api_keys: List[str], policies: Optional[Dict[str, KeyPolicy]] = None):
+        """Atomically replace the set of valid API keys.
+        
+        Args:
+            api_keys: The new list of valid API keys
+            policies: Policy of each key; keys not listed get the default policy
+        """
+        policies = policies or {}
+        digests: Dict[bytes, KeyRecord] = {}
+        for key in api_keys:
+            if key:
+                digest = self._digest(key)
+                digests[digest] = KeyRecord(digest, policies.get(key, DEFAULT_POLICY))
+        with self._write_lock:
+            self.api_keys = list(api_keys)
+            self._digests = digests
+    
+    def add_key(self, api_key: str, policy: KeyPolicy = DEFAULT_POLICY):
+        """Add a valid API key.
+        
+        Args:
+            api_key: The API key to accept
+            policy: The key's policy
+        """
+        if not api_key:
+            return
+        digest = self._digest(api_key)
+        with self._write_lock:
+            if digest in self._digests:
+                return
+            digests = dict(self._digests)
+            digests[digest] = KeyRecord(digest, policy)
+            self.api_keys = self.api_keys + [api_key]
+            self._digests = digests
+    
+    @property
+    def key_count(self) -> int:
+        """Number of valid API keys."""
+        return len(self._digests)
     
     @staticmethod
     def generate_key() -> str:
@@ -26,6 +98,37 @@ class Authentication:
         """
         return secrets.token_urlsafe(32)
     
+    @staticmethod
+    def key_id(api_key: str) -> str:
+        """Derive a stable, non-secret identifier for an API key.
+        
+        The identifier is safe to use in logs, statistics and as the
+        owner of per-client state such as queues and jobs.
+        
+        Args:
+            api_key: The API key
+        
+        Returns:
+            Short hex identifier for the key
+        """
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+    
+    def authenticate(self, api_key: str) -> Optional[KeyRecord]:
+        """Look up a presented API key.
+        
+        Args:
+            api_key: The API key to look up
+        
+        Returns:
+            The key's record with its identifier and policy, or None if the key is invalid
+        """
+        digests = self._digests
+        if not api_key or not digests:
+            return None
+        
+        digest = self._digest(api_key)
+        return digests.get(digest)
+    
     def verify_key(self, api_key: str) -> bool:
         """Verify if the provided API key is valid.
         
@@ -35,15 +138,7 @@ class Authentication:
         Returns:
             True if the API key is valid, False otherwise
         """
-        if not api_key or not self.api_keys:
-            return False
-            
-        # Use constant time comparison to prevent timing attacks
-        return any(
-            hmac.compare_digest(key, api_key)
-            for key in self.api_keys
-            if key and api_key
-        )
+        return self.authenticate(api_key) is not None
     
     def extract_api_key(self, authorization_header: Optional[str]) -> Optional[str]:
         """Extract API key from Authorization header.
@@ -0,0 +1,176 @@
+"""Brute-force protection: tracks authentication failures and bans offenders."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class _FailureTable:
+    """Bounded map of failure counters and bans, oldest entries evicted first.
+
+    Entries are kept in the order they were last touched, so expired
+    entries collect at the front and are swept from there.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # subject -> (window_start, failures, banned_until)
+        self.entries: "OrderedDict[Hashable, Tuple[float, int, float]]" = OrderedDict()
+        self.evicted = 0
+
+    def sweep(self, now: float, window: float):
+        """Drop entries whose failure window and ban have both ended."""
+        entries = self.entries
+        while entries:
+            subject, (window_start, _, banned_until) = next(iter(entries.items()))
+            if window_start + window > now or banned_until > now:
+                break
+            del entries[subject]
+
+    def bound(self):
+        """Evict the least recently touched entries beyond max_entries."""
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evicted += 1
+
+
+class BanList:
+    """Tracks failed authentications per client IP and per credential prefix.
+
+    A subject with ``max_failures`` failures within ``window`` seconds is
+    banned for ``ban_duration`` seconds. Banned IPs are turned away when
+    their connection is accepted; credentials starting with a banned
+    prefix are rejected as soon as the Authorization header is read,
+    without looking the key up or reading the body. Both tables are
+    bounded by ``max_entries`` and expire on their own.
+    """
+
+    def __init__(self, max_failures: int = 10, window: float = 60.0,
+                 ban_duration: float = 300.0, max_entries: int = 10000,
+                 prefix_length: int = 8):
+        """Initialize the ban list.
+
+        Args:
+            max_failures: Failures within the window that trigger a ban
+            window: Seconds over which failures are counted
+            ban_duration: Seconds a ban lasts
+            max_entries: Maximum subjects tracked per table
+            prefix_length: Characters of a credential used as its prefix
+        """
+        self.max_failures = max_failures
+        self.window = window
+        self.ban_duration = ban_duration
+        self.prefix_length = prefix_length
+        self._ips = _FailureTable(max_entries)
+        self._prefixes = _FailureTable(max_entries)
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.bans = 0
+        self.rejected_ips = 0
+        self.rejected_prefixes = 0
+
+    def credential_prefix(self, credential: Optional[str]) -> Optional[str]:
+        """Get the prefix of a credential that failures are tracked by.
+
+        Args:
+            credential: The presented API key or token
+
+        Returns:
+            The prefix, or None for credentials too short to track
+        """
+        if not credential or len(credential) < self.prefix_length * 2:
+            return None
+        return credential[:self.prefix_length]
+
+    def is_ip_banned(self, ip: str) -> bool:
+        """Check whether a client IP is banned, counting the rejection.
+
+        Args:
+            ip: The client IP address
+
+        Returns:
+            True if connections from the IP should be refused
+        """
+        if self._is_banned(self._ips, ip):
+            with self._lock:
+                self.rejected_ips += 1
+            return True
+        return False
+
+    def is_credential_banned(self, credential: Optional[str]) -> bool:
+        """Check whether a credential's prefix is banned, counting the rejection.
+
+        Args:
+            credential: The presented API key or token
+
+        Returns:
+            True if the credential should be rejected without lookup
+        """
+        prefix = self.credential_prefix(credential)
+        if prefix is not None and self._is_banned(self._prefixes, prefix):
+            with self._lock:
+                self.rejected_prefixes += 1
+            return True
+        return False
+
+    def _is_banned(self, table: _FailureTable, subject: Hashable) -> bool:
+        """Check a subject's ban without touching its position."""
+        entry = table.entries.get(subject)
+        return entry is not None and entry[2] > time.monotonic()
+
+    def record_failure(self, ip: str, credential: Optional[str] = None) -> bool:
+        """Record a failed authentication.
+
+        Args:
+            ip: The client IP address
+            credential: The presented API key or token, if any
+
+        Returns:
+            True if the failure got the IP or the credential prefix banned
+        """
+        now = time.monotonic()
+        prefix = self.credential_prefix(credential)
+        with self._lock:
+            self.failures += 1
+            banned = self._count(self._ips, ip, now)
+            if prefix is not None:
+                banned = self._count(self._prefixes, prefix, now) or banned
+            return banned
+
+    def _count(self, table: _FailureTable, subject: Hashable, now: float) -> bool:
+        """Count a failure for a subject, banning it at the threshold. Caller must hold the lock."""
+        table.sweep(now, self.window)
+        window_start, failures, banned_until = table.entries.pop(subject, (now, 0, 0.0))
+        if window_start + self.window <= now:
+            window_start, failures = now, 0
+        failures += 1
+
+        newly_banned = failures >= self.max_failures and banned_until <= now
+        if newly_banned:
+            banned_until = now + self.ban_duration
+            window_start, failures = now, 0
+            self.bans += 1
+        table.entries[subject] = (window_start, failures, banned_until)
+        table.bound()
+        return newly_banned
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ban statistics.
+
+        Returns:
+            Dictionary with tracked subjects, active bans and rejection counters
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "tracked_ips": len(self._ips.entries),
+                "tracked_prefixes": len(self._prefixes.entries),
+                "banned_ips": sum(1 for entry in self._ips.entries.values() if entry[2] > now),
+                "banned_prefixes": sum(1 for entry in self._prefixes.entries.values() if entry[2] > now),
+                "failures": self.failures,
+                "bans": self.bans,
+                "rejected_ips": self.rejected_ips,
+                "rejected_prefixes": self.rejected_prefixes,
+                "evicted": self._ips.evicted + self._prefixes.evicted
+            }
@@ -0,0 +1,126 @@
+"""Per-tool concurrency limits (bulkheads) for the secure MCP server."""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .errors import MCPError
+
+
+class BulkheadFullError(MCPError):
+    """Raised when a tool call cannot get an execution slot."""
+
+    def __init__(self, tool_name: str, reason: str, retry_after: int = 1):
+        """Initialize the error.
+
+        Args:
+            tool_name: Name of the saturated tool
+            reason: Why the call was rejected ("queue_full" or "queue_timeout")
+            retry_after: Suggested seconds to wait before retrying
+        """
+        super().__init__(
+            -32001,
+            f"Tool {tool_name} is at capacity, please retry later",
+            {"retryable": True, "retry_after": retry_after, "reason": reason}
+        )
+        self.tool_name = tool_name
+        self.reason = reason
+
+
+class Bulkhead:
+    """Limits concurrent executions of a single tool with a bounded wait queue."""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int = 0,
+                 max_wait: Optional[float] = None):
+        """Initialize the bulkhead.
+
+        Args:
+            name: Name of the tool this bulkhead protects
+            max_concurrency: Maximum number of calls executing at once
+            max_queue: Maximum number of calls waiting for a slot
+            max_wait: Maximum seconds a call may wait in the queue (None waits forever)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """Acquire an execution slot, queueing if the tool is busy.
+
+        Args:
+            timeout: Maximum seconds to wait, overriding max_wait when smaller
+
+        Returns:
+            Seconds spent waiting in the queue
+
+        Raises:
+            BulkheadFullError: If the queue is full or the wait timed out
+        """
+        if self.max_wait is not None:
+            timeout = self.max_wait if timeout is None else min(timeout, self.max_wait)
+
+        with self._cond:
+            if self.active < self.max_concurrency and self.waiting == 0:
+                self.active += 1
+                self.accepted += 1
+                return 0.0
+
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise BulkheadFullError(self.name, "queue_full")
+
+            start = time.monotonic()
+            self.waiting += 1
+            try:
+                acquired = self._cond.wait_for(
+                    lambda: self.active < self.max_concurrency, timeout
+                )
+            finally:
+                self.waiting -= 1
+
+            waited = time.monotonic() - start
+            if not acquired:
+                self.timed_out += 1
+                raise BulkheadFullError(self.name, "queue_timeout")
+
+            self.active += 1
+            self.accepted += 1
+            self.total_wait += waited
+            self.max_wait_seen = max(self.max_wait_seen, waited)
+            return waited
+
+    def release(self):
+        """Release an execution slot and wake one queued call."""
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bulkhead statistics.
+
+        Returns:
+            Dictionary with limits, current load, rejections and queue wait times
+        """
+        with self._cond:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queued": self.waiting,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "avg_queue_wait_ms": round(self.total_wait / self.accepted * 1000, 3) if self.accepted else 0.0,
+                "max_queue_wait_ms": round(self.max_wait_seen * 1000, 3)
+            }
@@ -0,0 +1,187 @@
+"""Per-tool circuit breakers for the secure MCP server."""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from .errors import MCPError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(MCPError):
+    """Raised when a call is short-circuited by an open breaker."""
+
+    def __init__(self, tool_name: str, state: str, retry_after: int):
+        """Initialize the error.
+
+        Args:
+            tool_name: Name of the tool whose breaker rejected the call
+            state: Current breaker state
+            retry_after: Suggested seconds to wait before retrying
+        """
+        super().__init__(
+            -32002,
+            f"Tool {tool_name} is temporarily unavailable (circuit {state})",
+            {"retryable": True, "retry_after": retry_after, "circuit_state": state}
+        )
+        self.tool_name = tool_name
+        self.state = state
+
+
+class CircuitBreaker:
+    """Opens when a tool's recent calls fail or run slow too often.
+
+    The breaker tracks the outcome of the last ``window_size`` calls. Once at
+    least ``minimum_calls`` have been seen and either the failure rate or the
+    slow call rate reaches its threshold, the breaker opens and rejects calls
+    for ``open_duration`` seconds. It then lets ``half_open_max_calls`` probe
+    calls through; if all of them succeed the breaker closes again, and any
+    failed or slow probe reopens it.
+    """
+
+    def __init__(self, name: str,
+                 failure_rate_threshold: float = 0.5,
+                 slow_call_duration: Optional[float] = None,
+                 slow_call_rate_threshold: float = 1.0,
+                 window_size: int = 20,
+                 minimum_calls: int = 10,
+                 open_duration: float = 30.0,
+                 half_open_max_calls: int = 3):
+        """Initialize the circuit breaker.
+
+        Args:
+            name: Name of the tool this breaker protects
+            failure_rate_threshold: Fraction of failed calls that opens the breaker
+            slow_call_duration: Seconds after which a call counts as slow (None disables)
+            slow_call_rate_threshold: Fraction of slow calls that opens the breaker
+            window_size: Number of recent calls used to compute rates
+            minimum_calls: Calls required in the window before the breaker can open
+            open_duration: Seconds to stay open before allowing probe calls
+            half_open_max_calls: Number of probe calls allowed while half-open
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.window_size = window_size
+        self.minimum_calls = min(minimum_calls, window_size)
+        self.open_duration = open_duration
+        self.half_open_max_calls = max(1, half_open_max_calls)
+
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes = deque()
+        self._failures = 0
+        self._slow = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def before_call(self):
+        """Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the breaker is open or out of probe slots
+        """
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self.opened_at + self.open_duration - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, OPEN, math.ceil(remaining))
+                self.state = HALF_OPEN
+                self._probes_in_flight = 0
+                self._probe_successes = 0
+
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, HALF_OPEN, 1)
+                self._probes_in_flight += 1
+
+    def discard(self):
+        """Forget a call admitted by before_call() that never ran."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record(self, success: bool, duration: float):
+        """Record the outcome of a call admitted by before_call().
+
+        Args:
+            success: Whether the call succeeded
+            duration: Call duration in seconds
+        """
+        slow = self.slow_call_duration is not None and duration >= self.slow_call_duration
+
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if not success or slow:
+                    self._open()
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._close()
+                return
+
+            if self.state == OPEN:
+                # Call was admitted before the breaker opened
+                return
+
+            self._outcomes.append((not success, slow))
+            self._failures += not success
+            self._slow += slow
+            if len(self._outcomes) > self.window_size:
+                old_failed, old_slow = self._outcomes.popleft()
+                self._failures -= old_failed
+                self._slow -= old_slow
+
+            calls = len(self._outcomes)
+            if calls >= self.minimum_calls and (
+                self._failures / calls >= self.failure_rate_threshold
+                or self._slow / calls >= self.slow_call_rate_threshold
+            ):
+                self._open()
+
+    def _open(self):
+        """Move to the open state. Caller must hold the lock."""
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def _close(self):
+        """Move to the closed state with a fresh window. Caller must hold the lock."""
+        self.state = CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+        self._slow = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get circuit breaker statistics.
+
+        Returns:
+            Dictionary with state, recent failure and slow call rates, and counters
+        """
+        with self._lock:
+            calls = len(self._outcomes)
+            state = self.state
+            if state == OPEN and time.monotonic() >= self.opened_at + self.open_duration:
+                state = HALF_OPEN
+            return {
+                "state": state,
+                "window_calls": calls,
+                "failure_rate": round(self._failures / calls, 3) if calls else 0.0,
+                "slow_call_rate": round(self._slow / calls, 3) if calls else 0.0,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened
+            }
@@ -0,0 +1,201 @@
+"""Per-call tool context with progress reporting and cancellation."""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .errors import MCPError
+
+
+class ToolCancelledError(MCPError):
+    """Raised when a tool call is cancelled before or while it runs."""
+
+    def __init__(self, reason: Optional[str] = None):
+        """Initialize the error.
+
+        Args:
+            reason: Why the call was cancelled
+        """
+        super().__init__(-32800, "Request cancelled", {"reason": reason} if reason else None)
+        self.reason = reason
+
+
+class DeadlineExceededError(MCPError):
+    """Raised when a call's deadline passes before its handler starts."""
+
+    def __init__(self):
+        super().__init__(-32008, "Deadline exceeded before execution", {"retryable": False})
+
+
+def resolve_deadline(deadline: Any = None, timeout: Any = None) -> Optional[float]:
+    """Convert a client deadline into a ``time.monotonic()`` value.
+
+    Clients may send an absolute deadline as a Unix timestamp, a relative
+    timeout in seconds, or both, in which case the earlier one wins.
+    Relative timeouts are preferred since they do not depend on the
+    client's clock.
+
+    Args:
+        deadline: Absolute deadline in Unix epoch seconds
+        timeout: Relative timeout in seconds
+
+    Returns:
+        The deadline on the monotonic clock, or None if neither was given
+
+    Raises:
+        ValueError: If a value is not a finite number
+    """
+    candidates = []
+    now = time.monotonic()
+    if deadline is not None:
+        candidates.append(now + _to_seconds(deadline, "deadline") - time.time())
+    if timeout is not None:
+        candidates.append(now + _to_seconds(timeout, "timeout"))
+    return min(candidates) if candidates else None
+
+
+def _to_seconds(value: Any, name: str) -> float:
+    """Parse a number of seconds from a header or JSON value."""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {name}: {value!r}")
+    if isinstance(value, bool) or not math.isfinite(seconds):
+        raise ValueError(f"Invalid {name}: {value!r}")
+    return seconds
+
+
+class ToolContext:
+    """Context handed to tool handlers that accept a ``context`` argument.
+
+    Handlers use it to report progress and to notice cancellation. Sync
+    handlers are expected to poll ``cancelled`` (or call ``check_cancelled()``)
+    between units of work; async handlers are cancelled directly.
+    """
+
+    def __init__(self, request_id: Any = None, progress_token: Any = None,
+                 notify: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 call_key: Optional[Hashable] = None, client_id: Optional[Hashable] = None,
+                 deadline: Optional[float] = None):
+        """Initialize the context.
+
+        Args:
+            request_id: JSON-RPC id of the call
+            progress_token: MCP progress token supplied by the client, if any
+            notify: Callable that delivers a notification to the client
+            call_key: Key used to find this call when a cancellation arrives
+            client_id: Identity of the calling client, used for fair scheduling
+            deadline: Time on the ``time.monotonic()`` clock after which the client
+                no longer wants the result
+        """
+        self.request_id = request_id
+        self.client_id = client_id
+        self.deadline = deadline
+        self.progress_token = progress_token
+        self.call_key = call_key
+        self._notify = notify
+        self._cancelled = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self.cancel_reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the call has been cancelled."""
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        """Whether the client's deadline has passed."""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining_time(self) -> Optional[float]:
+        """Get the time budget left before the client's deadline.
+
+        Returns:
+            Seconds remaining (never negative), or None if there is no deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self, reason: Optional[str] = None):
+        """Cancel the call and run any registered cancellation callbacks.
+
+        Args:
+            reason: Why the call was cancelled
+        """
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self.cancel_reason = reason
+            self._cancelled.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]):
+        """Register a callback to run when the call is cancelled.
+
+        The callback runs immediately if the call is already cancelled.
+
+        Args:
+            callback: Callable taking no arguments
+        """
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def check_cancelled(self):
+        """Raise if the call has been cancelled.
+
+        Raises:
+            ToolCancelledError: If the call has been cancelled
+        """
+        if self._cancelled.is_set():
+            raise ToolCancelledError(self.cancel_reason)
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep for up to timeout seconds, waking early on cancellation.
+
+        Args:
+            timeout: Seconds to sleep
+
+        Returns:
+            True if the call was cancelled, False if the timeout elapsed
+        """
+        return self._cancelled.wait(timeout)
+
+    def report_progress(self, progress: float, total: Optional[float] = None,
+                        message: Optional[str] = None):
+        """Send an MCP progress notification to the client.
+
+        Does nothing unless the client asked for progress with a progress
+        token and is connected over a streaming session. A failed delivery
+        means the client went away, so the call is cancelled.
+
+        Args:
+            progress: Progress so far
+            total: Total amount of work, if known
+            message: Optional human readable progress message
+        """
+        if self.progress_token is None or self._notify is None:
+            return
+
+        params = {"progressToken": self.progress_token, "progress": progress}
+        if total is not None:
+            params["total"] = total
+        if message is not None:
+            params["message"] = message
+
+        try:
+            self._notify({
+                "jsonrpc": "2.0",
+                "method": "notifications/progress",
+                "params": params
+            })
+        except (BrokenPipeError, ConnectionError, OSError):
+            self.cancel("client disconnected")
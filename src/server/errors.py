@@ -0,0 +1,34 @@
+"""JSON-RPC error types for the secure MCP server."""
+
+from typing import Any, Dict, Optional
+
+
+class MCPError(Exception):
+    """Error that maps directly onto a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str, data: Optional[Dict[str, Any]] = None):
+        """Initialize the error.
+
+        Args:
+            code: JSON-RPC error code
+            message: Human readable error message
+            data: Optional structured error data
+        """
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the error to a JSON-RPC error object.
+
+        Returns:
+            Dictionary with code, message and optional data
+        """
+        error = {
+            "code": self.code,
+            "message": self.message
+        }
+        if self.data is not None:
+            error["data"] = self.data
+        return error
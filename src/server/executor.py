@@ -0,0 +1,300 @@
+"""Tool execution for the secure MCP server."""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional
+
+from .bulkhead import Bulkhead, BulkheadFullError
+from .circuit_breaker import CircuitBreaker
+from .context import DeadlineExceededError, ToolCancelledError, ToolContext
+from .scheduler import FairScheduler, SchedulerTimeoutError
+
+
+class ToolExecutor:
+    """Runs tool handlers behind their circuit breakers and concurrency limits."""
+
+    def __init__(self, tools: Dict[str, Dict[str, Any]], default_max_wait: Optional[float] = 30.0,
+                 breaker_defaults: Optional[Dict[str, Any]] = None,
+                 scheduler: Optional[FairScheduler] = None):
+        """Initialize the executor.
+
+        Args:
+            tools: Tool definitions keyed by name, as held by ToolRegistry
+            default_max_wait: Maximum seconds a queued call waits for a slot
+            breaker_defaults: Default CircuitBreaker options, overridden per tool
+            scheduler: Fair scheduler sharing execution slots between clients
+        """
+        self.tools = tools
+        self.scheduler = scheduler
+        self.default_max_wait = default_max_wait
+        self.breaker_defaults = breaker_defaults or {}
+        self.bulkheads: Dict[str, Bulkhead] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.in_flight: Dict[Hashable, ToolContext] = {}
+        self.cancelled_calls = 0
+        self.expired_before_execution = 0
+        self._lock = threading.Lock()
+
+    def get_bulkhead(self, tool_name: str) -> Optional[Bulkhead]:
+        """Get the bulkhead for a tool, creating it on first use.
+
+        Args:
+            tool_name: The name of the tool
+
+        Returns:
+            The tool's bulkhead, or None if the tool has no concurrency limit
+        """
+        bulkhead = self.bulkheads.get(tool_name)
+        if bulkhead is not None:
+            return bulkhead
+
+        tool_info = self.tools.get(tool_name) or {}
+        max_concurrency = tool_info.get('max_concurrency')
+        if not max_concurrency:
+            return None
+
+        with self._lock:
+            bulkhead = self.bulkheads.get(tool_name)
+            if bulkhead is None:
+                bulkhead = Bulkhead(
+                    tool_name,
+                    max_concurrency,
+                    tool_info.get('max_queue') or 0,
+                    self.default_max_wait
+                )
+                self.bulkheads[tool_name] = bulkhead
+        return bulkhead
+
+    def get_breaker(self, tool_name: str) -> Optional[CircuitBreaker]:
+        """Get the circuit breaker for a tool, creating it on first use.
+
+        Tools opt out by declaring ``circuit_breaker = False`` and may override
+        the default breaker options by declaring a dictionary instead.
+
+        Args:
+            tool_name: The name of the tool
+
+        Returns:
+            The tool's circuit breaker, or None if the tool opted out
+        """
+        breaker = self.breakers.get(tool_name)
+        if breaker is not None:
+            return breaker
+
+        tool_info = self.tools.get(tool_name) or {}
+        options = tool_info.get('circuit_breaker')
+        if options is False:
+            return None
+
+        with self._lock:
+            breaker = self.breakers.get(tool_name)
+            if breaker is None:
+                breaker = CircuitBreaker(tool_name, **{**self.breaker_defaults, **(options or {})})
+                self.breakers[tool_name] = breaker
+        return breaker
+
+    def execute(self, tool_name: str, arguments: Dict[str, Any],
+                context: Optional[ToolContext] = None) -> Any:
+        """Execute a tool behind its circuit breaker, bulkhead and fair scheduler.
+
+        A call counts as failed for the breaker when the handler raises or
+        returns a result with ``success`` set to False. Calls rejected before
+        the handler runs and cancelled calls are not counted.
+
+        Args:
+            tool_name: The name of the tool
+            arguments: Arguments passed to the tool handler
+            context: Per-call context for progress and cancellation
+
+        Returns:
+            The tool handler's result
+
+        Raises:
+            DeadlineExceededError: If the client's deadline passed before the handler ran
+            CircuitOpenError: If the tool's breaker is open
+            BulkheadFullError: If the tool is saturated
+            SchedulerQueueFullError: If the client has too many queued calls
+            ToolCancelledError: If the call was cancelled
+        """
+        tool_info = self.tools[tool_name]
+        context = context or ToolContext()
+        breaker = self.get_breaker(tool_name)
+        bulkhead = self.get_bulkhead(tool_name)
+        scheduler = self.scheduler
+
+        self._check_deadline(context)
+        if breaker is not None:
+            breaker.before_call()
+
+        self._track(context)
+        holds_bulkhead = holds_slot = False
+        start = None
+        success = None
+        try:
+            # Queue waits are bounded by the client's remaining time budget,
+            # and by default_max_wait
+            max_wait = context.remaining_time()
+            if self.default_max_wait is not None:
+                max_wait = self.default_max_wait if max_wait is None else min(max_wait, self.default_max_wait)
+            if bulkhead is not None:
+                try:
+                    bulkhead.acquire(timeout=context.remaining_time())
+                except BulkheadFullError:
+                    self._check_deadline(context)
+                    raise
+                holds_bulkhead = True
+            if scheduler is not None:
+                try:
+                    scheduler.acquire(context.client_id, timeout=max_wait, on_cancel=context.on_cancel)
+                except SchedulerTimeoutError:
+                    context.check_cancelled()
+                    self._check_deadline(context)
+                    raise
+                holds_slot = True
+
+            # Calls cancelled or expired while queued never reach the handler
+            context.check_cancelled()
+            self._check_deadline(context)
+            start = time.monotonic()
+            result = self._invoke(tool_info, arguments, context)
+            # Results of calls cancelled mid-run have no reader
+            context.check_cancelled()
+            success = not (isinstance(result, dict) and result.get('success') is False)
+            return result
+        except ToolCancelledError:
+            with self._lock:
+                self.cancelled_calls += 1
+            raise
+        except Exception:
+            if start is not None:
+                success = False
+            raise
+        finally:
+            if holds_slot:
+                scheduler.release()
+            if holds_bulkhead:
+                bulkhead.release()
+            if breaker is not None:
+                if success is None:
+                    breaker.discard()
+                else:
+                    breaker.record(success, time.monotonic() - start)
+            self._untrack(context)
+
+    def _check_deadline(self, context: ToolContext):
+        """Drop a call whose deadline has already passed.
+
+        Raises:
+            DeadlineExceededError: If the client's deadline has passed
+        """
+        if context.expired:
+            with self._lock:
+                self.expired_before_execution += 1
+            raise DeadlineExceededError()
+
+    def _invoke(self, tool_info: Dict[str, Any], arguments: Dict[str, Any],
+                context: ToolContext) -> Any:
+        """Call a tool handler, running async handlers on a private event loop.
+
+        Args:
+            tool_info: The tool definition
+            arguments: Arguments passed to the tool handler
+            context: Per-call context for progress and cancellation
+
+        Returns:
+            The tool handler's result
+        """
+        handler = tool_info['handler']
+        kwargs = {'context': context} if tool_info.get('accepts_context') else {}
+
+        if not tool_info.get('is_async'):
+            return handler(arguments, **kwargs)
+
+        loop = asyncio.new_event_loop()
+        try:
+            task = loop.create_task(handler(arguments, **kwargs))
+
+            def cancel_task():
+                try:
+                    loop.call_soon_threadsafe(task.cancel)
+                except RuntimeError:
+                    # Loop already closed, the call has finished
+                    pass
+
+            context.on_cancel(cancel_task)
+            try:
+                return loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                raise ToolCancelledError(context.cancel_reason)
+        finally:
+            loop.close()
+
+    def _track(self, context: ToolContext):
+        """Register an in-flight call so it can be cancelled by key."""
+        if context.call_key is not None:
+            with self._lock:
+                self.in_flight[context.call_key] = context
+
+    def _untrack(self, context: ToolContext):
+        """Remove a finished call from the in-flight table."""
+        if context.call_key is not None:
+            with self._lock:
+                if self.in_flight.get(context.call_key) is context:
+                    del self.in_flight[context.call_key]
+
+    def cancel(self, call_key: Hashable, reason: Optional[str] = None) -> bool:
+        """Cancel an in-flight call.
+
+        Args:
+            call_key: The key the call was registered under
+            reason: Why the call was cancelled
+
+        Returns:
+            True if a matching in-flight call was found
+        """
+        with self._lock:
+            context = self.in_flight.get(call_key)
+        if context is None:
+            return False
+        context.cancel(reason)
+        return True
+
+    def get_execution_stats(self) -> Dict[str, Any]:
+        """Get statistics for calls across all tools.
+
+        Returns:
+            Dictionary with in-flight, cancelled and expired-before-execution call counts
+        """
+        with self._lock:
+            return {
+                "in_flight": len(self.in_flight),
+                "cancelled": self.cancelled_calls,
+                "expired_before_execution": self.expired_before_execution
+            }
+
+    def get_tool_stats(self, tool_name: str) -> Dict[str, Any]:
+        """Get execution statistics for a single tool.
+
+        Args:
+            tool_name: The name of the tool
+
+        Returns:
+            Dictionary with the tool's circuit breaker and bulkhead statistics
+        """
+        stats = {}
+        breaker = self.get_breaker(tool_name)
+        if breaker is not None:
+            stats["circuit_breaker"] = breaker.get_stats()
+        bulkhead = self.get_bulkhead(tool_name)
+        if bulkhead is not None:
+            stats["bulkhead"] = bulkhead.get_stats()
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get execution statistics for all tools.
+
+        Returns:
+            Dictionary of per-tool statistics keyed by tool name
+        """
+        return {name: self.get_tool_stats(name) for name in list(self.tools)}
@@ -0,0 +1,186 @@
+"""Idempotency keys with a response replay cache for tool calls."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .errors import MCPError
+
+
+class IdempotencyKeyReusedError(MCPError):
+    """Raised when an idempotency key is reused for a different request."""
+
+    def __init__(self, key: str):
+        super().__init__(
+            -32009,
+            f"Idempotency key {key} was already used for a different request",
+            {"retryable": False}
+        )
+
+
+class IdempotencyKeyInProgressError(MCPError):
+    """Raised when a duplicate request gives up waiting on the first call."""
+
+    def __init__(self, key: str):
+        super().__init__(
+            -32012,
+            f"A request with idempotency key {key} is still in progress, retry with the same key",
+            {"retryable": True, "retry_after": 1}
+        )
+
+
+class _Entry:
+    """Stored response, or a call still in flight, for one idempotency key."""
+
+    __slots__ = ('fingerprint', 'response', 'done', 'expires_at')
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.response: Optional[Dict[str, Any]] = None
+        self.done = threading.Event()
+        self.expires_at: Optional[float] = None
+
+
+class IdempotencyCache:
+    """Replays stored responses for repeated requests with the same idempotency key.
+
+    Keys are scoped to the client that sent them. The first request with a
+    key runs; repeats with the same request body get the stored response,
+    or wait for it while the first request is still in flight. Only
+    responses produced by the tool itself are stored: control errors such
+    as capacity rejections, cancellations and expired deadlines are not,
+    so a retry after them runs the tool. Entries expire ``ttl`` seconds
+    after their response is stored, and the oldest finished entries are
+    evicted once ``max_entries`` is reached. Finished entries are also
+    kept in a queue in the order their responses were stored, which is
+    their expiry order, so eviction pops from its front and never scans
+    in-flight entries.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 3600.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of keys remembered
+            ttl: Seconds a stored response is replayed for
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: Dict[Tuple[Hashable, str], _Entry] = {}
+        # Finished entries, oldest response first
+        self._finished: "OrderedDict[Tuple[Hashable, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.replayed = 0
+        self.joined = 0
+        self.conflicts = 0
+        self.evicted = 0
+
+    @staticmethod
+    def fingerprint(request: Dict[str, Any]) -> str:
+        """Hash the parts of a request that determine its outcome.
+
+        Args:
+            request: JSON-serializable description of the request
+
+        Returns:
+            Hex digest of the canonical JSON encoding
+        """
+        canonical = json.dumps(request, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def run(self, owner: Hashable, key: str, fingerprint: str,
+            compute: Callable[[], Dict[str, Any]],
+            timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run a request at most once per idempotency key.
+
+        Args:
+            owner: Identity of the client sending the key
+            key: The idempotency key
+            fingerprint: Fingerprint of the request body
+            compute: Callable producing the JSON-RPC response
+            timeout: Maximum seconds to wait on an in-flight duplicate
+
+        Returns:
+            The JSON-RPC response, computed now or replayed
+
+        Raises:
+            IdempotencyKeyReusedError: If the key was used for a different request
+            IdempotencyKeyInProgressError: If waiting on the in-flight duplicate timed out
+        """
+        cache_key = (owner, key)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                self._evict()
+                entry = self._entries.get(cache_key)
+                if entry is None:
+                    entry = _Entry(fingerprint)
+                    self._entries[cache_key] = entry
+                    self.executed += 1
+                    break
+                if entry.fingerprint != fingerprint:
+                    self.conflicts += 1
+                    raise IdempotencyKeyReusedError(key)
+                if entry.done.is_set():
+                    self.replayed += 1
+                    return entry.response
+                self.joined += 1
+
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not entry.done.wait(remaining):
+                raise IdempotencyKeyInProgressError(key)
+            # Either a stored response, or the first call gave up and this
+            # request should run; the loop sorts out which
+
+        response = None
+        try:
+            response = compute()
+            return response
+        finally:
+            with self._lock:
+                if response is not None and self._is_replayable(response):
+                    entry.response = response
+                    entry.expires_at = time.monotonic() + self.ttl
+                    self._finished[cache_key] = entry
+                elif self._entries.get(cache_key) is entry:
+                    del self._entries[cache_key]
+            entry.done.set()
+
+    @staticmethod
+    def _is_replayable(response: Dict[str, Any]) -> bool:
+        """Check whether a response came from the tool and may be replayed."""
+        error = response.get("error")
+        return error is None or error.get("code") == -32603
+
+    def _evict(self):
+        """Drop expired entries and enforce the size bound. Caller must hold the lock."""
+        now = time.monotonic()
+        finished = self._finished
+        while finished:
+            cache_key, entry = next(iter(finished.items()))
+            if entry.expires_at > now and len(self._entries) < self.max_entries:
+                break
+            finished.popitem(last=False)
+            del self._entries[cache_key]
+            self.evicted += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get idempotency cache statistics.
+
+        Returns:
+            Dictionary with the number of keys held and hit, join and conflict counters
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "executed": self.executed,
+                "replayed": self.replayed,
+                "joined_in_flight": self.joined,
+                "conflicts": self.conflicts,
+                "evicted": self.evicted
+            }
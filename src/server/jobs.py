@@ -0,0 +1,385 @@
+"""Asynchronous job mode for long-running tool calls."""
+
+import json
+import os
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional
+
+from .context import ToolCancelledError, ToolContext
+from .errors import MCPError
+from .notifications import NotificationHub
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobNotFoundError(MCPError):
+    """Raised when a job id is unknown, expired or owned by another client."""
+
+    def __init__(self, job_id: str):
+        super().__init__(-32004, f"Job {job_id} not found")
+
+
+class JobNotFinishedError(MCPError):
+    """Raised when the result of an unfinished job is requested."""
+
+    def __init__(self, job_id: str, status: str):
+        super().__init__(
+            -32005,
+            f"Job {job_id} is still {status}",
+            {"retryable": True, "retry_after": 1, "status": status}
+        )
+
+
+class JobStoreFullError(MCPError):
+    """Raised when no more jobs can be accepted."""
+
+    def __init__(self):
+        super().__init__(
+            -32006,
+            "Too many unfinished jobs, please retry later",
+            {"retryable": True, "retry_after": 5}
+        )
+
+
+class Job:
+    """A single background tool call."""
+
+    def __init__(self, job_id: str, owner: Hashable, tool_name: str, context: ToolContext):
+        self.id = job_id
+        self.owner = owner
+        self.tool_name = tool_name
+        self.context = context
+        self.status = PENDING
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[Dict[str, Any]] = None
+        self._result: Optional[bytes] = None
+        self.result_path: Optional[str] = None
+        self.result_size = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the job's status without its result.
+
+        Returns:
+            Dictionary describing the job
+        """
+        return {
+            "jobId": self.id,
+            "tool": self.tool_name,
+            "status": self.status,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at
+        }
+
+
+class JobStore:
+    """Bounded store of jobs and their results with TTL eviction.
+
+    Finished jobs are kept for ``ttl`` seconds. When the store is full, the
+    oldest finished jobs are evicted first; unfinished jobs are never
+    evicted, so new jobs are refused once ``max_jobs`` are all unfinished.
+    Results larger than ``spill_threshold`` bytes are written to disk
+    instead of being held in memory.
+    """
+
+    def __init__(self, max_jobs: int = 1000, ttl: float = 3600.0,
+                 spill_threshold: int = 1024 * 1024, spill_dir: Optional[str] = None):
+        """Initialize the store.
+
+        Args:
+            max_jobs: Maximum number of jobs kept
+            ttl: Seconds a finished job and its result are kept
+            spill_threshold: Result size in bytes above which results go to disk
+            spill_dir: Directory for spilled results (a temporary directory by default)
+        """
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self.spill_threshold = spill_threshold
+        self._owns_spill_dir = spill_dir is None
+        self.spill_dir = spill_dir
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.spilled = 0
+        self.memory_bytes = 0
+
+    def add(self, job: Job):
+        """Add a new job, evicting expired or old finished jobs as needed.
+
+        Args:
+            job: The job to add
+
+        Raises:
+            JobStoreFullError: If the store is full of unfinished jobs
+        """
+        with self._lock:
+            self._evict_expired()
+            if len(self._jobs) >= self.max_jobs:
+                for job_id, old_job in list(self._jobs.items()):
+                    if old_job.status in FINISHED_STATES:
+                        self._remove(job_id)
+                        break
+                else:
+                    raise JobStoreFullError()
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str, owner: Hashable) -> Job:
+        """Get a job owned by a client.
+
+        Args:
+            job_id: The job id
+            owner: Identity of the requesting client
+
+        Returns:
+            The job
+
+        Raises:
+            JobNotFoundError: If the job is unknown, expired or owned by someone else
+        """
+        with self._lock:
+            self._evict_expired()
+            job = self._jobs.get(job_id)
+        if job is None or job.owner != owner:
+            raise JobNotFoundError(job_id)
+        return job
+
+    def list_jobs(self, owner: Optional[Hashable] = None) -> List[Job]:
+        """List jobs, optionally only those owned by one client.
+
+        Args:
+            owner: Identity of the client, or None for every job
+
+        Returns:
+            The jobs, oldest first
+        """
+        with self._lock:
+            self._evict_expired()
+            return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def store_result(self, job: Job, result: Any):
+        """Store a job's result, spilling it to disk if it is large.
+
+        Args:
+            job: The finished job
+            result: JSON-serializable tool result
+        """
+        data = json.dumps(result).encode('utf-8')
+        job.result_size = len(data)
+        if len(data) > self.spill_threshold:
+            path = os.path.join(self._get_spill_dir(), f"{job.id}.json")
+            with open(path, 'wb') as f:
+                f.write(data)
+            job.result_path = path
+            with self._lock:
+                self.spilled += 1
+        else:
+            job._result = data
+            with self._lock:
+                self.memory_bytes += len(data)
+
+    def _get_spill_dir(self) -> str:
+        """Get the spill directory, creating it on first use."""
+        with self._lock:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="mcp-jobs-")
+            else:
+                os.makedirs(self.spill_dir, exist_ok=True)
+            return self.spill_dir
+
+    def load_result(self, job: Job) -> Any:
+        """Load a job's stored result.
+
+        Args:
+            job: The finished job
+
+        Returns:
+            The tool result
+        """
+        if job.result_path:
+            with open(job.result_path, 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        if job._result is not None:
+            return json.loads(job._result.decode('utf-8'))
+        return None
+
+    def _evict_expired(self):
+        """Evict finished jobs past their TTL. Caller must hold the lock."""
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            self._remove(job_id)
+
+    def _remove(self, job_id: str):
+        """Remove a job and its spilled result. Caller must hold the lock."""
+        job = self._jobs.pop(job_id)
+        self.evicted += 1
+        if job._result is not None:
+            self.memory_bytes -= len(job._result)
+            job._result = None
+        if job.result_path:
+            try:
+                os.remove(job.result_path)
+            except OSError:
+                pass
+
+    def close(self):
+        """Remove the spill directory if the store created it."""
+        if self._owns_spill_dir and self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get job store statistics.
+
+        Returns:
+            Dictionary with job counts by status, memory use and eviction counters
+        """
+        with self._lock:
+            by_status: Dict[str, int] = {}
+            for job in self._jobs.values():
+                by_status[job.status] = by_status.get(job.status, 0) + 1
+            return {
+                "jobs": len(self._jobs),
+                "by_status": by_status,
+                "result_bytes_in_memory": self.memory_bytes,
+                "spilled": self.spilled,
+                "evicted": self.evicted
+            }
+
+
+class JobManager:
+    """Runs tool calls in the background and keeps their results."""
+
+    def __init__(self, executor, store: Optional[JobStore] = None,
+                 hub: Optional[NotificationHub] = None, max_workers: int = 4):
+        """Initialize the job manager.
+
+        Args:
+            executor: ToolExecutor used to run the tools
+            store: JobStore holding jobs and results
+            hub: NotificationHub used to push job updates to streaming clients
+            max_workers: Maximum number of jobs running at once
+        """
+        self.executor = executor
+        self.store = store or JobStore()
+        self.hub = hub
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-job")
+
+    def submit(self, owner: Hashable, tool_name: str, arguments: Dict[str, Any],
+               progress_token: Any = None) -> Job:
+        """Start a tool call in the background.
+
+        Args:
+            owner: Identity of the client that owns the job
+            tool_name: The name of the tool
+            arguments: Arguments passed to the tool handler
+            progress_token: MCP progress token for progress notifications
+
+        Returns:
+            The new job
+
+        Raises:
+            JobStoreFullError: If no more jobs can be accepted
+        """
+        job_id = secrets.token_urlsafe(16)
+        notify = (lambda message: self.hub.publish(owner, message)) if self.hub else None
+        context = ToolContext(request_id=job_id, progress_token=progress_token,
+                              notify=notify, client_id=owner)
+        job = Job(job_id, owner, tool_name, context)
+        self.store.add(job)
+        self._pool.submit(self._run, job, arguments)
+        return job
+
+    def cancel(self, job_id: str, owner: Hashable) -> Job:
+        """Cancel a job.
+
+        Args:
+            job_id: The job id
+            owner: Identity of the requesting client
+
+        Returns:
+            The job
+        """
+        job = self.store.get(job_id, owner)
+        job.context.cancel("cancelled by client")
+        return job
+
+    def get_response(self, job_id: str, owner: Hashable) -> Dict[str, Any]:
+        """Get a finished job's status and result or error.
+
+        Args:
+            job_id: The job id
+            owner: Identity of the requesting client
+
+        Returns:
+            Dictionary with the job's status and its result or error
+
+        Raises:
+            JobNotFoundError: If the job is unknown
+            JobNotFinishedError: If the job has not finished yet
+        """
+        job = self.store.get(job_id, owner)
+        if job.status not in FINISHED_STATES:
+            raise JobNotFinishedError(job_id, job.status)
+        response = job.to_dict()
+        if job.status == COMPLETED:
+            response["result"] = self.store.load_result(job)
+        else:
+            response["error"] = job.error
+        return response
+
+    def _run(self, job: Job, arguments: Dict[str, Any]):
+        """Run a job on a worker thread and record its outcome."""
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            result = self.executor.execute(job.tool_name, arguments, job.context)
+            self.store.store_result(job, result)
+            job.status = COMPLETED
+        except ToolCancelledError as e:
+            job.error = e.to_dict()
+            job.status = CANCELLED
+        except MCPError as e:
+            job.error = e.to_dict()
+            job.status = FAILED
+        except Exception as e:
+            job.error = {"code": -32603, "message": f"Tool execution error: {str(e)}"}
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+        if self.hub is not None:
+            params = job.to_dict()
+            if job.status == COMPLETED and job.result_path is None:
+                params["result"] = self.store.load_result(job)
+            elif job.error is not None:
+                params["error"] = job.error
+            self.hub.publish(job.owner, {
+                "jsonrpc": "2.0",
+                "method": "notifications/jobs/completed",
+                "params": params
+            })
+
+    def shutdown(self):
+        """Stop accepting jobs, cancel running ones and clean up spilled results."""
+        for job in self.store.list_jobs():
+            if job.status not in FINISHED_STATES:
+                job.context.cancel("server shutting down")
+        self._pool.shutdown(wait=False)
+        self.store.close()
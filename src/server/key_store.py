@@ -0,0 +1,247 @@
+"""Hot-reloadable API key store backed by a file or SQLite database."""
+
+import json
+import os
+import signal
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .auth import Authentication
+from .policy import KeyPolicy, parse_tiers, resolve_policy
+from .watcher import ResourceWatcher
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+
+def load_key_entries(path: str) -> Tuple[List[str], Dict[str, KeyPolicy]]:
+    """Read API keys and their policies from a key file or SQLite database.
+
+    Supported formats, chosen by file extension:
+
+    - ``.db``, ``.sqlite``, ``.sqlite3``: table ``api_keys`` with a ``key`` column
+      and optional ``tier``, ``requests_per_minute``, ``tools`` and ``methods``
+      columns (lists comma-separated), plus an optional ``tiers`` table with a
+      ``name`` column and the same settings columns
+    - ``.json``: a list of keys, or an object with a ``keys`` list and optional
+      ``tiers`` object; each key is a string or an object with ``key``,
+      ``tier`` and setting overrides
+    - anything else: one key per line, blank lines and ``#`` comments ignored
+
+    Policies are resolved here, once per load, so that requests only look
+    them up.
+
+    Args:
+        path: Path of the key source
+
+    Returns:
+        Tuple of the keys, in source order, and the policy of each key
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file contents are malformed
+        sqlite3.Error: If the database cannot be queried
+    """
+    if path.endswith(SQLITE_EXTENSIONS):
+        tier_specs, key_specs = _read_sqlite(path)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith(".json"):
+                tier_specs, key_specs = _parse_json(json.load(f))
+            else:
+                lines = (line.strip() for line in f)
+                tier_specs, key_specs = {}, [{"key": line} for line in lines
+                                             if line and not line.startswith("#")]
+
+    tiers = parse_tiers(tier_specs)
+    keys: List[str] = []
+    policies: Dict[str, KeyPolicy] = {}
+    for spec in key_specs:
+        key = spec.get("key")
+        if not isinstance(key, str):
+            raise ValueError("Every key entry needs a string 'key'")
+        if key:
+            keys.append(key)
+            policies[key] = resolve_policy(spec, tiers)
+    return keys, policies
+
+
+def load_keys(path: str) -> List[str]:
+    """Read API keys from a key file or SQLite database.
+
+    Args:
+        path: Path of the key source (see load_key_entries() for formats)
+
+    Returns:
+        The keys, in source order
+    """
+    return load_key_entries(path)[0]
+
+
+def _parse_json(data: Any) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Split a JSON key file into tier settings and key entries."""
+    tiers = data.get("tiers") if isinstance(data, dict) else None
+    keys = data.get("keys") if isinstance(data, dict) else data
+    if tiers is not None and not isinstance(tiers, dict):
+        raise ValueError("'tiers' must be an object")
+    if not isinstance(keys, list):
+        raise ValueError("Key file must hold a list of keys or an object with a 'keys' list")
+    entries = []
+    for entry in keys:
+        if isinstance(entry, str):
+            entry = {"key": entry}
+        if not isinstance(entry, dict):
+            raise ValueError("Keys must be strings or objects")
+        entries.append(entry)
+    return tiers or {}, entries
+
+
+def _read_sqlite(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Read tier settings and key entries from a SQLite key database."""
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    connection.row_factory = sqlite3.Row
+    try:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        tiers = {}
+        if "tiers" in tables:
+            for row in connection.execute("SELECT * FROM tiers"):
+                spec = dict(row)
+                name = spec.pop("name", None)
+                if not isinstance(name, str) or not name:
+                    raise ValueError("Every row of the tiers table needs a non-empty text 'name'")
+                tiers[name] = spec
+        return tiers, [dict(row) for row in connection.execute("SELECT * FROM api_keys")]
+    finally:
+        connection.close()
+
+
+class KeyStore:
+    """Keeps an Authentication index in sync with a key file or database.
+
+    The source is loaded into a fresh index in the background whenever it
+    changes (detected by a ResourceWatcher), on SIGHUP, or on request,
+    and the new index is swapped in atomically. Lookups keep using the
+    previous index while a reload runs, and a reload that fails leaves
+    the previous keys in place. Keys passed as ``static_keys`` (for
+    example from ``MCP_API_KEYS``) are always kept.
+    """
+
+    def __init__(self, auth: Authentication, path: str,
+                 static_keys: Optional[Iterable[str]] = None,
+                 debounce: float = 0.5, poll_interval: float = 2.0,
+                 use_inotify: Optional[bool] = None):
+        """Initialize the key store.
+
+        Args:
+            auth: Authentication instance whose keys are kept in sync
+            path: Path of the key file or SQLite database
+            static_keys: Keys that stay valid regardless of the source
+            debounce: Quiet period in seconds after a change before reloading
+            poll_interval: Seconds between change checks when inotify is not used
+            use_inotify: Whether to use inotify (None uses it when available)
+        """
+        self.auth = auth
+        self.path = os.path.realpath(path)
+        self.static_keys = [key for key in (static_keys or []) if key]
+        self.watcher = ResourceWatcher(lambda _path: self.reload("file changed"),
+                                       debounce=debounce, poll_interval=poll_interval,
+                                       use_inotify=use_inotify)
+        self._reload_lock = threading.Lock()
+        self._watching = False
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_reason: Optional[str] = None
+        self.last_reload_at: Optional[float] = None
+        self.last_reload_ms: Optional[float] = None
+        self.source_keys = 0
+        self.tiers: Dict[str, int] = {}
+
+    def reload(self, reason: str = "manual") -> bool:
+        """Load the key source and swap the new keys in.
+
+        Args:
+            reason: Why the reload happened, reported in the statistics
+
+        Returns:
+            True if the keys were reloaded, False if loading failed
+        """
+        with self._reload_lock:
+            start = time.perf_counter()
+            try:
+                keys, policies = load_key_entries(self.path)
+            except (OSError, ValueError, sqlite3.Error) as e:
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"⚠️ API key reload failed ({reason}): {self.last_error}")
+                return False
+
+            self.auth.replace_keys(self.static_keys + keys, policies)
+            self.last_reload_ms = round((time.perf_counter() - start) * 1000, 3)
+            self.last_reload_at = time.time()
+            self.last_reason = reason
+            self.last_error = None
+            self.source_keys = len(keys)
+            self.tiers = {}
+            for policy in policies.values():
+                self.tiers[policy.tier] = self.tiers.get(policy.tier, 0) + 1
+            self.reloads += 1
+            return True
+
+    def start(self):
+        """Start reloading the keys whenever the source changes."""
+        if self._watching:
+            return
+        self._watching = True
+        self.watcher.watch(self.path)
+        if self.path.endswith(SQLITE_EXTENSIONS):
+            # Commits in WAL mode only touch the write-ahead log at first
+            self.watcher.watch(self.path + "-wal")
+
+    def install_signal_handler(self) -> bool:
+        """Reload the keys on SIGHUP.
+
+        Only takes effect on the main thread. The reload runs on a separate
+        thread so the signal handler returns at once.
+
+        Returns:
+            True if the handler was installed, False where SIGHUP is unavailable
+            or when called from another thread
+        """
+        if not hasattr(signal, "SIGHUP"):
+            return False
+
+        def handle_sighup(signum, frame):
+            threading.Thread(target=self.reload, args=("SIGHUP",), daemon=True).start()
+
+        try:
+            signal.signal(signal.SIGHUP, handle_sighup)
+        except ValueError:
+            # signal.signal() only works on the main thread
+            return False
+        return True
+
+    def close(self):
+        """Stop watching the key source."""
+        self.watcher.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get key store statistics.
+
+        Returns:
+            Dictionary with key counts and reload latency and outcome
+        """
+        return {
+            "source": os.path.basename(self.path),
+            "keys": self.auth.key_count,
+            "source_keys": self.source_keys,
+            "static_keys": len(self.static_keys),
+            "tiers": dict(self.tiers),
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_reason": self.last_reason,
+            "last_reload_at": self.last_reload_at,
+            "last_reload_ms": self.last_reload_ms,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,314 @@
+"""Mergeable log-bucketed latency histograms over a sliding window."""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Values are bucketed in microseconds. Below 2 ** (SUB_BUCKET_BITS + 1) every
+# value has its own bucket; above, each power of two is split into
+# 2 ** SUB_BUCKET_BITS buckets, so a bucket is at most ~3% wide.
+SUB_BUCKET_BITS = 5
+UNIT = 1e-6
+PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+
+# (endpoint, tool, status class)
+HistogramKey = Tuple[str, str, str]
+
+
+def bucket_index(value: int) -> int:
+    """Get the bucket of a non-negative value in microseconds."""
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return value
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """Get the smallest and largest value, in microseconds, of a bucket."""
+    shift = max(0, (index >> SUB_BUCKET_BITS) - 1)
+    top = index - (shift << SUB_BUCKET_BITS)
+    return top << shift, ((top + 1) << shift) - 1
+
+
+def status_class(status: int) -> str:
+    """Get the class of an HTTP status code, such as ``2xx``."""
+    return f"{status // 100}xx"
+
+
+class LatencyHistogram:
+    """Histogram of durations in logarithmic buckets.
+
+    Counts are kept sparsely by bucket index, so recording is a single
+    dictionary update and two histograms merge by adding their counts.
+    The bucket layout is fixed, which makes histograms recorded by
+    different processes mergeable; percentiles are reported as the
+    midpoint of their bucket.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float):
+        """Record a duration in seconds."""
+        index = bucket_index(int(duration / UNIT)) if duration > 0 else 0
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add the counts of another histogram to this one."""
+        counts = self.counts
+        for index, count in other.counts.items():
+            counts[index] = counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.max > self.max:
+            self.max = other.max
+
+    def percentiles(self, quantiles: Iterable[float]) -> List[float]:
+        """Get the durations, in seconds, at the given quantiles.
+
+        Args:
+            quantiles: Quantiles between 0 and 1, in increasing order
+
+        Returns:
+            One duration per quantile, 0.0 for an empty histogram
+        """
+        quantiles = list(quantiles)
+        if not self.count:
+            return [0.0] * len(quantiles)
+        results = []
+        seen = 0
+        buckets = iter(sorted(self.counts.items()))
+        index = 0
+        for quantile in quantiles:
+            rank = max(1, round(quantile * self.count))
+            while seen < rank:
+                index, count = next(buckets)
+                seen += count
+            low, high = bucket_bounds(index)
+            results.append(min((low + high) / 2 * UNIT, self.max))
+        return results
+
+    def percentile(self, quantile: float) -> float:
+        """Get the duration, in seconds, at a quantile between 0 and 1."""
+        return self.percentiles([quantile])[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the histogram for merging in another process."""
+        return {
+            "counts": {str(index): count for index, count in self.counts.items()},
+            "count": self.count,
+            "total": self.total,
+            "max": self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild a histogram serialized by to_dict()."""
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data["counts"].items()}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.max = data["max"]
+        return histogram
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the count, mean, percentiles and maximum in milliseconds."""
+        summary = {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0
+        }
+        values = self.percentiles(quantile for _, quantile in PERCENTILES)
+        for (name, _), value in zip(PERCENTILES, values):
+            summary[f"{name}_ms"] = round(value * 1000, 3)
+        summary["max_ms"] = round(self.max * 1000, 3)
+        return summary
+
+
+class LatencyTracker:
+    """Latency histograms per endpoint, tool and status class over a sliding window.
+
+    The window is divided into ``slices`` time slices, each with its own
+    histograms, kept in a ring. Recording updates one histogram of the
+    current slice; a slice is cleared when the ring comes back round to
+    it. Queries merge the slices still inside the window, so they cover
+    between ``window - window / slices`` and ``window`` seconds of
+    requests. Lifetime histograms per key are kept alongside, for
+    exporters that expect cumulative counters. Once ``max_keys`` keys
+    have been seen, requests with new keys are recorded under the
+    endpoint ``other`` with no tool, so the number of series stays
+    bounded whatever the callers pass in.
+    """
+
+    def __init__(self, window: float = 60.0, slices: int = 6, max_keys: int = 1000):
+        """Initialize the tracker.
+
+        Args:
+            window: Length of the sliding window in seconds
+            slices: Number of slices the window is divided into
+            max_keys: Number of (endpoint, tool, status) keys tracked before
+                new ones are folded into ``other``
+        """
+        self.window = window
+        self.slices = slices
+        self.max_keys = max_keys
+        self.slice_seconds = window / slices
+        self.start_time = time.time()
+        self._epochs: List[int] = [-1] * slices
+        self._histograms: List[Dict[HistogramKey, LatencyHistogram]] = [{} for _ in range(slices)]
+        self._totals: Dict[HistogramKey, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, tool: Optional[str], status: str, duration: float,
+               now: Optional[float] = None):
+        """Record the duration of a request.
+
+        Args:
+            endpoint: The requested endpoint
+            tool: Tool called by the request, if any
+            status: Status class of the response, such as ``2xx``
+            duration: Request processing duration in seconds
+            now: Time the request completed (defaults to now)
+        """
+        epoch = int((time.time() if now is None else now) // self.slice_seconds)
+        i = epoch % self.slices
+        key = (endpoint, tool or "", status)
+        with self._lock:
+            if key not in self._totals and len(self._totals) >= self.max_keys:
+                key = ("other", "", status)
+            if self._epochs[i] != epoch:
+                self._epochs[i] = epoch
+                self._histograms[i] = {}
+            histograms = self._histograms[i]
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = LatencyHistogram()
+            histogram.record(duration)
+            histogram = self._totals.get(key)
+            if histogram is None:
+                histogram = self._totals[key] = LatencyHistogram()
+            histogram.record(duration)
+
+    def histograms(self, now: Optional[float] = None) -> Dict[HistogramKey, LatencyHistogram]:
+        """Get the histograms of the window, merged across its slices.
+
+        Args:
+            now: End of the window (defaults to now)
+
+        Returns:
+            Dictionary of (endpoint, tool, status class) to histogram
+        """
+        epoch = int((time.time() if now is None else now) // self.slice_seconds)
+        merged: Dict[HistogramKey, LatencyHistogram] = {}
+        with self._lock:
+            for slice_epoch, histograms in zip(self._epochs, self._histograms):
+                if epoch - self.slices < slice_epoch <= epoch:
+                    for key, histogram in histograms.items():
+                        merged.setdefault(key, LatencyHistogram()).merge(histogram)
+        return merged
+
+    def totals(self) -> Dict[HistogramKey, LatencyHistogram]:
+        """Get copies of the histograms of every request since the tracker started.
+
+        Returns:
+            Dictionary of (endpoint, tool, status class) to histogram
+        """
+        copies: Dict[HistogramKey, LatencyHistogram] = {}
+        with self._lock:
+            for key, histogram in self._totals.items():
+                copies[key] = copy = LatencyHistogram()
+                copy.merge(histogram)
+        return copies
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Get the window's histograms in a form another process can merge.
+
+        Args:
+            now: End of the window (defaults to now)
+
+        Returns:
+            Dictionary with the window length and the serialized histograms
+        """
+        return {
+            "window": self.window,
+            "histograms": [
+                {"endpoint": endpoint, "tool": tool, "status": status, **histogram.to_dict()}
+                for (endpoint, tool, status), histogram in self.histograms(now).items()
+            ]
+        }
+
+    @staticmethod
+    def merge_snapshots(snapshots: Iterable[Dict[str, Any]]) -> Dict[HistogramKey, LatencyHistogram]:
+        """Merge snapshots taken by several worker processes.
+
+        Args:
+            snapshots: Results of snapshot() from each process
+
+        Returns:
+            Dictionary of (endpoint, tool, status class) to merged histogram
+        """
+        merged: Dict[HistogramKey, LatencyHistogram] = {}
+        for snapshot in snapshots:
+            for data in snapshot["histograms"]:
+                key = (data["endpoint"], data["tool"], data["status"])
+                merged.setdefault(key, LatencyHistogram()).merge(LatencyHistogram.from_dict(data))
+        return merged
+
+    @staticmethod
+    def summarize(histograms: Dict[HistogramKey, LatencyHistogram]) -> Dict[str, Any]:
+        """Summarize histograms per endpoint, per tool and per status class.
+
+        Args:
+            histograms: Dictionary of (endpoint, tool, status class) to histogram
+
+        Returns:
+            Dictionary of endpoint, tool and status class summaries
+        """
+        groups: Dict[str, Dict[str, LatencyHistogram]] = {"endpoints": {}, "tools": {}, "status": {}}
+        for (endpoint, tool, status), histogram in histograms.items():
+            for group, name in (("endpoints", endpoint), ("tools", tool), ("status", status)):
+                if name:
+                    groups[group].setdefault(name, LatencyHistogram()).merge(histogram)
+        return {
+            group: {name: histogram.summary() for name, histogram in sorted(by_name.items())}
+            for group, by_name in groups.items()
+        }
+
+    def _covered(self, now: float) -> float:
+        """Get the seconds of requests the window currently covers."""
+        epoch = int(now // self.slice_seconds)
+        covered = (self.slices - 1) * self.slice_seconds + (now - epoch * self.slice_seconds)
+        return min(covered, now - self.start_time)
+
+    def request_rate(self, now: Optional[float] = None) -> float:
+        """Get the requests per second over the window."""
+        now = time.time() if now is None else now
+        count = sum(histogram.count for histogram in self.histograms(now).values())
+        covered = self._covered(now)
+        return count / covered if covered > 0 else 0.0
+
+    def get_stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Get latency percentiles over the window.
+
+        Returns:
+            Dictionary with the window length, request rate and summaries
+            per endpoint, tool and status class
+        """
+        now = time.time() if now is None else now
+        histograms = self.histograms(now)
+        count = sum(histogram.count for histogram in histograms.values())
+        covered = self._covered(now)
+        return {
+            "window_seconds": self.window,
+            "request_rate": round(count / covered, 3) if covered > 0 else 0.0,
+            **self.summarize(histograms)
+        }
@@ -0,0 +1,195 @@
+"""Prometheus text exposition of the server's metrics."""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .latency import UNIT, HistogramKey, LatencyHistogram, bucket_bounds
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds, in seconds, of the exported request duration buckets
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                    1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value as Prometheus expects."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricFamily:
+    """One metric with its type, help text and labeled samples."""
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        """Initialize the metric family.
+
+        Args:
+            name: Metric name, such as ``mcp_requests_total``
+            kind: ``counter``, ``gauge`` or ``histogram``
+            help_text: Description shown in the HELP line
+        """
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.samples: List[Tuple[str, Dict[str, str], float]] = []
+
+    def add(self, value: float, suffix: str = "", **labels: str) -> "MetricFamily":
+        """Add a sample, with an optional name suffix such as ``_bucket``."""
+        self.samples.append((suffix, labels, value))
+        return self
+
+    def render(self) -> str:
+        """Render the family in the text exposition format."""
+        help_text = self.help_text.replace("\\", "\\\\").replace("\n", "\\n")
+        lines = [f"# HELP {self.name} {help_text}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples:
+            if labels:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{self.name}{suffix}{{{label_text}}} {_format_value(value)}")
+            else:
+                lines.append(f"{self.name}{suffix} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def histogram_family(name: str, help_text: str, histograms: Dict[HistogramKey, LatencyHistogram],
+                     label_names: Sequence[str] = ("endpoint", "tool", "status"),
+                     buckets: Sequence[float] = DURATION_BUCKETS) -> MetricFamily:
+    """Export latency histograms as one Prometheus histogram.
+
+    Each log bucket is counted under the first exported bound at or
+    above its largest value, so a duration within one log bucket (~3%)
+    below a bound may be counted under the next bound up.
+
+    Args:
+        name: Metric name
+        help_text: Description shown in the HELP line
+        histograms: Dictionary of label values to histogram
+        label_names: Names of the labels, in the order of the dictionary keys
+        buckets: Upper bounds in seconds, in increasing order
+
+    Returns:
+        Histogram metric family with bucket, sum and count samples
+    """
+    family = MetricFamily(name, "histogram", help_text)
+    bounds = [int(bound / UNIT) for bound in buckets]
+    for key, histogram in sorted(histograms.items()):
+        labels = dict(zip(label_names, key))
+        cumulative = 0
+        counts = iter(sorted(histogram.counts.items()))
+        pending = next(counts, None)
+        for bound, le in zip(bounds, buckets):
+            while pending is not None and bucket_bounds(pending[0])[1] <= bound:
+                cumulative += pending[1]
+                pending = next(counts, None)
+            family.add(cumulative, "_bucket", **labels, le=_format_value(float(le)))
+        family.add(histogram.count, "_bucket", **labels, le="+Inf")
+        family.add(histogram.total, "_sum", **labels)
+        family.add(histogram.count, "_count", **labels)
+    return family
+
+
+def process_families(sample: Dict[str, Any]) -> List[MetricFamily]:
+    """Export the standard Prometheus process metrics from a ProcessSampler sample."""
+    families = [
+        MetricFamily("process_cpu_seconds_total", "counter",
+                     "Total user and system CPU time spent in seconds.")
+            .add(sample["cpu_user_seconds"] + sample["cpu_system_seconds"]),
+        MetricFamily("process_resident_memory_bytes", "gauge",
+                     "Resident memory size in bytes.").add(sample["rss_bytes"]),
+        MetricFamily("process_virtual_memory_bytes", "gauge",
+                     "Virtual memory size in bytes.").add(sample["vms_bytes"]),
+        MetricFamily("process_start_time_seconds", "gauge",
+                     "Start time of the process since unix epoch in seconds.").add(sample["start_time"]),
+        MetricFamily("process_threads", "gauge",
+                     "Number of OS threads in the process.").add(sample["threads"]),
+        MetricFamily("process_context_switches_total", "counter",
+                     "Context switches of the process, by kind.")
+            .add(sample["ctx_switches_voluntary"], kind="voluntary")
+            .add(sample["ctx_switches_involuntary"], kind="involuntary")
+    ]
+    if sample["open_fds"] is not None:
+        families.append(MetricFamily("process_open_fds", "gauge",
+                                     "Number of open file descriptors.").add(sample["open_fds"]))
+    return families
+
+
+class MetricsExporter:
+    """Renders metrics from registered collectors, caching the result.
+
+    A scrape within ``cache_seconds`` of the last render is served the
+    same bytes, and only one thread renders at a time, so frequent or
+    concurrent scrapes cost one render per interval whatever their
+    number. Collectors read counters the request path already keeps and
+    take its locks only long enough to copy them.
+    """
+
+    def __init__(self, cache_seconds: float = 1.0):
+        """Initialize the exporter.
+
+        Args:
+            cache_seconds: How long a rendering is served before metrics are collected again
+        """
+        self.cache_seconds = cache_seconds
+        self.collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self._rendered: Optional[bytes] = None
+        self._rendered_at = 0.0
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.cache_hits = 0
+        self.render_seconds = 0.0
+
+    def add_collector(self, collector: Callable[[], Iterable[MetricFamily]]):
+        """Register a callable returning metric families to export.
+
+        Args:
+            collector: Callable returning an iterable of MetricFamily
+        """
+        self.collectors.append(collector)
+
+    def render(self) -> bytes:
+        """Get the exposition text of every collector's metrics.
+
+        Returns:
+            UTF-8 encoded metrics in the Prometheus text format
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._rendered is not None and now - self._rendered_at < self.cache_seconds:
+                self.cache_hits += 1
+                return self._rendered
+            started = time.perf_counter()
+            parts = [family.render() for collector in self.collectors for family in collector()]
+            self._rendered = "".join(parts).encode("utf-8")
+            self._rendered_at = now
+            self.renders += 1
+            self.render_seconds += time.perf_counter() - started
+            return self._rendered
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rendering statistics.
+
+        Returns:
+            Dictionary with render and cache hit counts and mean render time
+        """
+        with self._lock:
+            return {
+                "renders": self.renders,
+                "cache_hits": self.cache_hits,
+                "avg_render_ms": round(self.render_seconds / self.renders * 1000, 3) if self.renders else 0.0,
+                "bytes": len(self._rendered) if self._rendered is not None else 0
+            }
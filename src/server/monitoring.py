@@ -3,9 +3,14 @@
 import time
 import logging
 import os
-from typing import Dict, List, Optional, Any
+import threading
+from typing import Callable, Dict, List, Optional, Any
 import psutil
 
+from .latency import LatencyTracker, status_class
+from .process_sampler import ProcessSampler
+from .request_log import RequestLog
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -16,18 +21,30 @@ logging.basicConfig(
 class Monitoring:
     """Handles monitoring and logging for the secure MCP server."""
 
-    def __init__(self, enabled: bool = True, log_level: str = "INFO"):
+    def __init__(self, enabled: bool = True, log_level: str = "INFO", max_requests: int = 1000,
+                 latency_window: float = 60.0, sample_interval: float = 5.0):
         """Initialize the monitoring system.
         
         Args:
             enabled: Whether monitoring is enabled
             log_level: The logging level to use
+            max_requests: Number of most recent requests kept for statistics
+            latency_window: Seconds of requests covered by latency percentiles
+            sample_interval: Seconds between process statistics samples, once
+                the sampler is started
         """
         self.enabled = enabled
         self.process = psutil.Process(os.getpid())
+        # Process statistics are read from the sampler's latest snapshot
+        self.sampler = ProcessSampler(sample_interval, process=self.process)
         self.start_time = time.time()
-        self.requests = []
-        self.max_requests = 1000  # Maximum number of requests to store
+        self.max_requests = max_requests  # Maximum number of requests to store
+        self.requests = RequestLog(max_requests)
+        self.latency = LatencyTracker(latency_window)
+        self.in_flight = 0
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self.stats_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
         
         # Set log level
         numeric_level = getattr(logging, log_level.upper(), None)
@@ -35,7 +52,7 @@ class Monitoring:
             logging.getLogger().setLevel(numeric_level)
     
     def log_request(self, client_id: str, endpoint: str, status: int, 
-                   authenticated: bool, duration: float):
+                   authenticated: bool, duration: float, tool: Optional[str] = None):
         """Log a request to the monitoring system.
         
         Args:
@@ -44,6 +61,7 @@ class Monitoring:
             status: HTTP status code of the response
             authenticated: Whether the request was authenticated
             duration: Request processing duration in seconds
+            tool: Tool called by the request, if any
         """
         if not self.enabled:
             return
@@ -54,19 +72,64 @@ class Monitoring:
                    f"Request: {endpoint} from {client_id} - "
                    f"Status: {status}, Auth: {authenticated}, Time: {duration:.4f}s")
         
-        # Store for statistics
-        self.requests.append({
-            'timestamp': time.time(),
-            'client_id': client_id,
-            'endpoint': endpoint,
-            'status': status,
-            'authenticated': authenticated,
-            'duration': duration
-        })
-        
-        # Trim requests list if necessary
-        if len(self.requests) > self.max_requests:
-            self.requests = self.requests[-self.max_requests:]
+        self.record_request(client_id, endpoint, status, authenticated, duration, tool)
+    
+    def record_request(self, client_id: str, endpoint: str, status: int, authenticated: bool,
+                       duration: float, tool: Optional[str] = None, status_label: Optional[str] = None):
+        """Record a request for statistics without logging it.
+        
+        Args:
+            client_id: Client identifier (e.g., IP address)
+            endpoint: The requested endpoint
+            status: HTTP status code of the response
+            authenticated: Whether the request was authenticated
+            duration: Request processing duration in seconds
+            tool: Tool called by the request, if any
+            status_label: Status class for latency histograms (defaults to the
+                class of the HTTP status, such as ``2xx``)
+        """
+        if not self.enabled:
+            return
+        
+        # Store for statistics, overwriting the oldest request once full
+        now = time.time()
+        self.requests.append(now, client_id, endpoint, status, authenticated, duration)
+        self.latency.record(endpoint, tool, status_label or status_class(status), duration, now)
+    
+    def request_started(self):
+        """Count a request as in flight until request_finished() is called."""
+        with self._lock:
+            self.in_flight += 1
+    
+    def request_finished(self):
+        """Stop counting a request started with request_started() as in flight."""
+        with self._lock:
+            self.in_flight -= 1
+    
+    def increment(self, name: str, label: str = ""):
+        """Add one to a labeled event counter, such as rejections per rate limit layer.
+        
+        Args:
+            name: Name of the counter
+            label: Value of the counter's label
+        """
+        with self._lock:
+            counter = self.counters.setdefault(name, {})
+            counter[label] = counter.get(label, 0) + 1
+    
+    def get_counters(self) -> Dict[str, Dict[str, int]]:
+        """Get a copy of the event counters, by name and then label."""
+        with self._lock:
+            return {name: dict(counter) for name, counter in self.counters.items()}
+    
+    def add_stats_provider(self, name: str, provider: Callable[[], Dict[str, Any]]):
+        """Register a callable whose statistics are included in get_stats().
+        
+        Args:
+            name: Key under which the provider's statistics are reported
+            provider: Callable returning a dictionary of statistics
+        """
+        self.stats_providers[name] = provider
     
     def get_system_stats(self) -> Dict[str, Any]:
         """Get system statistics.
@@ -82,14 +145,15 @@ class Monitoring:
         minutes, seconds = divmod(remainder, 60)
         uptime_str = f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
         
-        memory_info = self.process.memory_info()
+        sample = self.sampler.latest()
         
         return {
             'uptime': uptime_str,
-            'memory_usage_mb': round(memory_info.rss / (1024 * 1024), 2),
-            'cpu_percent': self.process.cpu_percent(interval=0.1),
-            'request_count': len(self.requests),
-            'request_rate': round(len(self.requests) / uptime if uptime > 0 else 0, 2),
+            'memory_usage_mb': round(sample['rss_bytes'] / (1024 * 1024), 2),
+            'cpu_percent': sample['cpu_percent'],
+            'sampled_at': sample['timestamp'],
+            'request_count': self.requests.total,
+            'request_rate': round(self.latency.request_rate(), 2),
             'monitoring_enabled': self.enabled
         }
     
@@ -105,9 +169,7 @@ class Monitoring:
         if not self.enabled:
             return []
             
-        errors = [r for r in self.requests if r['status'] >= 400]
-        errors.sort(key=lambda x: x['timestamp'], reverse=True)
-        return errors[:limit]
+        return self.requests.recent_errors(limit)
 
     def get_uptime(self) -> float:
         """Get the server uptime in seconds."""
@@ -119,8 +181,8 @@ class Monitoring:
             return
         
         uptime = self.get_uptime()
-        total_requests = len(self.requests)
-        memory_usage = self.process.memory_info().rss / 1024 / 1024  # MB
+        total_requests = self.requests.total
+        memory_usage = self.sampler.latest()['rss_bytes'] / 1024 / 1024  # MB
         
         print(f"📊 Server Stats - Uptime: {uptime:.1f}s, Requests: {total_requests}, Memory: {memory_usage:.1f}MB")
     
@@ -130,12 +192,20 @@ class Monitoring:
             return {}
         
         uptime = self.get_uptime()
-        total_requests = len(self.requests)
-        memory_usage = self.process.memory_info().rss / 1024 / 1024  # MB
+        total_requests = self.requests.total
+        memory_usage = self.sampler.latest()['rss_bytes'] / 1024 / 1024  # MB
         
-        return {
+        stats = {
             "uptime": uptime,
             "total_requests": total_requests,
             "memory_usage_mb": memory_usage,
-            "start_time": self.start_time
+            "start_time": self.start_time,
+            "process": self.sampler.get_stats(),
+            "request_log": self.requests.get_stats(),
+            "latency": self.latency.get_stats(),
+            "in_flight": self.in_flight,
+            "counters": self.get_counters()
         }
+        for name, provider in self.stats_providers.items():
+            stats[name] = provider()
+        return stats
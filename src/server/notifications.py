@@ -0,0 +1,108 @@
+"""Server-to-client notification delivery for streaming sessions."""
+
+import queue
+import threading
+from typing import Any, Dict, Hashable, List
+
+
+class NotificationHub:
+    """Fans out notifications to the open streams of each client.
+
+    Every open stream gets its own bounded queue. When a slow client lets
+    its queue fill up, the oldest notification is dropped so publishers
+    never block.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        """Initialize the hub.
+
+        Args:
+            max_queue: Maximum undelivered notifications kept per stream
+        """
+        self.max_queue = max_queue
+        self._streams: Dict[Hashable, List[queue.Queue]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, owner: Hashable) -> queue.Queue:
+        """Open a stream for a client.
+
+        Args:
+            owner: Identity of the client, such as its API key
+
+        Returns:
+            Queue from which the stream reads its notifications
+        """
+        stream = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._streams.setdefault(owner, []).append(stream)
+        return stream
+
+    def unsubscribe(self, owner: Hashable, stream: queue.Queue):
+        """Close a stream opened with subscribe().
+
+        Args:
+            owner: Identity of the client
+            stream: The stream's queue
+        """
+        with self._lock:
+            streams = self._streams.get(owner, [])
+            if stream in streams:
+                streams.remove(stream)
+            if not streams:
+                self._streams.pop(owner, None)
+
+    def has_streams(self, owner: Hashable) -> bool:
+        """Check whether a client has any open stream.
+
+        Args:
+            owner: Identity of the client
+
+        Returns:
+            True if at least one stream is open
+        """
+        with self._lock:
+            return bool(self._streams.get(owner))
+
+    def publish(self, owner: Hashable, message: Dict[str, Any]) -> int:
+        """Deliver a notification to every open stream of a client.
+
+        Args:
+            owner: Identity of the client
+            message: JSON-RPC notification to deliver
+
+        Returns:
+            Number of streams the notification was queued on
+        """
+        with self._lock:
+            streams = list(self._streams.get(owner, []))
+            self.published += 1
+
+        for stream in streams:
+            while True:
+                try:
+                    stream.put_nowait(message)
+                    break
+                except queue.Full:
+                    try:
+                        stream.get_nowait()
+                        with self._lock:
+                            self.dropped += 1
+                    except queue.Empty:
+                        pass
+        return len(streams)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get notification statistics.
+
+        Returns:
+            Dictionary with open stream counts and delivery counters
+        """
+        with self._lock:
+            return {
+                "clients": len(self._streams),
+                "streams": sum(len(streams) for streams in self._streams.values()),
+                "published": self.published,
+                "dropped": self.dropped
+            }
@@ -0,0 +1,175 @@
+"""Per-key access policies: tiers, rate limits and tool and method allowlists."""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .errors import MCPError
+
+
+class AccessDeniedError(MCPError):
+    """Raised when an API key is not allowed to use a method or tool."""
+
+    def __init__(self, message: str):
+        super().__init__(-32003, message, {"retryable": False})
+
+
+class KeyPolicy:
+    """Tier, rate limit and allowlists of an API key.
+
+    Policies are resolved once when keys are loaded and shared by every
+    key with the same settings. Tool allowlists are glob patterns over
+    tool names, evaluated against the registry as a bitset over tool ids
+    that is recomputed only when the set of registered tools changes, so
+    checking a call is a dictionary lookup and a bit test. ``None`` for
+    ``tools`` or ``methods`` allows everything.
+    """
+
+    __slots__ = ('tier', 'requests_per_minute', 'tools', 'methods',
+                 '_exact_methods', '_method_prefixes', '_mask')
+
+    def __init__(self, tier: str = "default", requests_per_minute: Optional[int] = None,
+                 tools: Optional[Iterable[str]] = None, methods: Optional[Iterable[str]] = None):
+        """Initialize the policy.
+
+        Args:
+            tier: Name of the key's tier
+            requests_per_minute: Rate limit of the key (None uses the server default)
+            tools: Glob patterns of allowed tool names
+            methods: Allowed JSON-RPC methods; ``tools/*`` style entries allow a whole namespace
+        """
+        self.tier = tier
+        self.requests_per_minute = requests_per_minute
+        self.tools: Optional[Tuple[str, ...]] = tuple(tools) if tools is not None else None
+        self.methods: Optional[Tuple[str, ...]] = tuple(methods) if methods is not None else None
+        self._exact_methods = frozenset(m for m in self.methods or () if not m.endswith("*"))
+        self._method_prefixes = tuple(m[:-1] for m in self.methods or () if m.endswith("*"))
+        self._mask: Tuple[Any, int, int] = (None, -1, 0)
+
+    def allows_method(self, method: str) -> bool:
+        """Check whether the key may call a JSON-RPC method.
+
+        Args:
+            method: The method name
+
+        Returns:
+            True if the method is allowed
+        """
+        if self.methods is None:
+            return True
+        return method in self._exact_methods or method.startswith(self._method_prefixes)
+
+    def tool_mask(self, registry) -> Optional[int]:
+        """Get the bitset of allowed tool ids.
+
+        Args:
+            registry: ToolRegistry assigning the tool ids
+
+        Returns:
+            Bitset with bit ``tool_id`` set for every allowed tool, or None if all are allowed
+        """
+        if self.tools is None:
+            return None
+        cached_registry, version, mask = self._mask
+        if cached_registry is not registry or version != registry.version:
+            version = registry.version
+            mask = registry.tool_mask(self.tools)
+            self._mask = (registry, version, mask)
+        return mask
+
+    def allows_tool(self, registry, name: str) -> bool:
+        """Check whether the key may call a tool.
+
+        Args:
+            registry: ToolRegistry holding the tool
+            name: The tool name
+
+        Returns:
+            True if the tool is allowed
+        """
+        mask = self.tool_mask(registry)
+        if mask is None:
+            return True
+        tool_id = registry.tool_id(name)
+        return tool_id is not None and bool(mask >> tool_id & 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the policy as a dictionary.
+
+        Returns:
+            Dictionary with the tier, rate limit and allowlists
+        """
+        return {
+            "tier": self.tier,
+            "requests_per_minute": self.requests_per_minute,
+            "tools": list(self.tools) if self.tools is not None else None,
+            "methods": list(self.methods) if self.methods is not None else None
+        }
+
+
+DEFAULT_POLICY = KeyPolicy()
+
+_POLICY_FIELDS = ("requests_per_minute", "tools", "methods")
+
+
+def parse_tiers(specs: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, KeyPolicy]:
+    """Build the tier policies of a key source.
+
+    Args:
+        specs: Tier settings keyed by tier name
+
+    Returns:
+        Policies keyed by tier name, always including ``default``
+
+    Raises:
+        ValueError: If a tier's settings are malformed
+    """
+    tiers = {"default": DEFAULT_POLICY}
+    for name, spec in (specs or {}).items():
+        if not isinstance(spec, dict):
+            raise ValueError(f"Tier {name!r} must be an object")
+        tiers[name] = _build_policy(name, spec, DEFAULT_POLICY)
+    return tiers
+
+
+def resolve_policy(spec: Dict[str, Any], tiers: Dict[str, KeyPolicy]) -> KeyPolicy:
+    """Resolve the policy of one key from its tier and its own overrides.
+
+    Keys without overrides share their tier's policy object.
+
+    Args:
+        spec: The key's settings (``tier`` plus optional overrides)
+        tiers: Tier policies from parse_tiers()
+
+    Returns:
+        The key's policy
+
+    Raises:
+        ValueError: If the tier is unknown or a setting is malformed
+    """
+    tier_name = spec.get("tier") or "default"
+    tier = tiers.get(tier_name)
+    if tier is None:
+        raise ValueError(f"Unknown tier {tier_name!r}")
+    if not any(spec.get(field) is not None for field in _POLICY_FIELDS):
+        return tier
+    return _build_policy(tier_name, spec, tier)
+
+
+def _build_policy(tier_name: str, spec: Dict[str, Any], base: KeyPolicy) -> KeyPolicy:
+    """Build a policy from settings, falling back to a base policy."""
+    rate = spec.get("requests_per_minute", base.requests_per_minute)
+    if rate is not None and (not isinstance(rate, int) or isinstance(rate, bool) or rate < 1):
+        raise ValueError(f"requests_per_minute must be a positive integer, got {rate!r}")
+    tools = _string_list(spec.get("tools"), "tools", base.tools)
+    methods = _string_list(spec.get("methods"), "methods", base.methods)
+    return KeyPolicy(tier_name, rate, tools, methods)
+
+
+def _string_list(value: Any, name: str, default: Optional[Tuple[str, ...]]) -> Optional[Iterable[str]]:
+    """Parse a list of strings, or a comma-separated string, from a key source."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        value = [item.strip() for item in value.split(",") if item.strip()]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{name} must be a list of strings")
+    return value
@@ -0,0 +1,120 @@
+"""Background sampling of process and system statistics."""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessSampler:
+    """Samples process and system statistics on a background thread.
+
+    Each sample is a plain dictionary of CPU usage, memory, open file
+    descriptors, threads and context switches, appended to a bounded
+    history. Readers get the latest sample without any system call, so
+    status and metrics endpoints never block on psutil. CPU percentages
+    are measured between consecutive samples rather than by sleeping.
+    """
+
+    def __init__(self, interval: float = 5.0, history: int = 60, process: Optional[psutil.Process] = None):
+        """Initialize the sampler and take a first sample.
+
+        Args:
+            interval: Seconds between samples
+            history: Number of most recent samples kept
+            process: Process to sample (defaults to the current process)
+        """
+        self.interval = interval
+        self.process = process or psutil.Process(os.getpid())
+        self.samples: deque = deque(maxlen=history)
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Prime the CPU counters so the next sample has a baseline
+        self.process.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None)
+        self.sample()
+
+    def sample(self) -> Dict[str, Any]:
+        """Take a sample now and add it to the history.
+
+        Returns:
+            The new sample
+        """
+        process = self.process
+        with process.oneshot():
+            cpu_times = process.cpu_times()
+            memory = process.memory_info()
+            switches = process.num_ctx_switches()
+            sample = {
+                "timestamp": time.time(),
+                "cpu_percent": process.cpu_percent(interval=None),
+                "cpu_user_seconds": cpu_times.user,
+                "cpu_system_seconds": cpu_times.system,
+                "rss_bytes": memory.rss,
+                "vms_bytes": memory.vms,
+                "threads": process.num_threads(),
+                "open_fds": process.num_fds() if hasattr(process, "num_fds") else None,
+                "ctx_switches_voluntary": switches.voluntary,
+                "ctx_switches_involuntary": switches.involuntary,
+                "start_time": process.create_time()
+            }
+        sample["system_cpu_percent"] = psutil.cpu_percent(interval=None)
+        sample["system_memory_percent"] = psutil.virtual_memory().percent
+        # deque appends are atomic, so readers never see a partial history
+        self.samples.append(sample)
+        return sample
+
+    def latest(self) -> Dict[str, Any]:
+        """Get the most recent sample, without any system call."""
+        return self.samples[-1]
+
+    def history(self) -> List[Dict[str, Any]]:
+        """Get the held samples, oldest first."""
+        return list(self.samples)
+
+    def start(self):
+        """Start sampling on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="process-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Take a sample every interval until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except psutil.Error as e:
+                self.errors += 1
+                logger.warning(f"Process sampling failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the latest sample and sampler state.
+
+        Returns:
+            Dictionary with the latest sample, its age and the history size
+        """
+        latest = self.latest()
+        return {
+            **latest,
+            "age_seconds": round(time.time() - latest["timestamp"], 3),
+            "interval": self.interval,
+            "history": len(self.samples),
+            "running": self._thread is not None,
+            "errors": self.errors
+        }
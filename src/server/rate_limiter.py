@@ -1,66 +1,349 @@
-
 """Rate limiting implementation for the secure MCP server."""
 
+import heapq
+import math
+import threading
 import time
-from typing import Dict, Tuple, Optional
-from collections import defaultdict, deque
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+from collections import ChainMap, OrderedDict, deque
+
+ALGORITHMS = ("sliding_window", "gcra")
+
+# Expiry queue entries processed per check
+EXPIRE_BATCH = 2
+
+
+class _Shard:
+    """One stripe of the client table, with its own lock and expiry heap."""
+
+    __slots__ = ('clients', 'expiry', 'lock', 'max_clients', 'evicted', 'expired')
+
+    def __init__(self, max_clients: int):
+        # Client state in least recently seen order
+        self.clients: "OrderedDict[str, Any]" = OrderedDict()
+        # (expires_at, client_id), at least one entry per tracked client
+        self.expiry: List[Tuple[float, str]] = []
+        self.lock = threading.Lock()
+        self.max_clients = max_clients
+        self.evicted = 0
+        self.expired = 0
+
+    def track(self, client_id: str, state: Any, expires_at: float, state_expiry: Callable[[Any], float]):
+        """Start tracking a client, evicting the least recently seen beyond the cap. Caller must hold the lock."""
+        clients = self.clients
+        clients[client_id] = state
+        heapq.heappush(self.expiry, (expires_at, client_id))
+        while len(clients) > self.max_clients:
+            clients.popitem(last=False)
+            self.evicted += 1
+        # Entries of evicted clients are only dropped when they come due
+        if len(self.expiry) > 2 * self.max_clients + EXPIRE_BATCH:
+            self.expiry = [(state_expiry(state), c) for c, state in clients.items()]
+            heapq.heapify(self.expiry)
+
+    def expire(self, now: float, state_expiry: Callable[[Any], float]):
+        """Process the next due entries of the expiry heap. Caller must hold the lock."""
+        expiry = self.expiry
+        for _ in range(EXPIRE_BATCH):
+            if not expiry or expiry[0][0] > now:
+                return
+            _, client_id = heapq.heappop(expiry)
+            state = self.clients.get(client_id)
+            if state is None:
+                continue
+            expires_at = state_expiry(state)
+            if expires_at <= now:
+                del self.clients[client_id]
+                self.expired += 1
+            else:
+                # The client was active since; check again when it is due
+                heapq.heappush(expiry, (expires_at, client_id))
 
 
 class RateLimiter:
-    """Implements rate limiting for the secure MCP server."""
+    """Implements rate limiting for the secure MCP server.
+
+    Two algorithms are available:
+
+    - ``sliding_window`` keeps the timestamp of every request in the
+      window, which counts exactly but costs memory and trimming time
+      proportional to the limit.
+    - ``gcra`` (generic cell rate algorithm, equivalent to a token bucket
+      of ``limit`` tokens refilled over ``window``) keeps a single
+      theoretical arrival time per client, so memory and time per check
+      are constant whatever the limit.
+
+    Limits can be layered (for example globally, per API key, per IP and
+    per tool) and requests can cost more than one unit; see check_layers().
 
-    def __init__(self, limit: int = 100, window: int = 60):
+    The client table is split into ``shards`` stripes by a hash of the
+    client id, each with its own lock, so concurrent checks only contend
+    when their clients share a stripe. Each stripe holds at most its share
+    of ``max_clients`` clients; the least recently seen client is evicted
+    to make room for a new one. Clients whose state has fully expired are
+    removed incrementally through an expiry heap per stripe, a few
+    entries on every check, so no full scan is needed.
+    """
+
+    def __init__(self, limit: int = 100, window: int = 60, algorithm: str = "sliding_window",
+                 max_clients: int = 100000, shards: int = 16):
         """Initialize the rate limiter.
-        
+
         Args:
             limit: Maximum number of requests per window
             window: Time window in seconds
+            algorithm: ``sliding_window`` or ``gcra``
+            max_clients: Maximum number of clients tracked at once
+            shards: Number of independently locked stripes of the client table
+
+        Raises:
+            ValueError: If the algorithm is unknown
         """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown rate limit algorithm {algorithm!r}, expected one of {ALGORITHMS}")
         self.limit = limit
         self.window = window
-        self.requests = defaultdict(lambda: deque(maxlen=limit+1))
-    
-    def check_rate_limit(self, client_id: str) -> Tuple[bool, Optional[int], Optional[int]]:
+        self.algorithm = algorithm
+        self.max_clients = max_clients
+        self._shards = [_Shard(max(1, max_clients // shards)) for _ in range(shards)]
+        if algorithm == "gcra":
+            self._peek, self._commit = self._peek_gcra, self._commit_gcra
+            self._state_expiry = _arrival_expiry
+        else:
+            self._peek, self._commit = self._peek_sliding_window, self._commit_sliding_window
+            self._state_expiry = self._window_expiry
+        self._stats_lock = threading.Lock()
+        self.delayed = 0
+        self.delay_seconds = 0.0
+
+    @property
+    def requests(self) -> Mapping[str, deque]:
+        """Read-only view of the request timestamps per client (sliding window)."""
+        return ChainMap(*(shard.clients for shard in self._shards)) if self.algorithm != "gcra" else {}
+
+    @property
+    def arrivals(self) -> Mapping[str, float]:
+        """Read-only view of the theoretical arrival time per client (GCRA)."""
+        return ChainMap(*(shard.clients for shard in self._shards)) if self.algorithm == "gcra" else {}
+
+    def _window_expiry(self, client_requests: deque) -> float:
+        """Get the time after which a sliding window client can be dropped."""
+        return client_requests[-1] + self.window if client_requests else 0.0
+
+    def check_rate_limit(self, client_id: str, limit: Optional[int] = None) -> Tuple[bool, Optional[int], Optional[int]]:
         """Check if a client has exceeded their rate limit.
-        
+
         Args:
             client_id: Identifier for the client (e.g., IP address)
-        
+            limit: Requests allowed per window for this client (defaults to the limiter's limit)
+
         Returns:
             Tuple of (allowed, retry_after, remaining)
             - allowed: True if request is allowed, False otherwise
             - retry_after: Seconds to wait before retrying (if exceeded)
             - remaining: Number of requests remaining in the window
         """
-        now = time.time()
-        client_requests = self.requests[client_id]
-        
+        limit = self.limit if limit is None else limit
+        shard = self._shards[hash(client_id) % len(self._shards)]
+        with shard.lock:
+            now = time.time()
+            shard.expire(now, self._state_expiry)
+            allowed, value, remaining, _ = self._peek(shard, client_id, 1, limit, now, 0.0)
+            if not allowed:
+                return False, value, 0
+            self._commit(shard, client_id, 1, value, now)
+            return True, None, remaining
+
+    def check_layers(self, layers: Sequence[Tuple[str, str, Optional[int]]], cost: int = 1,
+                     max_delay: float = 0.0) -> Tuple[bool, Optional[float], Optional[int], Optional[str]]:
+        """Check a request against several layered limits at once.
+
+        Every layer is checked and, only if all of them allow the request,
+        debited ``cost`` units, all under one lock. A cost above a layer's
+        limit is charged as the whole limit.
+
+        With ``max_delay``, a request over a limit that would be allowed
+        within that many seconds is not rejected: its units are reserved
+        at the time it becomes allowed, and the caller is told to hold it
+        until then. Later requests queue behind it, like a leaky bucket.
+
+        Args:
+            layers: (layer name, client id, limit per window) of each limit that
+                applies, e.g. ``("key", key_id, 100)``; a limit of None uses the
+                limiter's limit
+            cost: Units the request uses from every layer
+            max_delay: Longest time in seconds a request may be held instead of rejected
+
+        Returns:
+            Tuple of (allowed, wait, remaining, layer)
+            - wait: If rejected, seconds to wait before retrying (an integer); if
+              allowed, seconds to hold the request before serving it, or None to
+              serve it at once
+            - remaining: Smallest number of units remaining across the layers
+            - layer: Name of the layer that rejected the request (the one with the
+              longest wait if several did), None if allowed
+        """
+        return self._check_many([(name, f"{name}:{client_id}", limit)
+                                 for name, client_id, limit in layers], cost, max_delay)
+
+    def _check_many(self, entries: Sequence[Tuple[Optional[str], str, Optional[int]]], cost: int,
+                    max_delay: float = 0.0) -> Tuple[bool, Optional[float], Optional[int], Optional[str]]:
+        """Check and debit (layer, table key, limit) entries in one pass.
+
+        The stripes of all entries are locked together, in stripe order.
+        """
+        count = len(self._shards)
+        located = [(layer, key, limit, self._shards[hash(key) % count]) for layer, key, limit in entries]
+        shards = [self._shards[i] for i in sorted({hash(key) % count for _, key, _ in entries})]
+        for shard in shards:
+            shard.lock.acquire()
+        try:
+            now = time.time()
+            for shard in shards:
+                shard.expire(now, self._state_expiry)
+            pending = []
+            rejected: Optional[Tuple[Optional[str], int]] = None
+            remaining: Optional[int] = None
+            delay = 0.0
+            for layer, key, limit, shard in located:
+                limit = self.limit if limit is None else limit
+                allowed, value, left, wait = self._peek(shard, key, min(cost, limit), limit, now, max_delay)
+                if not allowed:
+                    if rejected is None or value > rejected[1]:
+                        rejected = (layer, value)
+                elif rejected is None:
+                    pending.append((shard, key, min(cost, limit), value))
+                    remaining = left if remaining is None else min(remaining, left)
+                    delay = max(delay, wait)
+            if rejected is not None:
+                return False, rejected[1], 0, rejected[0]
+            for shard, key, units, value in pending:
+                self._commit(shard, key, units, value, now)
+        finally:
+            for shard in reversed(shards):
+                shard.lock.release()
+
+        if delay > 0:
+            with self._stats_lock:
+                self.delayed += 1
+                self.delay_seconds += delay
+            return True, delay, remaining, None
+        return True, None, remaining, None
+
+    def _peek_sliding_window(self, shard: _Shard, key: str, cost: int, limit: int, now: float,
+                             max_delay: float) -> Tuple[bool, Any, int, float]:
+        """Check cost units against the timestamps of the client's requests in the window.
+
+        Requests held by smoothing are recorded at the time they are served,
+        which can be in the future.
+
+        Returns:
+            Tuple of (allowed, time the request is served or retry_after if
+            rejected, remaining after the request, delay)
+        """
+        client_requests = shard.clients.get(key)
+        if client_requests is None:
+            return True, now, limit - cost, 0.0
+        shard.clients.move_to_end(key)
+
         # Remove expired timestamps
         while client_requests and client_requests[0] < now - self.window:
             client_requests.popleft()
-        
-        # Check if limit is exceeded
-        if len(client_requests) >= self.limit:
-            retry_after = int(client_requests[0] - (now - self.window)) + 1
-            return False, retry_after, 0
-        
-        # Add current request timestamp
-        client_requests.append(now)
-        
-        # Return allowed with remaining count
-        remaining = self.limit - len(client_requests)
-        return True, None, remaining
-    
+
+        # Check if limit is exceeded; wait until enough timestamps expire
+        used = len(client_requests)
+        if used + cost <= limit:
+            return True, max(now, client_requests[-1]) if client_requests else now, limit - used - cost, 0.0
+        ready = client_requests[used + cost - limit - 1] + self.window
+        if ready - now <= max_delay:
+            return True, max(ready, client_requests[-1]), 0, ready - now
+        return False, int(ready - now) + 1, 0, 0.0
+
+    def _commit_sliding_window(self, shard: _Shard, key: str, cost: int, served_at: float, now: float):
+        """Record cost units used at the time the request is served."""
+        client_requests = shard.clients.get(key)
+        if client_requests is None:
+            client_requests = deque()
+            shard.track(key, client_requests, now + self.window, self._state_expiry)
+        client_requests.extend([served_at] * cost)
+
+    def _peek_gcra(self, shard: _Shard, key: str, cost: int, limit: int, now: float,
+                   max_delay: float) -> Tuple[bool, Any, int, float]:
+        """Check cost units against the client's theoretical arrival time.
+
+        Each unit advances the arrival time by window / limit. A request
+        is allowed while the arrival time it would set is at most one
+        window ahead of now, so a full burst of ``limit`` units is
+        allowed after a quiet window and the rate then evens out. Up to
+        ``max_delay`` beyond that, the request is allowed once it is
+        within one window.
+
+        Returns:
+            Tuple of (allowed, new arrival time or retry_after if rejected,
+            remaining after the request, delay)
+        """
+        interval = self.window / limit
+        previous = shard.clients.get(key)
+        if previous is not None:
+            shard.clients.move_to_end(key)
+        arrival = max(previous or now, now) + cost * interval
+        ahead = arrival - now
+
+        if ahead > self.window + max_delay:
+            return False, max(1, math.ceil(ahead - self.window)), 0, 0.0
+        delay = max(0.0, ahead - self.window)
+        return True, arrival, max(0, int((self.window - ahead) / interval + 1e-9)), delay
+
+    def _commit_gcra(self, shard: _Shard, key: str, cost: int, arrival: float, now: float):
+        """Store the client's new theoretical arrival time."""
+        if key in shard.clients:
+            shard.clients[key] = arrival
+        else:
+            shard.track(key, arrival, now + self.window, self._state_expiry)
+
     def clear_old_entries(self):
-        """Clear old entries to prevent memory growth."""
+        """Clear all expired entries at once.
+
+        Expired clients are also removed incrementally on every check, so
+        calling this is not required to bound memory.
+        """
         now = time.time()
-        expired_clients = []
-        
-        for client_id, timestamps in self.requests.items():
-            # Check if all timestamps are expired
-            if all(ts < now - self.window for ts in timestamps):
-                expired_clients.append(client_id)
-        
-        # Remove expired clients
-        for client_id in expired_clients:
-            del self.requests[client_id]
+        for shard in self._shards:
+            with shard.lock:
+                # Sliding window clients whose timestamps are all expired, and
+                # GCRA clients whose arrival time has passed (full burst back)
+                expired_clients = [client_id for client_id, state in shard.clients.items()
+                                   if self._state_expiry(state) < now]
+                for client_id in expired_clients:
+                    del shard.clients[client_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rate limiter statistics.
+
+        Returns:
+            Dictionary with the client table size, eviction and smoothing counters
+        """
+        clients = expiry_queue = evicted = expired = 0
+        for shard in self._shards:
+            with shard.lock:
+                clients += len(shard.clients)
+                expiry_queue += len(shard.expiry)
+                evicted += shard.evicted
+                expired += shard.expired
+        with self._stats_lock:
+            return {
+                "algorithm": self.algorithm,
+                "clients": clients,
+                "max_clients": self.max_clients,
+                "shards": len(self._shards),
+                "expiry_queue": expiry_queue,
+                "evicted": evicted,
+                "expired": expired,
+                "delayed": self.delayed,
+                "delay_seconds": round(self.delay_seconds, 3)
+            }
+
+
+def _arrival_expiry(arrival: float) -> float:
+    """Get the time after which a GCRA client can be dropped: its full burst is back."""
+    return arrival
@@ -0,0 +1,150 @@
+"""Fixed-memory, column-oriented ring buffer of recent requests."""
+
+import threading
+from array import array
+from typing import Any, Dict, Iterator, List
+
+
+class RequestLog:
+    """Ring buffer holding the most recent requests in typed columns.
+
+    Each field is an ``array`` preallocated to ``capacity`` entries, and
+    endpoint and client strings are stored as ids into an intern table,
+    so recording a request overwrites one slot per column without
+    allocating. Queries scan the columns directly. The intern table is
+    compacted to the strings still referenced once it outgrows the
+    buffer, so it stays bounded however many distinct clients are seen.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """Initialize the request log.
+
+        Args:
+            capacity: Number of most recent requests kept
+        """
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.durations = array('d', bytes(8 * capacity))
+        self.statuses = array('H', bytes(2 * capacity))
+        self.authenticated = array('B', bytes(capacity))
+        self.endpoints = array('I', bytes(4 * capacity))
+        self.clients = array('I', bytes(4 * capacity))
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._next = 0
+        self.total = 0
+        self.compactions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of requests currently held."""
+        return min(self.total, self.capacity)
+
+    def append(self, timestamp: float, client_id: str, endpoint: str, status: int,
+               authenticated: bool, duration: float):
+        """Record a request, overwriting the oldest once the buffer is full.
+
+        Args:
+            timestamp: Unix time the request was received
+            client_id: Client identifier (e.g., IP address)
+            endpoint: The requested endpoint
+            status: HTTP status code of the response
+            authenticated: Whether the request was authenticated
+            duration: Request processing duration in seconds
+        """
+        with self._lock:
+            if len(self._strings) >= 4 * self.capacity + 16:
+                self._compact()
+            i = self._next
+            self.timestamps[i] = timestamp
+            self.durations[i] = duration
+            self.statuses[i] = status
+            self.authenticated[i] = 1 if authenticated else 0
+            self.endpoints[i] = self._intern(endpoint)
+            self.clients[i] = self._intern(client_id)
+            self._next = i + 1 if i + 1 < self.capacity else 0
+            self.total += 1
+
+    def _intern(self, value: str) -> int:
+        """Get the id of a string, adding it to the intern table. Caller must hold the lock."""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def _compact(self):
+        """Rebuild the intern table from the strings still in the buffer. Caller must hold the lock."""
+        held = len(self)
+        used = sorted(set(self.endpoints[:held]) | set(self.clients[:held]))
+        remap = {old: new for new, old in enumerate(used)}
+        self._strings = [self._strings[old] for old in used]
+        self._string_ids = {value: new for new, value in enumerate(self._strings)}
+        for column in (self.endpoints, self.clients):
+            for i in range(held):
+                column[i] = remap[column[i]]
+        self.compactions += 1
+
+    def _slot(self, offset: int) -> int:
+        """Get the slot of the offset-th oldest request."""
+        start = self._next if self.total > self.capacity else 0
+        return (start + offset) % self.capacity
+
+    def _entry(self, i: int) -> Dict[str, Any]:
+        """Build the dictionary form of the request in slot i."""
+        return {
+            'timestamp': self.timestamps[i],
+            'client_id': self._strings[self.clients[i]],
+            'endpoint': self._strings[self.endpoints[i]],
+            'status': self.statuses[i],
+            'authenticated': bool(self.authenticated[i]),
+            'duration': self.durations[i]
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the held requests, oldest first, as dictionaries."""
+        with self._lock:
+            entries = [self._entry(self._slot(offset)) for offset in range(len(self))]
+        return iter(entries)
+
+    def recent_errors(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the most recent requests with an error status.
+
+        Args:
+            limit: Maximum number of requests to return
+
+        Returns:
+            Error requests, newest first
+        """
+        errors = []
+        with self._lock:
+            statuses = self.statuses
+            for offset in range(len(self) - 1, -1, -1):
+                if len(errors) >= limit:
+                    break
+                i = self._slot(offset)
+                if statuses[i] >= 400:
+                    errors.append(self._entry(i))
+        return errors
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics over the held requests.
+
+        Returns:
+            Dictionary with request and error counts, mean duration and buffer usage
+        """
+        with self._lock:
+            held = len(self)
+            errors = sum(1 for status in self.statuses[:held] if status >= 400)
+            duration = sum(self.durations[:held])
+            return {
+                "capacity": self.capacity,
+                "held": held,
+                "total": self.total,
+                "errors": errors,
+                "error_rate": round(errors / held, 4) if held else 0.0,
+                "avg_duration_ms": round(duration / held * 1000, 3) if held else 0.0,
+                "interned_strings": len(self._strings),
+                "compactions": self.compactions
+            }
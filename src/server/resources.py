@@ -0,0 +1,344 @@
+"""File resources exposed from configured root directories."""
+
+import base64
+import binascii
+import codecs
+import json
+import mimetypes
+import mmap
+import os
+import threading
+import urllib.parse
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .errors import MCPError
+
+# MIME types outside text/* that are still served as text
+_TEXT_MIME_TYPES = {"application/json", "application/xml", "application/javascript"}
+
+
+class ResourceNotFoundError(MCPError):
+    """Raised when a resource URI is unknown or outside the configured roots."""
+
+    def __init__(self, uri: Any):
+        super().__init__(-32010, f"Resource {uri} not found")
+
+
+class ResourceTooLargeError(MCPError):
+    """Raised when a read would return more than the configured size limit."""
+
+    def __init__(self, uri: str, length: int, max_bytes: int):
+        super().__init__(
+            -32011,
+            f"Resource {uri} read of {length} bytes exceeds the {max_bytes} byte limit, "
+            "read it in byte ranges instead",
+            {"length": length, "max_bytes": max_bytes}
+        )
+
+
+class ResourceRead:
+    """An open read of one resource, streamed in chunks.
+
+    Files at least ``mmap_threshold`` bytes long are memory-mapped and
+    served as slices of the mapping; smaller files are read in chunks.
+    Either way at most one chunk is held in memory at a time.
+    """
+
+    def __init__(self, uri: str, path: str, mime_type: str, size: int,
+                 offset: int, length: int, as_text: bool,
+                 chunk_size: int, mmap_threshold: int):
+        self.uri = uri
+        self.mime_type = mime_type
+        self.size = size
+        self.offset = offset
+        self.length = length
+        self.as_text = as_text
+        self.chunk_size = chunk_size
+        self.use_mmap = length > 0 and size >= mmap_threshold
+        self._file = open(path, 'rb')
+
+    def __enter__(self) -> "ResourceRead":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying file."""
+        self._file.close()
+
+    def chunks(self) -> Iterator[Any]:
+        """Yield the requested byte range in chunks.
+
+        Yields:
+            bytes, or memoryview slices of the mapping for memory-mapped reads
+        """
+        end = self.offset + self.length
+        if self.use_mmap:
+            with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                with memoryview(mapping) as view:
+                    for start in range(self.offset, end, self.chunk_size):
+                        piece = view[start:min(start + self.chunk_size, end)]
+                        try:
+                            yield piece
+                        finally:
+                            piece.release()
+            return
+
+        self._file.seek(self.offset)
+        remaining = self.length
+        while remaining > 0:
+            data = self._file.read(min(self.chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+    def iter_response(self, request_id: Any) -> Iterator[bytes]:
+        """Yield a JSON-RPC ``resources/read`` response piece by piece.
+
+        The content is encoded chunk by chunk, so the response can be
+        written to the client without building it in memory.
+
+        Args:
+            request_id: JSON-RPC id of the request
+
+        Yields:
+            UTF-8 encoded pieces of the JSON response
+        """
+        field = "text" if self.as_text else "blob"
+        head = json.dumps({"uri": self.uri, "mimeType": self.mime_type})[:-1]
+        yield f'{{"jsonrpc": "2.0", "result": {{"contents": [{head}, "{field}": "'.encode('utf-8')
+
+        if self.as_text:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            for chunk in self.chunks():
+                text = decoder.decode(bytes(chunk))
+                if text:
+                    yield json.dumps(text)[1:-1].encode('utf-8')
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield json.dumps(tail)[1:-1].encode('utf-8')
+        else:
+            # Chunk sizes are multiples of 3, so the pieces concatenate into valid base64
+            for chunk in self.chunks():
+                yield base64.b64encode(chunk)
+
+        meta = {"size": self.size, "offset": self.offset, "length": self.length}
+        yield f'", "_meta": {json.dumps(meta)}}}]}}, "id": {json.dumps(request_id)}}}'.encode('utf-8')
+
+
+class ResourceManager:
+    """Exposes files under configured root directories as ``file://`` resources.
+
+    Only regular files inside a root are served; symlinks and ``..``
+    segments that lead outside every root are treated as unknown
+    resources. Reads may ask for a byte range, and no single read may
+    return more than ``max_file_size_mb``, so larger files are read in
+    ranges.
+    """
+
+    def __init__(self, roots: Optional[Sequence[str]] = None, max_file_size_mb: float = 10,
+                 chunk_size: int = 64 * 1024, mmap_threshold: int = 1024 * 1024,
+                 page_size: int = 100):
+        """Initialize the resource manager.
+
+        Args:
+            roots: Directories whose files are exposed
+            max_file_size_mb: Maximum megabytes returned by a single read
+            chunk_size: Bytes read and encoded at a time (rounded down to a multiple of 3)
+            mmap_threshold: File size in bytes from which reads use mmap
+            page_size: Maximum resources returned per resources/list page
+        """
+        self.roots: List[str] = [os.path.realpath(root) for root in (roots or [])]
+        self.max_bytes = int(max_file_size_mb * 1024 * 1024)
+        self.chunk_size = max(3, chunk_size - chunk_size % 3)
+        self.mmap_threshold = mmap_threshold
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.mmap_reads = 0
+        self.rejected = 0
+
+    def list_resources(self, cursor: Optional[str] = None,
+                       limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List one page of resources in stable path order.
+
+        Args:
+            cursor: Cursor returned with the previous page, or None for the first page
+            limit: Maximum resources to return, capped at page_size
+
+        Returns:
+            Tuple of the resource descriptors and the cursor of the next page
+            (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        page_size = min(limit, self.page_size) if limit and limit > 0 else self.page_size
+        after = _decode_cursor(cursor) if cursor else None
+
+        page: List[Dict[str, Any]] = []
+        for position, path, entry in self._walk(after):
+            if len(page) == page_size:
+                return page, _encode_cursor(last)
+            stat = entry.stat()
+            page.append({
+                "uri": Path(path).as_uri(),
+                "name": "/".join(position[1]),
+                "mimeType": _guess_mime_type(path),
+                "size": stat.st_size
+            })
+            last = position
+        return page, None
+
+    def _walk(self, after: Optional[Tuple[int, List[str]]]) -> Iterator[Tuple[Tuple[int, List[str]], str, os.DirEntry]]:
+        """Walk the files of every root in sorted order, starting after a position."""
+        for root_index, root in enumerate(self.roots):
+            if after is not None and root_index < after[0]:
+                continue
+            skip_to = after[1] if after is not None and root_index == after[0] else None
+            yield from self._walk_dir(root_index, root, [], skip_to)
+
+    def _walk_dir(self, root_index: int, directory: str, parts: List[str],
+                  skip_to: Optional[List[str]]) -> Iterator[Tuple[Tuple[int, List[str]], str, os.DirEntry]]:
+        """Walk one directory depth first, skipping entries up to skip_to."""
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        for entry in entries:
+            entry_parts = parts + [entry.name]
+            if skip_to is not None and entry_parts < skip_to[:len(entry_parts)]:
+                continue
+            if entry.is_symlink():
+                continue
+            if entry.is_dir():
+                # Only the directory on the cursor's path needs further skipping
+                inner_skip = skip_to if skip_to is not None and entry_parts == skip_to[:len(entry_parts)] else None
+                yield from self._walk_dir(root_index, entry.path, entry_parts, inner_skip)
+            elif entry.is_file():
+                if skip_to is not None and entry_parts <= skip_to:
+                    continue
+                yield (root_index, entry_parts), entry.path, entry
+
+    def resolve(self, uri: Any) -> str:
+        """Map a ``file://`` URI to a file path inside one of the roots.
+
+        Args:
+            uri: The resource URI
+
+        Returns:
+            Real path of the file
+
+        Raises:
+            ResourceNotFoundError: If the URI is malformed, outside the roots or not a file
+        """
+        if not isinstance(uri, str):
+            raise ResourceNotFoundError(uri)
+        parsed = urllib.parse.urlsplit(uri)
+        if parsed.scheme != "file" or parsed.netloc not in ("", "localhost"):
+            raise ResourceNotFoundError(uri)
+
+        path = os.path.realpath(urllib.parse.unquote(parsed.path))
+        for root in self.roots:
+            if os.path.commonpath([root, path]) == root and os.path.isfile(path):
+                return path
+        raise ResourceNotFoundError(uri)
+
+    def open_read(self, uri: Any, offset: Any = 0, length: Any = None) -> ResourceRead:
+        """Open a read of a resource or a byte range of it.
+
+        Reads of a whole text file are returned as text; binary files and
+        byte ranges, which may split a character, are returned as base64.
+
+        Args:
+            uri: The resource URI
+            offset: First byte to return
+            length: Number of bytes to return (None reads to the end of the file)
+
+        Returns:
+            An open ResourceRead, to be closed by the caller
+
+        Raises:
+            ResourceNotFoundError: If the resource does not exist
+            ResourceTooLargeError: If the read exceeds max_file_size_mb
+            ValueError: If the byte range is invalid
+        """
+        path = self.resolve(uri)
+        size = os.path.getsize(path)
+
+        if offset is None:
+            offset = 0
+        if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+            raise ValueError("offset must be a non-negative integer")
+        if length is not None and (not isinstance(length, int) or isinstance(length, bool) or length < 0):
+            raise ValueError("length must be a non-negative integer")
+        if offset > size:
+            raise ValueError(f"offset {offset} is past the end of the resource ({size} bytes)")
+
+        available = size - offset
+        length = available if length is None else min(length, available)
+        if length > self.max_bytes:
+            with self._lock:
+                self.rejected += 1
+            raise ResourceTooLargeError(uri, length, self.max_bytes)
+
+        mime_type = _guess_mime_type(path)
+        as_text = offset == 0 and length == size and _is_text(mime_type)
+        read = ResourceRead(uri, path, mime_type, size, offset, length, as_text,
+                            self.chunk_size, self.mmap_threshold)
+        with self._lock:
+            self.reads += 1
+            if read.use_mmap:
+                self.mmap_reads += 1
+        return read
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get resource read statistics.
+
+        Returns:
+            Dictionary with the configured roots and read counters
+        """
+        with self._lock:
+            return {
+                "roots": len(self.roots),
+                "max_bytes": self.max_bytes,
+                "reads": self.reads,
+                "mmap_reads": self.mmap_reads,
+                "rejected_too_large": self.rejected
+            }
+
+
+def _guess_mime_type(path: str) -> str:
+    """Guess a file's MIME type from its name."""
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def _is_text(mime_type: str) -> bool:
+    """Check whether a MIME type is served as text."""
+    return mime_type.startswith("text/") or mime_type in _TEXT_MIME_TYPES
+
+
+def _encode_cursor(position: Tuple[int, List[str]]) -> str:
+    """Encode a listing position as an opaque list cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(position)).encode('utf-8')).decode('ascii')
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, List[str]]:
+    """Decode a list cursor back into a listing position.
+
+    Raises:
+        ValueError: If the cursor is not a valid cursor
+    """
+    try:
+        root_index, parts = json.loads(base64.b64decode(cursor, altchars=b'-_', validate=True))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(root_index, int) or not isinstance(parts, list) \
+            or not all(isinstance(part, str) for part in parts):
+        raise ValueError("Invalid cursor")
+    return root_index, parts
@@ -0,0 +1,268 @@
+"""Weighted fair queuing of tool execution across clients."""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+from .errors import MCPError
+
+
+class SchedulerQueueFullError(MCPError):
+    """Raised when a client already has too many calls waiting."""
+
+    def __init__(self, tenant: Hashable):
+        super().__init__(
+            -32007,
+            "Too many queued calls for this client, please retry later",
+            {"retryable": True, "retry_after": 1}
+        )
+        self.tenant = tenant
+
+
+class SchedulerTimeoutError(MCPError):
+    """Raised when a call waits too long for an execution slot."""
+
+    def __init__(self, tenant: Hashable):
+        super().__init__(
+            -32007,
+            "Timed out waiting for an execution slot, please retry later",
+            {"retryable": True, "retry_after": 1}
+        )
+        self.tenant = tenant
+
+
+class _Waiter:
+    """A queued call waiting to be granted an execution slot."""
+
+    __slots__ = ('cost', 'enqueued_at', 'granted', 'cancelled', 'event')
+
+    def __init__(self, cost: int):
+        self.cost = cost
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.cancelled = False
+        self.event = threading.Event()
+
+    def cancel(self):
+        """Wake the waiting call because it was cancelled."""
+        self.cancelled = True
+        self.event.set()
+
+
+class _TenantStats:
+    """Counters for one client's queue."""
+
+    __slots__ = ('served', 'rejected', 'timed_out', 'cancelled', 'total_wait', 'max_wait')
+
+    def __init__(self):
+        self.served = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class FairScheduler:
+    """Shares a fixed number of execution slots fairly between clients.
+
+    Calls run immediately while slots are free and nobody is queued.
+    Otherwise each client (tenant) gets its own FIFO queue, and freed slots
+    are handed out by deficit round robin: on each visit a tenant earns
+    ``quantum * weight`` credit and is served while its head call's cost
+    fits in the credit. A tenant with weight 3 therefore gets three times
+    the slots of a tenant with weight 1 while both have calls waiting,
+    and one tenant's backlog cannot delay everyone else's calls.
+    """
+
+    def __init__(self, max_concurrent: int = 8, weights: Optional[Dict[Hashable, float]] = None,
+                 default_weight: float = 1.0, quantum: float = 1.0,
+                 max_queue_per_tenant: int = 100):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrent: Number of calls allowed to execute at once
+            weights: Scheduling weight per tenant
+            default_weight: Weight of tenants not listed in weights
+            quantum: Credit earned per round, multiplied by the tenant's weight
+            max_queue_per_tenant: Maximum queued calls per tenant
+
+        Raises:
+            ValueError: If max_concurrent is below 1, or a weight or the quantum is not positive
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        # Round robin never grants a slot to a tenant that earns no credit
+        if quantum <= 0:
+            raise ValueError("quantum must be positive")
+        _check_weight(default_weight)
+        for weight in (weights or {}).values():
+            _check_weight(weight)
+        self.max_concurrent = max_concurrent
+        self.weights: Dict[Hashable, float] = dict(weights or {})
+        self.default_weight = default_weight
+        self.quantum = quantum
+        self.max_queue_per_tenant = max_queue_per_tenant
+
+        self._lock = threading.Lock()
+        self.active = 0
+        self._queues: Dict[Hashable, Deque[_Waiter]] = {}
+        self._ring: Deque[Hashable] = deque()
+        self._deficit: Dict[Hashable, float] = {}
+        self._credited = False
+        self._stats: Dict[Hashable, _TenantStats] = {}
+
+    def set_weight(self, tenant: Hashable, weight: float):
+        """Set the scheduling weight of a tenant.
+
+        Args:
+            tenant: Tenant identity
+            weight: Relative share of execution slots
+
+        Raises:
+            ValueError: If the weight is not positive
+        """
+        _check_weight(weight)
+        with self._lock:
+            self.weights[tenant] = weight
+
+    def acquire(self, tenant: Hashable, cost: int = 1, timeout: Optional[float] = None,
+                on_cancel: Optional[Callable[[Callable[[], None]], None]] = None) -> float:
+        """Wait for an execution slot.
+
+        Args:
+            tenant: Identity of the calling client
+            cost: Scheduling cost of the call
+            timeout: Maximum seconds to wait (None waits forever)
+            on_cancel: Registers a callback to run when the call is cancelled
+                (such as ToolContext.on_cancel), so a queued call stops waiting
+
+        Returns:
+            Seconds spent waiting in the queue
+
+        Raises:
+            SchedulerQueueFullError: If the tenant's queue is full
+            SchedulerTimeoutError: If no slot was granted within timeout, or
+                the call was cancelled while queued
+        """
+        with self._lock:
+            stats = self._stats.get(tenant)
+            if stats is None:
+                stats = self._stats[tenant] = _TenantStats()
+
+            if self.active < self.max_concurrent and not self._ring:
+                self.active += 1
+                stats.served += 1
+                return 0.0
+
+            queue = self._queues.get(tenant)
+            if queue is None:
+                queue = self._queues[tenant] = deque()
+            if len(queue) >= self.max_queue_per_tenant:
+                stats.rejected += 1
+                raise SchedulerQueueFullError(tenant)
+
+            waiter = _Waiter(cost)
+            queue.append(waiter)
+            if len(queue) == 1:
+                self._ring.append(tenant)
+                self._deficit.setdefault(tenant, 0.0)
+            self._dispatch()
+
+        if on_cancel is not None:
+            on_cancel(waiter.cancel)
+        waiter.event.wait(timeout)
+
+        with self._lock:
+            waited = time.monotonic() - waiter.enqueued_at
+            if not waiter.granted:
+                queue.remove(waiter)
+                if not queue:
+                    self._drop_tenant(tenant)
+                if waiter.cancelled:
+                    stats.cancelled += 1
+                else:
+                    stats.timed_out += 1
+                raise SchedulerTimeoutError(tenant)
+            stats.served += 1
+            stats.total_wait += waited
+            stats.max_wait = max(stats.max_wait, waited)
+            return waited
+
+    def release(self):
+        """Release an execution slot and hand it to the next queued call."""
+        with self._lock:
+            self.active -= 1
+            self._dispatch()
+
+    def _weight(self, tenant: Hashable) -> float:
+        """Get a tenant's weight. Caller must hold the lock."""
+        return self.weights.get(tenant, self.default_weight)
+
+    def _dispatch(self):
+        """Grant free slots by deficit round robin. Caller must hold the lock."""
+        while self.active < self.max_concurrent and self._ring:
+            tenant = self._ring[0]
+            queue = self._queues[tenant]
+            if not self._credited:
+                self._deficit[tenant] += self.quantum * self._weight(tenant)
+                self._credited = True
+
+            waiter = queue[0]
+            if waiter.cost <= self._deficit[tenant]:
+                self._deficit[tenant] -= waiter.cost
+                queue.popleft()
+                waiter.granted = True
+                waiter.event.set()
+                self.active += 1
+                if not queue:
+                    self._drop_tenant(tenant)
+            else:
+                # Out of credit for this round, move on to the next tenant
+                self._ring.rotate(-1)
+                self._credited = False
+
+    def _drop_tenant(self, tenant: Hashable):
+        """Remove a tenant with an empty queue from the ring. Caller must hold the lock."""
+        if self._ring and self._ring[0] == tenant:
+            self._credited = False
+        try:
+            self._ring.remove(tenant)
+        except ValueError:
+            pass
+        self._queues.pop(tenant, None)
+        self._deficit.pop(tenant, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics.
+
+        Returns:
+            Dictionary with slot usage and per-tenant queue depth and wait times
+        """
+        with self._lock:
+            tenants = {}
+            for tenant, stats in self._stats.items():
+                queued = len(self._queues.get(tenant, ()))
+                tenants[str(tenant)] = {
+                    "weight": self._weight(tenant),
+                    "queued": queued,
+                    "served": stats.served,
+                    "rejected": stats.rejected,
+                    "timed_out": stats.timed_out,
+                    "cancelled": stats.cancelled,
+                    "avg_wait_ms": round(stats.total_wait / stats.served * 1000, 3) if stats.served else 0.0,
+                    "max_wait_ms": round(stats.max_wait * 1000, 3)
+                }
+            return {
+                "max_concurrent": self.max_concurrent,
+                "active": self.active,
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "tenants": tenants
+            }
+
+
+def _check_weight(weight: float):
+    """Reject a scheduling weight that would never earn a tenant credit."""
+    if not weight > 0:
+        raise ValueError(f"Scheduling weights must be positive, got {weight!r}")
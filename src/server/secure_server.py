@@ -13,52 +13,176 @@ import hashlib
 import hmac
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import urllib.parse
+import queue
 import threading
 import time
 import psutil
 
 # Import from relative path
 from .auth import Authentication
+from .ban_list import BanList
 from .rate_limiter import RateLimiter
 from .monitoring import Monitoring
 from .middleware import SecurityMiddleware
+from .context import ToolContext, resolve_deadline
+from .errors import MCPError
+from .executor import ToolExecutor
+from .idempotency import IdempotencyCache
+from .jobs import JobManager
+from .key_store import KeyStore
+from .metrics import (CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricFamily, MetricsExporter,
+                      histogram_family, process_families)
+from .notifications import NotificationHub
+from .policy import AccessDeniedError
+from .resources import ResourceManager
+from .scheduler import FairScheduler
+from .shared_rate_limiter import SharedRateLimiter
+from .tokens import TokenSigner
+from .watcher import ResourceSubscriptions
 from ..tools.registry import ToolRegistry
 
+# Requests are recorded per endpoint only for these paths and methods, so
+# clients cannot add histogram or metric series with made-up requests
+MONITORED_PATHS = frozenset({'/health', '/metrics', '/mcp', '/api/tools', '/api/status', '/auth/token'})
+MONITORED_METHODS = frozenset({'GET', 'POST', 'OPTIONS'})
+
+
+class GuardedHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server that refuses connections from banned IPs.
+
+    The check runs when a connection is accepted, before a thread is
+    started or any of the request is read.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, ban_list: BanList):
+        self.ban_list = ban_list
+        super().__init__(server_address, handler_class)
+
+    def verify_request(self, request, client_address) -> bool:
+        return not self.ban_list.is_ip_banned(client_address[0])
+
 
 class SecureMCPServer:
     """A secure MCP server implementation with authentication and monitoring"""
     
-    def __init__(self, api_keys=None, port=8443, host="0.0.0.0"):
-        """Initialize the secure MCP server"""
+    def __init__(self, api_keys=None, port=8443, host="0.0.0.0",
+                 max_concurrent_calls=8, tenant_weights=None,
+                 resource_roots=None, max_file_size_mb=10, key_file=None,
+                 token_secrets=None, ban_threshold=10, ban_duration=300,
+                 rate_limit_algorithm="sliding_window", rate_limit_file=None,
+                 global_rate_limit=None, ip_rate_limit=None, rate_limit_max_delay=0.0,
+                 metrics_token=None):
+        """Initialize the secure MCP server
+        
+        Args:
+            api_keys: List of valid API keys
+            port: Port to listen on
+            host: Host to bind to
+            max_concurrent_calls: Number of tool calls executed at once across all clients
+            tenant_weights: Scheduling weight per API key for fair sharing of tool execution
+            resource_roots: Directories whose files are exposed as resources
+            max_file_size_mb: Maximum megabytes returned by a single resource read
+            key_file: Key file or SQLite database reloaded whenever it changes
+            token_secrets: Secrets for signing access tokens, shared by all workers;
+                the first signs new tokens
+            ban_threshold: Failed authentications within a minute that get an IP
+                or key prefix banned
+            ban_duration: Seconds a ban lasts
+            rate_limit_algorithm: ``sliding_window`` (exact, memory grows with the
+                limit) or ``gcra`` (constant memory per client)
+            rate_limit_file: File shared by all worker processes on the host holding
+                one rate limit table (GCRA), instead of a limiter per process
+            global_rate_limit: Units per minute across all clients (None for unlimited)
+            ip_rate_limit: Units per minute per client IP (None for unlimited)
+            rate_limit_max_delay: Seconds a request slightly over its rate limit is
+                held and then served, instead of being rejected
+            metrics_token: Bearer token required to scrape ``/metrics`` (None
+                disables the endpoint)
+        """
         self.host = host
         self.port = port
         self.api_keys = set(api_keys) if api_keys else set()
         self.auth = Authentication(list(self.api_keys))
-        self.rate_limiter = RateLimiter()
+        if rate_limit_file:
+            self.rate_limiter = SharedRateLimiter(rate_limit_file)
+        else:
+            self.rate_limiter = RateLimiter(algorithm=rate_limit_algorithm)
+        self.global_rate_limit = global_rate_limit
+        self.ip_rate_limit = ip_rate_limit
+        self.rate_limit_max_delay = rate_limit_max_delay
         self.monitor = Monitoring()
+        self.monitor.add_stats_provider("rate_limits", self.rate_limiter.get_stats)
         self.tool_registry = ToolRegistry()
         self.tools = self.tool_registry.tools
+        self.scheduler = FairScheduler(
+            max_concurrent=max_concurrent_calls,
+            weights={
+                Authentication.key_id(key): weight
+                for key, weight in (tenant_weights or {}).items()
+            }
+        )
+        self.executor = ToolExecutor(self.tools, scheduler=self.scheduler)
+        self.monitor.add_stats_provider("scheduler", self.scheduler.get_stats)
+        self.monitor.add_stats_provider("tools", self.executor.get_stats)
+        self.monitor.add_stats_provider("execution", self.executor.get_execution_stats)
+        self.notifications = NotificationHub()
+        self.jobs = JobManager(self.executor, hub=self.notifications)
+        self.monitor.add_stats_provider("jobs", self.jobs.store.get_stats)
+        self.monitor.add_stats_provider("notifications", self.notifications.get_stats)
+        self.idempotency = IdempotencyCache()
+        self.monitor.add_stats_provider("idempotency", self.idempotency.get_stats)
+        self.resources = ResourceManager(resource_roots, max_file_size_mb=max_file_size_mb)
+        self.monitor.add_stats_provider("resources", self.resources.get_stats)
+        self.subscriptions = ResourceSubscriptions(self.resources, self.notifications)
+        self.monitor.add_stats_provider("subscriptions", self.subscriptions.get_stats)
+        self.tokens = TokenSigner(token_secrets)
+        self.monitor.add_stats_provider("tokens", self.tokens.get_stats)
+        self.ban_list = BanList(max_failures=ban_threshold, ban_duration=ban_duration)
+        self.monitor.add_stats_provider("bans", self.ban_list.get_stats)
+        self.metrics_token = metrics_token
+        self.metrics = MetricsExporter()
+        self.metrics.add_collector(self._collect_metrics)
+        self.metrics.add_collector(lambda: process_families(self.monitor.sampler.latest()))
+        self.monitor.add_stats_provider("metrics", self.metrics.get_stats)
         self.server = None
         self.server_thread = None
         
+        # Keys from a reloadable file are added to the static keys
+        self.key_store = None
+        if key_file:
+            self.key_store = KeyStore(self.auth, key_file, static_keys=self.api_keys)
+            self.key_store.reload("startup")
+            self.monitor.add_stats_provider("keys", self.key_store.get_stats)
+        
         # If no API keys provided, generate one and print warning
-        if not self.api_keys:
+        if not self.api_keys and not self.auth.key_count:
             default_key = self.auth.generate_key()
             self.api_keys.add(default_key)
+            self.auth.add_key(default_key)
             print(f"⚠️ WARNING: No API keys provided. Using generated key: {default_key}")
             print("Please secure this key and provide it for production use.")
         
     def start(self):
         """Start the HTTP server in a separate thread"""
         handler = self._create_handler()
-        self.server = HTTPServer((self.host, self.port), handler)
+        # Serve each request on its own thread so a slow tool call does not
+        # block every other client; per-tool bulkheads bound the tool work
+        self.server = GuardedHTTPServer((self.host, self.port), handler, self.ban_list)
         
         # Start server in a thread
         self.server_thread = threading.Thread(target=self.server.serve_forever)
         self.server_thread.daemon = True
         self.server_thread.start()
+        self.monitor.sampler.start()
+        
+        if self.key_store:
+            self.key_store.start()
+            self.key_store.install_signal_handler()
+            print(f"🔑 Reloading API keys from {self.key_store.path} on change or SIGHUP")
         
         print(f"🚀 Secure MCP Server running at http://{self.host}:{self.port}")
         print(f"🔒 API Key authentication required")
@@ -79,6 +203,77 @@ class SecureMCPServer:
             self.server.shutdown()
             self.server.server_close()
             print("✅ Server stopped")
+        self.monitor.sampler.stop()
+        self.jobs.shutdown()
+        self.subscriptions.close()
+        if self.key_store:
+            self.key_store.close()
+        if isinstance(self.rate_limiter, SharedRateLimiter):
+            self.rate_limiter.close()
+    
+    def _collect_metrics(self):
+        """Collect the server's request, rate limit and authentication metrics
+        
+        Returns:
+            List of MetricFamily for the Prometheus exporter
+        """
+        totals = self.monitor.latency.totals()
+        requests = MetricFamily("mcp_requests_total", "counter",
+                                "Requests served, by endpoint, tool and status class.")
+        for (endpoint, tool, status), histogram in sorted(totals.items()):
+            requests.add(histogram.count, endpoint=endpoint, tool=tool, status=status)
+        counters = self.monitor.get_counters()
+        rate_limited = MetricFamily("mcp_rate_limited_total", "counter",
+                                    "Requests rejected by a rate limit, by layer.")
+        for layer, count in sorted(counters.get("rate_limited", {}).items()):
+            rate_limited.add(count, layer=layer)
+        auth_failures = MetricFamily("mcp_auth_failures_total", "counter",
+                                     "Failed authentications, by reason.")
+        for reason, count in sorted(counters.get("auth_failures", {}).items()):
+            auth_failures.add(count, reason=reason)
+        limiter = self.rate_limiter.get_stats()
+        bans = self.ban_list.get_stats()
+        return [
+            requests,
+            histogram_family("mcp_request_duration_seconds",
+                             "Request duration in seconds, by endpoint, tool and status class.", totals),
+            MetricFamily("mcp_requests_in_flight", "gauge",
+                         "Requests currently being served.").add(self.monitor.in_flight),
+            rate_limited,
+            MetricFamily("mcp_rate_limit_delayed_total", "counter",
+                         "Requests held to smooth them under a rate limit.").add(limiter["delayed"]),
+            MetricFamily("mcp_rate_limit_clients", "gauge",
+                         "Clients tracked by the rate limiter.").add(limiter["clients"]),
+            auth_failures,
+            MetricFamily("mcp_auth_bans_total", "counter",
+                         "Bans of an IP or key prefix for repeated failed authentication.").add(bans["bans"]),
+            MetricFamily("mcp_auth_banned", "gauge", "IPs and key prefixes currently banned.")
+                .add(bans["banned_ips"], subject="ip").add(bans["banned_prefixes"], subject="prefix")
+        ]
+    
+    def rate_limit_layers(self, key_id, policy, client_ip, tool_name=None):
+        """Get the rate limits that apply to a request
+        
+        Args:
+            key_id: Id of the authenticated API key
+            policy: The key's policy
+            client_ip: IP address of the client
+            tool_name: Tool called by the request, if any
+        
+        Returns:
+            List of (layer, client id, limit) for RateLimiter.check_layers()
+        """
+        layers = []
+        if self.global_rate_limit:
+            layers.append(("global", "*", self.global_rate_limit))
+        # None falls back to the limiter's default per-key limit
+        layers.append(("key", key_id, policy.requests_per_minute))
+        if self.ip_rate_limit:
+            layers.append(("ip", client_ip, self.ip_rate_limit))
+        tool_info = self.tool_registry.get_tool(tool_name) if tool_name else None
+        if tool_info and tool_info.get('rate_limit'):
+            layers.append(("tool", tool_name, tool_info['rate_limit']))
+        return layers
     
     def _create_handler(self):
         """Create a request handler class with access to server instance"""
@@ -89,51 +284,303 @@ class SecureMCPServer:
                 self.server_instance = server
                 super().__init__(*args, **kwargs)
             
+            def parse_request(self):
+                """Parse the request line and headers, restarting the latency clock"""
+                # Restarted once the request line has arrived so that idle time
+                # on a keep-alive connection is not counted
+                self._started = time.perf_counter()
+                if not super().parse_request():
+                    return False
+                self.server_instance.monitor.request_started()
+                self._in_flight = True
+                return True
+            
+            def send_response(self, code, message=None):
+                """Send the response status line, remembering the status"""
+                self._status = code
+                super().send_response(code, message)
+            
+            def handle_one_request(self):
+                """Handle one request and record it in monitoring"""
+                self._started = time.perf_counter()
+                self._status = None
+                self._status_label = None
+                self._authenticated = False
+                self._record_latency = True
+                self._in_flight = False
+                self.tool_name = None
+                try:
+                    super().handle_one_request()
+                finally:
+                    if self._in_flight:
+                        self.server_instance.monitor.request_finished()
+                if self._status is None or not self._record_latency:
+                    return
+                duration = time.perf_counter() - self._started
+                # A request line rejected by the base class leaves no path or command
+                raw_path = getattr(self, 'path', '')
+                command = getattr(self, 'command', None) or ''
+                path = urllib.parse.urlparse(raw_path).path if raw_path else ''
+                # Anything else shares one endpoint so clients cannot grow the histograms
+                if command in MONITORED_METHODS and path in MONITORED_PATHS:
+                    endpoint = f"{command} {path}"
+                else:
+                    endpoint = "other"
+                self.server_instance.monitor.record_request(
+                    self.client_address[0], endpoint, self._status, self._authenticated,
+                    duration, self.tool_name, self._status_label
+                )
+            
             def _authenticate_request(self) -> bool:
                 """Authenticate the current request using API key"""
+                ban_list = self.server_instance.ban_list
+                client_ip = self.client_address[0]
                 auth_header = self.headers.get('Authorization', '')
                 
                 if not auth_header.startswith('Bearer '):
-                    self.send_response(401)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('WWW-Authenticate', 'Bearer')
-                    # Add CORS headers for browser access
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-                    self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
-                    self.end_headers()
-                    error_data = {
-                        "error": "Unauthorized",
-                        "message": "API key required. Use Authorization: Bearer <api_key>"
-                    }
-                    self.wfile.write(json.dumps(error_data).encode('utf-8'))
+                    ban_list.record_failure(client_ip)
+                    self.server_instance.monitor.increment("auth_failures", "missing")
+                    self._send_auth_error(401, "Unauthorized",
+                                          "API key required. Use Authorization: Bearer <api_key>")
                     return False
                     
                 api_key = auth_header[7:]  # Remove 'Bearer ' prefix
+                # Every token starts with the same format prefix and encoded
+                # header, so only API keys are tracked by their prefix
+                self.is_token = TokenSigner.is_token(api_key)
+                credential = None if self.is_token else api_key
                 
-                if api_key not in self.server_instance.api_keys:
-                    self.send_response(403)
-                    self.send_header('Content-type', 'application/json')
+                # Banned clients are turned away before the key is looked up
+                if ban_list.is_ip_banned(client_ip) or ban_list.is_credential_banned(credential):
+                    self.server_instance.monitor.increment("auth_failures", "banned")
+                    self._send_auth_error(403, "Forbidden", "Too many failed authentication attempts")
+                    return False
+                
+                # Signed tokens are verified without the key list
+                if self.is_token:
+                    record = self.server_instance.tokens.verify(api_key)
+                else:
+                    record = self.server_instance.auth.authenticate(api_key)
+                
+                # A genuine token that has expired is not a guessing attempt
+                if record is None and self.is_token and self.server_instance.tokens.is_expired(api_key):
+                    self.server_instance.monitor.increment("auth_failures", "expired")
+                    self._send_auth_error(401, "Unauthorized", "Token expired, request a new one")
+                    return False
+                
+                if record is None:
+                    ban_list.record_failure(client_ip, credential)
+                    self.server_instance.monitor.increment("auth_failures", "invalid")
+                    self._send_auth_error(403, "Forbidden", "Invalid API key or token")
+                    return False
+                
+                self.api_key = api_key
+                self._authenticated = True
+                self.key_id = record.key_id
+                self.policy = record.policy
+                return True
+            
+            def _send_auth_error(self, status: int, error: str, message: str):
+                """Send an authentication error response"""
+                self.send_response(status)
+                self.send_header('Content-type', 'application/json')
+                if status == 401:
+                    self.send_header('WWW-Authenticate', 'Bearer')
+                # Add CORS headers for browser access
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+                self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+                self.end_headers()
+                self.wfile.write(json.dumps({"error": error, "message": message}).encode('utf-8'))
+            
+            def _check_rate_limit(self, request=None):
+                """Check and debit every rate limit that applies to this request
+                
+                Tool calls cost the tool's declared units and also count against
+                the tool's own limit; everything else costs one unit. A request
+                that will be within its limits after at most the server's
+                ``rate_limit_max_delay`` is held until then, before it is
+                dispatched or takes a scheduler slot.
+                
+                Args:
+                    request: The parsed JSON-RPC request, if any
+                
+                Returns:
+                    Tuple of (allowed, retry_after, layer that rejected the request)
+                """
+                server = self.server_instance
+                tool_name, cost = None, 1
+                if request is not None and request.get('method') == 'tools/call':
+                    params = request.get('params')
+                    if isinstance(params, dict) and isinstance(params.get('name'), str):
+                        tool_name = params['name']
+                        cost = server.tool_registry.call_cost(tool_name, params.get('arguments'))
+                        if server.tool_registry.get_tool(tool_name) is not None:
+                            self.tool_name = tool_name
+                layers = server.rate_limit_layers(self.key_id, self.policy, self.client_address[0], tool_name)
+                allowed, wait, _, layer = server.rate_limiter.check_layers(
+                    layers, cost, server.rate_limit_max_delay
+                )
+                if allowed:
+                    if wait:
+                        time.sleep(wait)
+                    return True, None, None
+                server.monitor.increment("rate_limited", layer)
+                return False, wait, layer
+            
+            def _serve_metrics(self):
+                """Serve metrics in the Prometheus text format to holders of the metrics token"""
+                token = self.server_instance.metrics_token
+                if not token:
+                    self._send_json(404, {"error": "Not Found", "message": "Metrics are not enabled"})
+                    return
+                auth_header = self.headers.get('Authorization', '')
+                # API keys do not grant access; only the metrics token does
+                if not hmac.compare_digest(auth_header.encode('utf-8'), f"Bearer {token}".encode('utf-8')):
+                    self.server_instance.ban_list.record_failure(self.client_address[0])
+                    self.server_instance.monitor.increment("auth_failures", "metrics")
+                    self._send_auth_error(401, "Unauthorized",
+                                          "Metrics token required. Use Authorization: Bearer <token>")
+                    return
+                
+                body = self.server_instance.metrics.render()
+                self.send_response(200)
+                self.send_header('Content-type', METRICS_CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def _accepts_event_stream(self) -> bool:
+                """Check whether the client accepts a Server-Sent Events response"""
+                return 'text/event-stream' in self.headers.get('Accept', '')
+            
+            def _stream_mcp_request(self, request):
+                """Process an MCP request over a Server-Sent Events stream.
+                
+                Notifications raised while the request runs (such as progress)
+                are written as they happen, followed by the final response.
+                """
+                self.send_response(200)
+                self.send_header('Content-type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                # Add CORS headers for browser access
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+                self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+                self.end_headers()
+                
+                write_lock = threading.Lock()
+                
+                def send_event(message):
+                    data = f"event: message\ndata: {json.dumps(message)}\n\n".encode('utf-8')
+                    with write_lock:
+                        self.wfile.write(data)
+                        self.wfile.flush()
+                
+                response = self._handle_mcp_request(request, notify=send_event)
+                if 'error' in response:
+                    self._status_label = "rpc_error"
+                try:
+                    send_event(response)
+                except (BrokenPipeError, ConnectionError):
+                    # Client went away before the result was ready
+                    pass
+            
+            def _serve_notification_stream(self):
+                """Hold open a Server-Sent Events stream of server notifications.
+                
+                Notifications for this API key, such as job completions, are
+                pushed as they are published. Comments are sent periodically
+                to keep idle connections alive through proxies.
+                """
+                # Held open for as long as the client listens, so not a latency
+                self._record_latency = False
+                hub = self.server_instance.notifications
+                stream = hub.subscribe(self.key_id)
+                try:
+                    self.send_response(200)
+                    self.send_header('Content-type', 'text/event-stream')
+                    self.send_header('Cache-Control', 'no-cache')
                     # Add CORS headers for browser access
                     self.send_header('Access-Control-Allow-Origin', '*')
                     self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
                     self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
                     self.end_headers()
-                    error_data = {
-                        "error": "Forbidden",
-                        "message": "Invalid API key"
-                    }
-                    self.wfile.write(json.dumps(error_data).encode('utf-8'))
-                    return False
+                    self.wfile.flush()
+                    
+                    while True:
+                        try:
+                            message = stream.get(timeout=15)
+                        except queue.Empty:
+                            self.wfile.write(b": keepalive\n\n")
+                            self.wfile.flush()
+                            continue
+                        data = f"event: message\ndata: {json.dumps(message)}\n\n"
+                        self.wfile.write(data.encode('utf-8'))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionError):
+                    # Client closed the stream
+                    pass
+                finally:
+                    hub.unsubscribe(self.key_id, stream)
+            
+            def _stream_resource_read(self, request):
+                """Process a resources/read request, writing the contents as they are read"""
+                request_id = request.get('id')
+                params = request.get('params') or {}
+                error = None
+                try:
+                    read = self.server_instance.resources.open_read(
+                        params.get('uri'), params.get('offset', 0), params.get('length')
+                    )
+                except MCPError as e:
+                    error = e.to_dict()
+                except ValueError as e:
+                    error = {"code": -32602, "message": str(e)}
                 
-                return True
+                self.send_response(200)
+                self.send_header('Content-type', 'application/json')
+                # Add CORS headers for browser access
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+                self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+                self.end_headers()
+                
+                if error is not None:
+                    self._status_label = "rpc_error"
+                    response = {"jsonrpc": "2.0", "error": error, "id": request_id}
+                    self.wfile.write(json.dumps(response).encode('utf-8'))
+                    return
+                
+                try:
+                    with read:
+                        for piece in read.iter_response(request_id):
+                            self.wfile.write(piece)
+                except (BrokenPipeError, ConnectionError):
+                    # Client closed the connection mid-read
+                    pass
+            
+            def _handle_notification(self, request):
+                """Process an MCP notification, which never gets a response"""
+                params = request.get('params') or {}
+                # Malformed notifications are dropped, there is no response to report them in
+                if not isinstance(params, dict):
+                    return
+                if request.get('method') == 'notifications/cancelled':
+                    request_id = params.get('requestId')
+                    if isinstance(request_id, (str, int)):
+                        self.server_instance.executor.cancel(
+                            (self.key_id, request_id), params.get('reason')
+                        )
             
             def do_OPTIONS(self):
                 """Handle CORS preflight requests"""
                 self.send_response(200)
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-                self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+                self.send_header('Access-Control-Allow-Headers',
+                                 'Content-Type, Authorization, X-Request-Deadline, X-Request-Timeout, '
+                                 'Idempotency-Key')
                 self.send_header('Access-Control-Max-Age', '86400')  # 24 hours
                 self.end_headers()
             
@@ -157,16 +604,21 @@ class SecureMCPServer:
                     self.wfile.write(json.dumps(health_data).encode('utf-8'))
                     return
                 
+                if self.path == '/metrics':
+                    # Metrics have their own token rather than an API key
+                    self._serve_metrics()
+                    return
+                
                 # All other GET endpoints need authentication
                 if not self._authenticate_request():
                     return
                 
                 # Check rate limit
-                client_ip = self.client_address[0]
-                if not self.server_instance.rate_limiter.check_rate_limit(client_ip):
+                allowed, retry_after, layer = self._check_rate_limit()
+                if not allowed:
                     self.send_response(429)
                     self.send_header('Content-type', 'application/json')
-                    self.send_header('Retry-After', '60')
+                    self.send_header('Retry-After', str(retry_after))
                     # Add CORS headers for browser access
                     self.send_header('Access-Control-Allow-Origin', '*')
                     self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
@@ -174,13 +626,41 @@ class SecureMCPServer:
                     self.end_headers()
                     error_data = {
                         "error": "Too many requests",
-                        "message": "Rate limit exceeded. Please try again later."
+                        "message": "Rate limit exceeded. Please try again later.",
+                        "layer": layer
                     }
                     self.wfile.write(json.dumps(error_data).encode('utf-8'))
                     return
                 
-                if self.path == '/api/tools':
-                    # List available tools
+                parsed_path = urllib.parse.urlparse(self.path)
+                if parsed_path.path == '/mcp' and self._accepts_event_stream():
+                    # Server-to-client notification stream
+                    self._serve_notification_stream()
+                elif parsed_path.path == '/api/tools':
+                    # List available tools, one page at a time
+                    query = urllib.parse.parse_qs(parsed_path.query)
+                    try:
+                        limit = int(query['limit'][0]) if 'limit' in query else None
+                        registry = self.server_instance.tool_registry
+                        tools_page, next_cursor = registry.list_tools_page(
+                            cursor=query.get('cursor', [None])[0],
+                            limit=limit,
+                            prefix=query.get('prefix', [None])[0],
+                            tag=query.get('tag', [None])[0],
+                            allowed=self.policy.tool_mask(registry)
+                        )
+                    except ValueError as e:
+                        self.send_response(400)
+                        self.send_header('Content-type', 'application/json')
+                        self.send_header('Access-Control-Allow-Origin', '*')
+                        self.end_headers()
+                        error_data = {
+                            "error": "Bad Request",
+                            "message": str(e)
+                        }
+                        self.wfile.write(json.dumps(error_data).encode('utf-8'))
+                        return
+                    
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
                     # Add CORS headers for browser access
@@ -189,21 +669,36 @@ class SecureMCPServer:
                     self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
                     self.end_headers()
                     
-                    # Get tools with their schemas
-                    tools_list = []
-                    for tool_name, tool_info in self.server_instance.tools.items():
-                        tool_data = {
-                            "name": tool_name,
-                            "description": tool_info.get("description", ""),
-                            "schema": tool_info.get("schema", {})
-                        }
-                        tools_list.append(tool_data)
+                    # Add execution stats to each tool's schema
+                    executor = self.server_instance.executor
+                    tools_list = [
+                        {**tool_data, "stats": executor.get_tool_stats(tool_data["name"])}
+                        for tool_data in tools_page
+                    ]
                     
                     response_data = {
                         "tools": tools_list,
                         "count": len(tools_list)
                     }
+                    if next_cursor:
+                        response_data["nextCursor"] = next_cursor
                     self.wfile.write(json.dumps(response_data).encode('utf-8'))
+                elif parsed_path.path == '/api/status':
+                    # Server status and monitoring statistics
+                    self.send_response(200)
+                    self.send_header('Content-type', 'application/json')
+                    # Add CORS headers for browser access
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                    self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+                    self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+                    self.end_headers()
+                    status_data = {
+                        "status": "running",
+                        "timestamp": datetime.now().isoformat(),
+                        "tools_count": len(self.server_instance.tools),
+                        **self.server_instance.monitor.get_stats()
+                    }
+                    self.wfile.write(json.dumps(status_data).encode('utf-8'))
                 else:
                     # Unknown endpoint
                     self.send_response(404)
@@ -222,34 +717,55 @@ class SecureMCPServer:
                     if not self._authenticate_request():
                         return
                     
-                    # Check rate limit
-                    client_ip = self.client_address[0]
-                    if not self.server_instance.rate_limiter.check_rate_limit(client_ip):
-                        self.send_response(429)
-                        self.send_header('Content-type', 'application/json')
-                        self.send_header('Retry-After', '60')
-                        self.end_headers()
-                        error_data = {
-                            "jsonrpc": "2.0",
-                            "error": {
-                                "code": -32000,
-                                "message": "Rate limit exceeded. Please try again later."
-                            },
-                            "id": None
-                        }
-                        self.wfile.write(json.dumps(error_data).encode('utf-8'))
-                        return
-                    
                     # Process MCP request
                     content_length = int(self.headers['Content-Length'])
                     post_data = self.rfile.read(content_length)
+                    charged = False
                     
                     try:
                         # Parse and validate JSON request
                         request = json.loads(post_data.decode('utf-8'))
-                        if not isinstance(request, dict) or 'method' not in request:
+                        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
                             raise ValueError("Invalid MCP request format")
                         
+                        # Check rate limits once the tool, and so the cost, is known
+                        allowed, retry_after, layer = self._check_rate_limit(request)
+                        charged = True
+                        if not allowed:
+                            self._send_rate_limited(retry_after, layer, request.get('id'))
+                            return
+                        
+                        # Methods outside the key's allowlist are refused, before
+                        # any of the dispatch paths below
+                        method = request['method']
+                        if not self.policy.allows_method(method):
+                            self._status_label = "rpc_error"
+                            self._send_json(200, {
+                                "jsonrpc": "2.0",
+                                "error": AccessDeniedError(f"Method {method} is not allowed for this API key").to_dict(),
+                                "id": request.get('id')
+                            })
+                            return
+                        
+                        # Notifications are acknowledged without a response body
+                        if 'id' not in request and method.startswith('notifications/'):
+                            self._handle_notification(request)
+                            self.send_response(202)
+                            self.send_header('Content-Length', '0')
+                            self.send_header('Access-Control-Allow-Origin', '*')
+                            self.end_headers()
+                            return
+                        
+                        # Stream progress notifications when the client accepts SSE
+                        if method == 'tools/call' and self._accepts_event_stream():
+                            self._stream_mcp_request(request)
+                            return
+                        
+                        # Resource contents are written as they are read
+                        if method == 'resources/read':
+                            self._stream_resource_read(request)
+                            return
+                        
                         # Apply middleware to request (for now, just pass through)
                         # request = apply_middleware(request)
                         
@@ -258,6 +774,8 @@ class SecureMCPServer:
                         
                         # Process request and send response
                         response = self._handle_mcp_request(request)
+                        if 'error' in response:
+                            self._status_label = "rpc_error"
                         
                         # Track response in monitoring
                         # self.server_instance.monitor.track_response(response)
@@ -271,32 +789,29 @@ class SecureMCPServer:
                         self.end_headers()
                         self.wfile.write(json.dumps(response).encode('utf-8'))
                         
-                    except json.JSONDecodeError:
-                        self.send_response(400)
-                        self.send_header('Content-type', 'application/json')
-                        self.end_headers()
-                        error_data = {
-                            "jsonrpc": "2.0",
-                            "error": {
-                                "code": -32700,
-                                "message": "Parse error: Invalid JSON"
-                            },
-                            "id": None
-                        }
-                        self.wfile.write(json.dumps(error_data).encode('utf-8'))
                     except ValueError as e:
+                        # Bodies that fail to parse or validate still cost one unit
+                        if not charged:
+                            allowed, retry_after, layer = self._check_rate_limit()
+                            if not allowed:
+                                self._send_rate_limited(retry_after, layer)
+                                return
+                        
+                        if isinstance(e, json.JSONDecodeError):
+                            error = {"code": -32700, "message": "Parse error: Invalid JSON"}
+                        else:
+                            error = {"code": -32600, "message": f"Invalid request: {str(e)}"}
                         self.send_response(400)
                         self.send_header('Content-type', 'application/json')
                         self.end_headers()
                         error_data = {
                             "jsonrpc": "2.0",
-                            "error": {
-                                "code": -32600,
-                                "message": f"Invalid request: {str(e)}"
-                            },
+                            "error": error,
                             "id": None
                         }
                         self.wfile.write(json.dumps(error_data).encode('utf-8'))
+                elif self.path == '/auth/token':
+                    self._exchange_token()
                 else:
                     # Unknown endpoint
                     self.send_response(404)
@@ -308,11 +823,87 @@ class SecureMCPServer:
                     }
                     self.wfile.write(json.dumps(error_data).encode('utf-8'))
             
-            def _handle_mcp_request(self, request):
-                """Process an MCP request"""
+            def _send_rate_limited(self, retry_after, layer, request_id=None):
+                """Send a JSON-RPC rate limit error with a Retry-After header"""
+                self.send_response(429)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Retry-After', str(retry_after))
+                self.end_headers()
+                error_data = {
+                    "jsonrpc": "2.0",
+                    "error": {
+                        "code": -32000,
+                        "message": "Rate limit exceeded. Please try again later.",
+                        "data": {"layer": layer, "retry_after": retry_after}
+                    },
+                    "id": request_id
+                }
+                self.wfile.write(json.dumps(error_data).encode('utf-8'))
+            
+            def _send_json(self, status, data):
+                """Send a JSON response with CORS headers"""
+                self.send_response(status)
+                self.send_header('Content-type', 'application/json')
+                # Add CORS headers for browser access
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+                self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+                self.end_headers()
+                self.wfile.write(json.dumps(data).encode('utf-8'))
+            
+            def _exchange_token(self):
+                """Issue a short-lived signed access token for an API key"""
+                if not self._authenticate_request():
+                    return
+                
+                # Tokens cannot be renewed with a token, only with the API key
+                if self.is_token:
+                    self._send_json(403, {
+                        "error": "Forbidden",
+                        "message": "Tokens are issued in exchange for an API key, not a token"
+                    })
+                    return
+                
+                allowed, retry_after, layer = self._check_rate_limit()
+                if not allowed:
+                    self._send_json(429, {
+                        "error": "Too many requests",
+                        "message": "Rate limit exceeded. Please try again later.",
+                        "retry_after": retry_after,
+                        "layer": layer
+                    })
+                    return
+                
+                ttl = None
+                content_length = int(self.headers.get('Content-Length') or 0)
+                if content_length:
+                    try:
+                        body = json.loads(self.rfile.read(content_length).decode('utf-8'))
+                        ttl = body.get("ttl") if isinstance(body, dict) else None
+                        if ttl is not None and (not isinstance(ttl, int) or isinstance(ttl, bool) or ttl < 1):
+                            raise ValueError("ttl must be a positive integer")
+                    except ValueError as e:
+                        self._send_json(400, {"error": "Bad Request", "message": str(e)})
+                        return
+                
+                token, expires_at = self.server_instance.tokens.issue(self.key_id, self.policy, ttl)
+                self._send_json(200, {
+                    "access_token": token,
+                    "token_type": "Bearer",
+                    "expires_in": int(expires_at - time.time()),
+                    "expires_at": expires_at
+                })
+            
+            def _handle_mcp_request(self, request, notify=None):
+                """Process an MCP request
+                
+                Args:
+                    request: The parsed JSON-RPC request
+                    notify: Callable used to push notifications on a streaming session
+                """
                 request_id = request.get('id', None)
                 method = request.get('method', '')
-                params = request.get('params', {})
+                params = request.get('params') or {}
                 
                 # Check if method is valid
                 if '/' not in method:
@@ -339,22 +930,37 @@ class SecureMCPServer:
                 
                 # Handle "tools/list" special method
                 if parts[0] == "tools" and parts[1] == "list":
-                    # Get tools with their schemas
-                    tools_list = []
-                    for tool_name, tool_info in self.server_instance.tools.items():
-                        tool_data = {
-                            "name": tool_name,
-                            "description": tool_info.get("description", ""),
-                            "schema": tool_info.get("schema", {})
+                    limit = params.get("limit")
+                    try:
+                        if limit is not None and not isinstance(limit, int):
+                            raise ValueError("limit must be an integer")
+                        registry = self.server_instance.tool_registry
+                        tools_list, next_cursor = registry.list_tools_page(
+                            cursor=params.get("cursor"),
+                            limit=limit,
+                            prefix=params.get("prefix"),
+                            tag=params.get("tag"),
+                            allowed=self.policy.tool_mask(registry)
+                        )
+                    except ValueError as e:
+                        return {
+                            "jsonrpc": "2.0",
+                            "error": {
+                                "code": -32602,
+                                "message": str(e)
+                            },
+                            "id": request_id
                         }
-                        tools_list.append(tool_data)
                     
+                    result = {
+                        "tools": tools_list,
+                        "count": len(tools_list)
+                    }
+                    if next_cursor:
+                        result["nextCursor"] = next_cursor
                     return {
                         "jsonrpc": "2.0",
-                        "result": {
-                            "tools": tools_list,
-                            "count": len(tools_list)
-                        },
+                        "result": result,
                         "id": request_id
                     }
                 
@@ -384,6 +990,15 @@ class SecureMCPServer:
                             "id": request_id
                         }
                     
+                    if not self.policy.allows_tool(self.server_instance.tool_registry, tool_name):
+                        return {
+                            "jsonrpc": "2.0",
+                            "error": AccessDeniedError(
+                                f"Tool {tool_name} is not allowed for this API key"
+                            ).to_dict(),
+                            "id": request_id
+                        }
+                    
                     tool_info = self.server_instance.tools[tool_name]
                     handler = tool_info.get("handler")
                     
@@ -397,23 +1012,102 @@ class SecureMCPServer:
                             "id": request_id
                         }
                     
-                    # Execute tool
+                    meta = params.get("_meta") or {}
+                    if not isinstance(meta, dict):
+                        return {
+                            "jsonrpc": "2.0",
+                            "error": {
+                                "code": -32602,
+                                "message": "Invalid params: _meta must be an object"
+                            },
+                            "id": request_id
+                        }
+                    
+                    # Idempotent retry: run once per key, replay the stored response after that
+                    idempotency_key = meta.get("idempotencyKey") or self.headers.get('Idempotency-Key')
+                    if not idempotency_key:
+                        return self._call_tool(tool_name, tool_args, meta, request_id, notify)
+                    
+                    cache = self.server_instance.idempotency
+                    fingerprint = cache.fingerprint({
+                        "tool": tool_name,
+                        "arguments": tool_args,
+                        "async": bool(meta.get("async"))
+                    })
                     try:
-                        result = handler(tool_args)
+                        response = cache.run(
+                            self.key_id, str(idempotency_key), fingerprint,
+                            lambda: self._call_tool(tool_name, tool_args, meta, request_id, notify),
+                            timeout=self.server_instance.executor.default_max_wait
+                        )
+                    except MCPError as e:
                         return {
                             "jsonrpc": "2.0",
-                            "result": result,
+                            "error": e.to_dict(),
                             "id": request_id
                         }
-                    except Exception as e:
+                    return {**response, "id": request_id}
+                
+                # Handle background job methods
+                if parts[0] == "jobs":
+                    return self._handle_jobs_request(parts[1], params, request_id)
+                
+                # Handle resource listing
+                if parts[0] == "resources" and parts[1] == "list":
+                    limit = params.get("limit")
+                    try:
+                        if limit is not None and not isinstance(limit, int):
+                            raise ValueError("limit must be an integer")
+                        resources, next_cursor = self.server_instance.resources.list_resources(
+                            cursor=params.get("cursor"), limit=limit
+                        )
+                    except ValueError as e:
                         return {
                             "jsonrpc": "2.0",
                             "error": {
-                                "code": -32603,
-                                "message": f"Tool execution error: {str(e)}"
+                                "code": -32602,
+                                "message": str(e)
                             },
                             "id": request_id
                         }
+                    
+                    result = {"resources": resources}
+                    if next_cursor:
+                        result["nextCursor"] = next_cursor
+                    return {
+                        "jsonrpc": "2.0",
+                        "result": result,
+                        "id": request_id
+                    }
+                
+                # Handle resource change subscriptions
+                if parts[0] == "resources" and parts[1] in ("subscribe", "unsubscribe"):
+                    subscriptions = self.server_instance.subscriptions
+                    try:
+                        if parts[1] == "subscribe":
+                            subscriptions.subscribe(self.key_id, params.get("uri"))
+                        else:
+                            subscriptions.unsubscribe(self.key_id, params.get("uri"))
+                    except MCPError as e:
+                        return {
+                            "jsonrpc": "2.0",
+                            "error": e.to_dict(),
+                            "id": request_id
+                        }
+                    except ValueError as e:
+                        return {
+                            "jsonrpc": "2.0",
+                            "error": {
+                                "code": -32602,
+                                "message": str(e)
+                            },
+                            "id": request_id
+                        }
+                    return {
+                        "jsonrpc": "2.0",
+                        "result": {},
+                        "id": request_id
+                    }
                 
                 # Handle other methods
                 tool_name = parts[0]
@@ -429,6 +1123,136 @@ class SecureMCPServer:
                     "id": request_id
                 }
         
+            def _call_tool(self, tool_name, tool_args, meta, request_id, notify=None):
+                """Run a tools/call request, or submit it as a job, and build its response"""
+                # Job mode: run in the background and return a job id at once
+                if meta.get("async"):
+                    try:
+                        job = self.server_instance.jobs.submit(
+                            self.key_id, tool_name, tool_args, meta.get("progressToken")
+                        )
+                    except MCPError as e:
+                        return {
+                            "jsonrpc": "2.0",
+                            "error": e.to_dict(),
+                            "id": request_id
+                        }
+                    return {
+                        "jsonrpc": "2.0",
+                        "result": {
+                            "jobId": job.id,
+                            "status": job.status
+                        },
+                        "id": request_id
+                    }
+                
+                # Client deadline from _meta, falling back to request headers
+                try:
+                    if "deadline" in meta or "timeout" in meta:
+                        deadline = resolve_deadline(meta.get("deadline"), meta.get("timeout"))
+                    else:
+                        deadline = resolve_deadline(self.headers.get('X-Request-Deadline'),
+                                                    self.headers.get('X-Request-Timeout'))
+                except ValueError as e:
+                    return {
+                        "jsonrpc": "2.0",
+                        "error": {
+                            "code": -32602,
+                            "message": str(e)
+                        },
+                        "id": request_id
+                    }
+                
+                context = ToolContext(
+                    request_id=request_id,
+                    progress_token=meta.get("progressToken"),
+                    notify=notify,
+                    call_key=(self.key_id, request_id) if isinstance(request_id, (str, int)) else None,
+                    client_id=self.key_id,
+                    deadline=deadline
+                )
+                
+                # Execute tool
+                try:
+                    result = self.server_instance.executor.execute(tool_name, tool_args, context)
+                    return {
+                        "jsonrpc": "2.0",
+                        "result": result,
+                        "id": request_id
+                    }
+                except MCPError as e:
+                    return {
+                        "jsonrpc": "2.0",
+                        "error": e.to_dict(),
+                        "id": request_id
+                    }
+                except Exception as e:
+                    return {
+                        "jsonrpc": "2.0",
+                        "error": {
+                            "code": -32603,
+                            "message": f"Tool execution error: {str(e)}"
+                        },
+                        "id": request_id
+                    }
+        
+            def _handle_jobs_request(self, action, params, request_id):
+                """Process a jobs/* request for this API key's background jobs"""
+                jobs = self.server_instance.jobs
+                job_id = params.get("jobId")
+                
+                if action not in ("list", "get", "result", "cancel"):
+                    return {
+                        "jsonrpc": "2.0",
+                        "error": {
+                            "code": -32601,
+                            "message": f"Method jobs/{action} not found"
+                        },
+                        "id": request_id
+                    }
+                
+                if action != "list" and not job_id:
+                    return {
+                        "jsonrpc": "2.0",
+                        "error": {
+                            "code": -32602,
+                            "message": "Missing jobId in parameters"
+                        },
+                        "id": request_id
+                    }
+                
+                if action != "list" and not isinstance(job_id, str):
+                    return {
+                        "jsonrpc": "2.0",
+                        "error": {
+                            "code": -32602,
+                            "message": "Invalid params: jobId must be a string"
+                        },
+                        "id": request_id
+                    }
+                
+                try:
+                    if action == "list":
+                        result = {"jobs": [job.to_dict() for job in jobs.store.list_jobs(self.key_id)]}
+                    elif action == "get":
+                        result = jobs.store.get(job_id, self.key_id).to_dict()
+                    elif action == "result":
+                        result = jobs.get_response(job_id, self.key_id)
+                    else:
+                        result = jobs.cancel(job_id, self.key_id).to_dict()
+                except MCPError as e:
+                    return {
+                        "jsonrpc": "2.0",
+                        "error": e.to_dict(),
+                        "id": request_id
+                    }
+                
+                return {
+                    "jsonrpc": "2.0",
+                    "result": result,
+                    "id": request_id
+                }
+        
         return SecureHandler
 
 
@@ -440,6 +1264,14 @@ def main():
     parser.add_argument("--port", type=int, default=8443, help="Port to run the server on")
     parser.add_argument("--host", type=str, default="0.0.0.0", help="Host to bind the server to")
     parser.add_argument("--api-keys", type=str, help="Comma-separated list of API keys")
+    parser.add_argument("--max-concurrent-calls", type=int, default=8,
+                        help="Number of tool calls executed at once across all clients")
+    parser.add_argument("--resource-roots", type=str,
+                        help="Directories exposed as resources, separated by the path separator")
+    parser.add_argument("--key-file", type=str,
+                        help="Key file or SQLite database reloaded on change or SIGHUP")
+    parser.add_argument("--max-file-size-mb", type=float, default=10,
+                        help="Maximum megabytes returned by a single resource read")
     
     args = parser.parse_args()
     
@@ -451,8 +1283,52 @@ def main():
     api_keys_str = os.environ.get("MCP_API_KEYS", args.api_keys)
     api_keys = api_keys_str.split(",") if api_keys_str else []
     
+    # Scheduling weights as comma-separated key:weight pairs
+    tenant_weights = {}
+    for entry in os.environ.get("MCP_TENANT_WEIGHTS", "").split(","):
+        key, _, weight = entry.strip().rpartition(":")
+        if key and weight:
+            tenant_weights[key] = float(weight)
+    max_concurrent_calls = int(os.environ.get("MCP_MAX_CONCURRENT_CALLS", args.max_concurrent_calls))
+    
+    # Resource roots separated by os.pathsep, like PATH
+    resource_roots_str = os.environ.get("MCP_RESOURCE_ROOTS", args.resource_roots)
+    resource_roots = [root for root in resource_roots_str.split(os.pathsep) if root] if resource_roots_str else []
+    max_file_size_mb = float(os.environ.get("MCP_MAX_FILE_SIZE_MB", args.max_file_size_mb))
+    key_file = os.environ.get("MCP_KEY_FILE", args.key_file)
+    
+    # Token signing secrets, comma-separated, shared by every worker
+    token_secrets_str = os.environ.get("MCP_TOKEN_SECRETS", "")
+    token_secrets = [secret for secret in token_secrets_str.split(",") if secret] or None
+    
+    # Brute-force protection
+    ban_threshold = int(os.environ.get("MCP_BAN_THRESHOLD", 10))
+    ban_duration = float(os.environ.get("MCP_BAN_SECONDS", 300))
+    rate_limit_algorithm = os.environ.get("MCP_RATE_LIMIT_ALGORITHM", "sliding_window")
+    # One limit for every worker process on the host, e.g. /dev/shm/mcp-rate-limits
+    rate_limit_file = os.environ.get("MCP_RATE_LIMIT_FILE")
+    global_rate_limit = int(os.environ.get("MCP_GLOBAL_RATE_LIMIT", 0)) or None
+    ip_rate_limit = int(os.environ.get("MCP_IP_RATE_LIMIT", 0)) or None
+    rate_limit_max_delay = float(os.environ.get("MCP_RATE_LIMIT_MAX_DELAY", 0))
+    # Prometheus scrapes /metrics with this bearer token; unset disables it
+    metrics_token = os.environ.get("MCP_METRICS_TOKEN") or None
+    
     # Create and start server
-    server = SecureMCPServer(api_keys=api_keys, port=port, host=host)
+    server = SecureMCPServer(api_keys=api_keys, port=port, host=host,
+                             max_concurrent_calls=max_concurrent_calls,
+                             tenant_weights=tenant_weights,
+                             resource_roots=resource_roots,
+                             max_file_size_mb=max_file_size_mb,
+                             key_file=key_file,
+                             token_secrets=token_secrets,
+                             ban_threshold=ban_threshold,
+                             ban_duration=ban_duration,
+                             rate_limit_algorithm=rate_limit_algorithm,
+                             rate_limit_file=rate_limit_file,
+                             global_rate_limit=global_rate_limit,
+                             ip_rate_limit=ip_rate_limit,
+                             rate_limit_max_delay=rate_limit_max_delay,
+                             metrics_token=metrics_token)
     server.start()
 
 
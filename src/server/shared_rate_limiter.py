@@ -0,0 +1,259 @@
+"""Rate limiting shared by all worker processes on a host through a memory-mapped file."""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+MAGIC = b"MCPRL001"
+# Magic, bucket count, slots per bucket
+_HEADER = struct.Struct("<8sII")
+HEADER_SIZE = 64
+# Client hash (0 marks a free slot) and theoretical arrival time
+_SLOT = struct.Struct("<Qd")
+SLOTS_PER_BUCKET = 8
+BUCKET_SIZE = _SLOT.size * SLOTS_PER_BUCKET
+# Thread locks guarding buckets within this process
+_THREAD_LOCKS = 64
+
+
+def shared_memory_available() -> bool:
+    """Check whether the shared rate limiter can be used on this platform."""
+    return fcntl is not None
+
+
+class SharedRateLimiter:
+    """GCRA rate limiter whose state lives in a memory-mapped file.
+
+    Every worker process that opens the same file enforces one limit per
+    client. The file holds a fixed-size hash table of buckets of
+    ``SLOTS_PER_BUCKET`` slots, each slot storing a 64-bit hash of the
+    client id and its theoretical arrival time (see RateLimiter's
+    ``gcra`` algorithm). A check locks only the bucket of each of its
+    layers, with a byte-range ``fcntl`` lock across processes and a
+    thread lock within one, and touches a single cache line of the table
+    per layer, so memory stays fixed and no external service is involved. When a bucket is full, the client
+    whose state expires first is replaced.
+
+    It has the same ``check_rate_limit`` and ``check_layers`` contracts
+    as RateLimiter.
+    """
+
+    def __init__(self, path: str, limit: int = 100, window: int = 60, buckets: int = 8192):
+        """Open or create the shared table.
+
+        Args:
+            path: File holding the table, shared by all workers (ideally on tmpfs,
+                such as /dev/shm)
+            limit: Maximum number of requests per window
+            window: Time window in seconds
+            buckets: Number of buckets when the file is created
+
+        Raises:
+            RuntimeError: If fcntl locking is not available on this platform
+            ValueError: If the file exists but is not a rate limit table
+        """
+        if fcntl is None:
+            raise RuntimeError("The shared rate limiter requires fcntl (POSIX)")
+        self.path = path
+        self.limit = limit
+        self.window = window
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self.buckets = self._init_file(buckets)
+            self._map = mmap.mmap(self._fd, HEADER_SIZE + self.buckets * BUCKET_SIZE)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._thread_locks = [threading.Lock() for _ in range(_THREAD_LOCKS)]
+        self._stats_lock = threading.Lock()
+        self.checks = 0
+        self.rejected = 0
+        self.evicted = 0
+        self.delayed = 0
+        self.delay_seconds = 0.0
+
+    def _init_file(self, buckets: int) -> int:
+        """Write the header of a new table, or validate an existing one."""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, HEADER_SIZE + buckets * BUCKET_SIZE)
+                os.pwrite(self._fd, _HEADER.pack(MAGIC, buckets, SLOTS_PER_BUCKET), 0)
+                return buckets
+            magic, buckets, slots = _HEADER.unpack(os.pread(self._fd, _HEADER.size, 0))
+            if magic != MAGIC or slots != SLOTS_PER_BUCKET or buckets < 1:
+                raise ValueError(f"{self.path} is not a rate limit table")
+            if os.fstat(self._fd).st_size < HEADER_SIZE + buckets * BUCKET_SIZE:
+                raise ValueError(f"{self.path} is truncated")
+            return buckets
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0)
+
+    @staticmethod
+    def _hash(client_id: str) -> int:
+        """Hash a client id to a nonzero 64-bit integer."""
+        digest = hashlib.blake2b(client_id.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') or 1
+
+    def check_rate_limit(self, client_id: str, limit: Optional[int] = None) -> Tuple[bool, Optional[int], Optional[int]]:
+        """Check if a client has exceeded their rate limit.
+
+        Args:
+            client_id: Identifier for the client (e.g., API key id)
+            limit: Requests allowed per window for this client (defaults to the limiter's limit)
+
+        Returns:
+            Tuple of (allowed, retry_after, remaining)
+            - allowed: True if request is allowed, False otherwise
+            - retry_after: Seconds to wait before retrying (if exceeded)
+            - remaining: Number of requests remaining in the window
+        """
+        allowed, retry_after, remaining, _ = self._check_many([(None, self._hash(client_id), limit)], 1)
+        return allowed, retry_after, remaining
+
+    def check_layers(self, layers: Sequence[Tuple[str, str, Optional[int]]], cost: int = 1,
+                     max_delay: float = 0.0) -> Tuple[bool, Optional[float], Optional[int], Optional[str]]:
+        """Check a request against several layered limits at once.
+
+        Same contract as RateLimiter.check_layers(). The buckets of all
+        layers are locked together, in bucket order, so concurrent
+        workers cannot debit one layer between the check and debit of
+        another.
+
+        Args:
+            layers: (layer name, client id, limit per window) of each limit that applies
+            cost: Units the request uses from every layer
+            max_delay: Longest time in seconds a request may be held instead of rejected
+
+        Returns:
+            Tuple of (allowed, wait, remaining, layer)
+        """
+        return self._check_many([(name, self._hash(f"{name}:{client_id}"), limit)
+                                 for name, client_id, limit in layers], cost, max_delay)
+
+    def _check_many(self, entries: Sequence[Tuple[Optional[str], int, Optional[int]]], cost: int,
+                    max_delay: float = 0.0) -> Tuple[bool, Optional[float], Optional[int], Optional[str]]:
+        """Check and debit (layer, client hash, limit) entries in one pass."""
+        buckets = sorted({client_hash % self.buckets for _, client_hash, _ in entries})
+        thread_locks = [self._thread_locks[i] for i in sorted({b % _THREAD_LOCKS for b in buckets})]
+        for lock in thread_locks:
+            lock.acquire()
+        locked = []
+        try:
+            for bucket in buckets:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, BUCKET_SIZE, HEADER_SIZE + bucket * BUCKET_SIZE)
+                locked.append(bucket)
+            now = time.time()
+            # Written as we go so that layers sharing a bucket see each other,
+            # and restored if any layer rejects the request
+            undo = []
+            evicted = 0
+            delay = 0.0
+            rejected: Optional[Tuple[Optional[str], int]] = None
+            remaining: Optional[int] = None
+            for layer, client_hash, limit in entries:
+                limit = self.limit if limit is None else limit
+                interval = self.window / limit
+                start = HEADER_SIZE + (client_hash % self.buckets) * BUCKET_SIZE
+                offset, previous, evicting = self._find_slot(start, client_hash, now)
+                arrival = max(previous, now) + min(cost, limit) * interval
+                ahead = arrival - now
+                if ahead > self.window + max_delay:
+                    retry_after = max(1, math.ceil(ahead - self.window))
+                    if rejected is None or retry_after > rejected[1]:
+                        rejected = (layer, retry_after)
+                    continue
+                undo.append((offset, self._map[offset:offset + _SLOT.size]))
+                _SLOT.pack_into(self._map, offset, client_hash, arrival)
+                evicted += evicting
+                delay = max(delay, ahead - self.window)
+                left = max(0, int((self.window - ahead) / interval + 1e-9))
+                remaining = left if remaining is None else min(remaining, left)
+            if rejected is not None:
+                for offset, old in reversed(undo):
+                    self._map[offset:offset + _SLOT.size] = old
+        finally:
+            for bucket in reversed(locked):
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, BUCKET_SIZE, HEADER_SIZE + bucket * BUCKET_SIZE)
+            for lock in reversed(thread_locks):
+                lock.release()
+
+        with self._stats_lock:
+            self.checks += 1
+            if rejected is not None:
+                self.rejected += 1
+            else:
+                self.evicted += evicted
+                if delay > 0:
+                    self.delayed += 1
+                    self.delay_seconds += delay
+
+        if rejected is not None:
+            return False, rejected[1], 0, rejected[0]
+        return True, delay if delay > 0 else None, remaining, None
+
+    def _find_slot(self, start: int, client_hash: int, now: float) -> Tuple[int, float, bool]:
+        """Find the client's slot in a bucket, or the slot to give it.
+
+        Returns:
+            Tuple of (slot offset, previous arrival time, whether a live client is replaced)
+        """
+        free_offset = None
+        oldest_offset, oldest_arrival = start, math.inf
+        for offset in range(start, start + BUCKET_SIZE, _SLOT.size):
+            slot_hash, arrival = _SLOT.unpack_from(self._map, offset)
+            if slot_hash == client_hash:
+                return offset, arrival, False
+            if free_offset is None and (slot_hash == 0 or arrival <= now):
+                free_offset = offset
+            elif arrival < oldest_arrival:
+                oldest_offset, oldest_arrival = offset, arrival
+        if free_offset is not None:
+            return free_offset, now, False
+        return oldest_offset, now, True
+
+    def clear_old_entries(self):
+        """Nothing to do: expired slots are reused in place."""
+
+    def close(self):
+        """Unmap and close the table file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            os.close(self._fd)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get shared rate limiter statistics.
+
+        Clients are counted across all processes; the counters are this
+        process's own.
+
+        Returns:
+            Dictionary with the table capacity, live clients and check counters
+        """
+        now = time.time()
+        table = self._map[HEADER_SIZE:HEADER_SIZE + self.buckets * BUCKET_SIZE]
+        clients = sum(1 for slot_hash, arrival in _SLOT.iter_unpack(table)
+                      if slot_hash and arrival > now)
+        with self._stats_lock:
+            return {
+                "algorithm": "gcra",
+                "shared": self.path,
+                "capacity": self.buckets * SLOTS_PER_BUCKET,
+                "clients": clients,
+                "checks": self.checks,
+                "rejected": self.rejected,
+                "evicted": self.evicted,
+                "delayed": self.delayed,
+                "delay_seconds": round(self.delay_seconds, 3)
+            }
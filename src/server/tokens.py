@@ -0,0 +1,227 @@
+"""Stateless HMAC-signed access tokens issued in exchange for API keys."""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from .policy import KeyPolicy
+
+TOKEN_PREFIX = "mcp1."
+
+
+class TokenIdentity:
+    """Identity and policy carried by a verified token."""
+
+    __slots__ = ('key_id', 'policy', 'expires_at')
+
+    def __init__(self, key_id: str, policy: KeyPolicy, expires_at: float):
+        self.key_id = key_id
+        self.policy = policy
+        self.expires_at = expires_at
+
+
+class TokenSigner:
+    """Issues and verifies short-lived signed tokens.
+
+    A token carries the key id, tier, rate limit, allowlists and expiry of
+    the API key it was issued for, signed with HMAC-SHA256. Any worker
+    holding the signing secret can verify it without the key list, so
+    keys only need to be known where tokens are issued. Verification
+    compares signatures in constant time, and recently verified tokens
+    are cached so repeat requests skip the HMAC and JSON decoding.
+
+    Several secrets can be configured for rotation: tokens are signed
+    with the first and accepted with any of them. Each secret is
+    identified in the token by a short fingerprint.
+    """
+
+    def __init__(self, secrets_: Optional[Sequence[str]] = None, default_ttl: int = 900,
+                 max_ttl: int = 3600, cache_size: int = 10000):
+        """Initialize the signer.
+
+        Args:
+            secrets_: Signing secrets, the first one used for new tokens
+                (a random secret, valid for this process only, by default)
+            default_ttl: Token lifetime in seconds when none is requested
+            max_ttl: Longest lifetime a client may request
+            cache_size: Number of verified tokens remembered
+        """
+        secret_list = [s for s in (secrets_ or []) if s] or [secrets.token_urlsafe(32)]
+        self._secrets: Dict[str, bytes] = {}
+        for secret in secret_list:
+            secret_bytes = secret.encode('utf-8')
+            self._secrets.setdefault(_secret_id(secret_bytes), secret_bytes)
+        self._active_id = _secret_id(secret_list[0].encode('utf-8'))
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, TokenIdentity]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.issued = 0
+        self.verified = 0
+        self.cache_hits = 0
+        self.rejected = 0
+
+    @staticmethod
+    def is_token(credential: str) -> bool:
+        """Check whether a bearer credential is a token rather than an API key.
+
+        Args:
+            credential: The bearer credential
+
+        Returns:
+            True if it has the token format prefix
+        """
+        return credential.startswith(TOKEN_PREFIX)
+
+    def issue(self, key_id: str, policy: KeyPolicy, ttl: Optional[int] = None) -> Tuple[str, float]:
+        """Issue a token for an authenticated API key.
+
+        Args:
+            key_id: Identifier of the API key
+            policy: The key's policy, copied into the token
+            ttl: Requested lifetime in seconds, capped at max_ttl
+
+        Returns:
+            Tuple of the token and its expiry as a Unix timestamp
+        """
+        ttl = self.default_ttl if ttl is None else max(1, min(int(ttl), self.max_ttl))
+        now = int(time.time())
+        claims = {
+            "kid": key_id,
+            "sid": self._active_id,
+            "iat": now,
+            "exp": now + ttl,
+            **policy.to_dict()
+        }
+        payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode('utf-8'))
+        token = f"{TOKEN_PREFIX}{payload}.{_b64encode(self._sign(self._secrets[self._active_id], payload))}"
+        with self._lock:
+            self.issued += 1
+        return token, float(claims["exp"])
+
+    def verify(self, token: str) -> Optional[TokenIdentity]:
+        """Verify a token.
+
+        Args:
+            token: The token presented by the client
+
+        Returns:
+            The token's identity, or None if it is malformed, forged or expired
+        """
+        now = time.time()
+        with self._lock:
+            identity = self._cache.get(token)
+            if identity is not None:
+                if identity.expires_at > now:
+                    self._cache.move_to_end(token)
+                    self.cache_hits += 1
+                    return identity
+                del self._cache[token]
+
+        identity = self._verify_signed(token, now)
+        with self._lock:
+            if identity is None:
+                self.rejected += 1
+                return None
+            self.verified += 1
+            self._cache[token] = identity
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return identity
+
+    def is_expired(self, token: str) -> bool:
+        """Check whether a token that failed verification was genuine but expired.
+
+        Args:
+            token: The token presented by the client
+
+        Returns:
+            True if the token is correctly signed and past its expiry
+        """
+        claims = self._signed_claims(token)
+        if claims is None:
+            return False
+        return claims["exp"] <= time.time()
+
+    def _signed_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        """Check a token's signature and decode its claims."""
+        if not token.startswith(TOKEN_PREFIX):
+            return None
+        payload, _, signature = token[len(TOKEN_PREFIX):].partition(".")
+        try:
+            claims = json.loads(_b64decode(payload))
+            provided = _b64decode(signature)
+        except (binascii.Error, UnicodeError, ValueError):
+            return None
+        # Claims are checked before they are used to look anything up
+        if not isinstance(claims, dict) or not isinstance(claims.get("sid"), str):
+            return None
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or isinstance(expires_at, bool):
+            return None
+
+        secret = self._secrets.get(claims["sid"])
+        # Use constant time comparison to prevent timing attacks
+        if secret is None or not hmac.compare_digest(self._sign(secret, payload), provided):
+            return None
+        return claims
+
+    def _verify_signed(self, token: str, now: float) -> Optional[TokenIdentity]:
+        """Check a token's signature and expiry and decode its claims."""
+        claims = self._signed_claims(token)
+        if claims is None:
+            return None
+
+        expires_at = claims["exp"]
+        if expires_at <= now:
+            return None
+        try:
+            policy = KeyPolicy(claims.get("tier") or "default", claims.get("requests_per_minute"),
+                               claims.get("tools"), claims.get("methods"))
+        except TypeError:
+            return None
+        return TokenIdentity(str(claims.get("kid")), policy, float(expires_at))
+
+    @staticmethod
+    def _sign(secret: bytes, payload: str) -> bytes:
+        """Compute the HMAC-SHA256 signature of a token payload."""
+        return hmac.new(secret, (TOKEN_PREFIX + payload).encode('ascii'), hashlib.sha256).digest()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get token statistics.
+
+        Returns:
+            Dictionary with issue, verification and cache counters
+        """
+        with self._lock:
+            return {
+                "issued": self.issued,
+                "verified": self.verified,
+                "cache_hits": self.cache_hits,
+                "rejected": self.rejected,
+                "cached": len(self._cache),
+                "signing_secrets": len(self._secrets)
+            }
+
+
+def _secret_id(secret: bytes) -> str:
+    """Derive a short, non-secret identifier for a signing secret."""
+    return hashlib.sha256(b"mcp-token-secret:" + secret).hexdigest()[:8]
+
+
+def _b64encode(data: bytes) -> str:
+    """Encode bytes as unpadded base64url."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode('ascii')
+
+
+def _b64decode(data: str) -> bytes:
+    """Decode unpadded base64url, rejecting invalid characters."""
+    return base64.b64decode(data + "=" * (-len(data) % 4), altchars=b'-_', validate=True)
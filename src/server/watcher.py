@@ -0,0 +1,460 @@
+"""Resource change detection and subscriptions."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from .notifications import NotificationHub
+
+# inotify event masks, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+_DIR_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+             | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal ctypes binding to the Linux inotify API."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """Watch a path, returning its watch descriptor."""
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def rm_watch(self, wd: int):
+        """Stop watching a watch descriptor."""
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self):
+        """Yield (wd, mask, name) for every queued event."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            yield wd, mask, os.fsdecode(name)
+
+    def close(self):
+        """Close the inotify descriptor."""
+        os.close(self.fd)
+
+
+def inotify_available() -> bool:
+    """Check whether inotify can be used on this platform."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        _Inotify().close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+class ResourceWatcher:
+    """Watches files for changes and reports each change once it settles.
+
+    On Linux the parent directory of every watched file is watched with
+    inotify, which also catches files replaced by rename. Elsewhere, or
+    when a directory cannot be watched, files are polled together every
+    ``poll_interval`` seconds by comparing their modification time, size
+    and inode. Each path is watched once no matter how many times
+    ``watch()`` is called for it. Bursts of changes are debounced: the
+    callback runs ``debounce`` seconds after the last change, and at most
+    ``max_delay`` seconds after the first.
+    """
+
+    def __init__(self, on_change: Callable[[str], None], debounce: float = 0.2,
+                 max_delay: float = 2.0, poll_interval: float = 1.0,
+                 use_inotify: Optional[bool] = None):
+        """Initialize the watcher.
+
+        Args:
+            on_change: Called with the path of every changed file
+            debounce: Quiet period in seconds before a change is reported
+            max_delay: Maximum seconds a change is held back during continuous writes
+            poll_interval: Seconds between polls of files not watched by inotify
+            use_inotify: Whether to use inotify (None uses it when available)
+        """
+        self.on_change = on_change
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.use_inotify = inotify_available() if use_inotify is None else use_inotify
+
+        self._lock = threading.Lock()
+        self._refs: Dict[str, int] = {}
+        self._polled: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self._dir_wds: Dict[str, int] = {}
+        self._wd_dirs: Dict[int, str] = {}
+        self._dir_files: Dict[str, Set[str]] = {}
+        self._pending: Dict[str, Tuple[float, float]] = {}
+        self._inotify: Optional[_Inotify] = None
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self.events = 0
+        self.reported = 0
+
+    def watch(self, path: str):
+        """Start watching a file.
+
+        Args:
+            path: Path of the file
+        """
+        with self._lock:
+            self._refs[path] = self._refs.get(path, 0) + 1
+            if self._refs[path] == 1:
+                self._start()
+                self._add(path)
+
+    def unwatch(self, path: str):
+        """Stop watching a file once every watch() call is matched.
+
+        Args:
+            path: Path of the file
+        """
+        with self._lock:
+            count = self._refs.get(path, 0) - 1
+            if count > 0:
+                self._refs[path] = count
+                return
+            if self._refs.pop(path, None) is not None:
+                self._remove(path)
+                self._pending.pop(path, None)
+
+    def close(self):
+        """Stop the watcher thread and release inotify resources."""
+        self._stopped.set()
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            for fd in (self._wake_r, self._wake_w):
+                if fd is not None:
+                    os.close(fd)
+            self._wake_r = self._wake_w = None
+
+    def _start(self):
+        """Start the watcher thread on first use. Caller must hold the lock."""
+        if self._thread is not None:
+            return
+        if self.use_inotify:
+            try:
+                self._inotify = _Inotify()
+                self._wake_r, self._wake_w = os.pipe()
+            except (OSError, AttributeError):
+                self.use_inotify = False
+        self._thread = threading.Thread(target=self._run, name="mcp-resource-watcher", daemon=True)
+        self._thread.start()
+
+    def _wake(self):
+        """Interrupt the watcher thread's wait."""
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass
+
+    def _add(self, path: str):
+        """Register a path with inotify, or with the poller. Caller must hold the lock."""
+        directory, name = os.path.split(path)
+        if self._inotify is not None:
+            wd = self._dir_wds.get(directory)
+            if wd is None:
+                try:
+                    wd = self._inotify.add_watch(directory, _DIR_MASK)
+                except OSError:
+                    wd = None
+                if wd is not None:
+                    self._dir_wds[directory] = wd
+                    self._wd_dirs[wd] = directory
+            if wd is not None:
+                self._dir_files.setdefault(directory, set()).add(name)
+                return
+        self._polled[path] = _signature(path)
+
+    def _remove(self, path: str):
+        """Unregister a path. Caller must hold the lock."""
+        if self._polled.pop(path, False) is not False:
+            return
+        directory, name = os.path.split(path)
+        names = self._dir_files.get(directory)
+        if names is None:
+            return
+        names.discard(name)
+        if not names:
+            del self._dir_files[directory]
+            wd = self._dir_wds.pop(directory, None)
+            if wd is not None:
+                self._wd_dirs.pop(wd, None)
+                if self._inotify is not None:
+                    self._inotify.rm_watch(wd)
+
+    def _mark(self, path: str, now: float):
+        """Record a change to be reported after the debounce. Caller must hold the lock."""
+        self.events += 1
+        first, _ = self._pending.get(path, (now, now))
+        self._pending[path] = (first, min(now + self.debounce, first + self.max_delay))
+
+    def _run(self):
+        """Wait for inotify events and poll deadlines, then report settled changes."""
+        next_poll = time.monotonic() + self.poll_interval
+        while not self._stopped.is_set():
+            with self._lock:
+                due = [when for _, when in self._pending.values()]
+                if self._polled:
+                    due.append(next_poll)
+                inotify = self._inotify
+            timeout = max(0.0, min(due) - time.monotonic()) if due else self.poll_interval
+
+            if inotify is not None:
+                try:
+                    ready, _, _ = select.select([inotify.fd, self._wake_r], [], [], timeout)
+                except (OSError, ValueError, TypeError):
+                    # Descriptors were closed by close()
+                    break
+                if self._wake_r in ready:
+                    os.read(self._wake_r, 64)
+                if inotify.fd in ready:
+                    self._handle_events(inotify)
+            else:
+                self._stopped.wait(timeout)
+
+            now = time.monotonic()
+            if now >= next_poll:
+                self._poll(now)
+                next_poll = now + self.poll_interval
+            self._report(now)
+
+    def _handle_events(self, inotify: _Inotify):
+        """Turn queued inotify events into pending changes."""
+        now = time.monotonic()
+        with self._lock:
+            for wd, mask, name in inotify.read_events():
+                if mask & IN_Q_OVERFLOW:
+                    # Events were lost, so assume every watched file changed
+                    for path in self._refs:
+                        self._mark(path, now)
+                    continue
+                directory = self._wd_dirs.get(wd)
+                if directory is None:
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    # The directory itself went away: fall back to polling its files
+                    self._wd_dirs.pop(wd, None)
+                    self._dir_wds.pop(directory, None)
+                    for file_name in self._dir_files.pop(directory, ()):
+                        path = os.path.join(directory, file_name)
+                        self._polled[path] = _signature(path)
+                        self._mark(path, now)
+                    continue
+                if name in self._dir_files.get(directory, ()):
+                    self._mark(os.path.join(directory, name), now)
+
+    def _poll(self, now: float):
+        """Compare the signature of every polled file with the last one seen."""
+        with self._lock:
+            paths = list(self._polled)
+        signatures = {path: _signature(path) for path in paths}
+        with self._lock:
+            for path, signature in signatures.items():
+                if path in self._polled and self._polled[path] != signature:
+                    self._polled[path] = signature
+                    self._mark(path, now)
+
+    def _report(self, now: float):
+        """Run the callback for every change whose debounce has passed."""
+        with self._lock:
+            settled = [path for path, (_, when) in self._pending.items() if when <= now]
+            for path in settled:
+                del self._pending[path]
+            self.reported += len(settled)
+        for path in settled:
+            try:
+                self.on_change(path)
+            except Exception:
+                # A failing callback must not stop the watcher
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get watcher statistics.
+
+        Returns:
+            Dictionary with the backend in use, watch counts and change counters
+        """
+        with self._lock:
+            return {
+                "backend": "inotify" if self._inotify is not None else "polling",
+                "watched_paths": len(self._refs),
+                "inotify_directories": len(self._dir_wds),
+                "polled_paths": len(self._polled),
+                "pending": len(self._pending),
+                "events": self.events,
+                "reported": self.reported
+            }
+
+
+def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """Get the modification time, size and inode of a file, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class ResourceSubscriptions:
+    """Tracks resources/subscribe subscriptions and pushes update notifications.
+
+    Subscribers of the same file share a single watch, added and removed
+    under the subscription lock so it always matches whether the file has
+    subscribers. When the file changes, every subscribed client gets a
+    ``notifications/resources/updated`` notification on its open streams.
+    """
+
+    def __init__(self, resources, hub: NotificationHub, max_per_client: int = 1000,
+                 debounce: float = 0.2, poll_interval: float = 1.0,
+                 use_inotify: Optional[bool] = None):
+        """Initialize the subscription registry.
+
+        Args:
+            resources: ResourceManager used to resolve resource URIs
+            hub: NotificationHub used to deliver notifications
+            max_per_client: Maximum subscriptions held by one client
+            debounce: Quiet period in seconds before a change is reported
+            poll_interval: Seconds between polls when inotify is not used
+            use_inotify: Whether to use inotify (None uses it when available)
+        """
+        self.resources = resources
+        self.hub = hub
+        self.watcher = ResourceWatcher(self._on_change, debounce=debounce,
+                                       poll_interval=poll_interval, use_inotify=use_inotify)
+        self.max_per_client = max_per_client
+        self._subscribers: Dict[str, Set[Hashable]] = {}
+        self._per_client: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.notified = 0
+
+    def subscribe(self, owner: Hashable, uri: Any):
+        """Subscribe a client to changes of a resource.
+
+        Args:
+            owner: Identity of the client
+            uri: The resource URI
+
+        Raises:
+            ResourceNotFoundError: If the resource does not exist
+            ValueError: If the client holds too many subscriptions
+        """
+        path = self.resources.resolve(uri)
+        with self._lock:
+            subscribers = self._subscribers.setdefault(path, set())
+            if owner in subscribers:
+                return
+            if self._per_client.get(owner, 0) >= self.max_per_client:
+                if not subscribers:
+                    del self._subscribers[path]
+                raise ValueError(f"Too many subscriptions, at most {self.max_per_client} per client")
+            subscribers.add(owner)
+            self._per_client[owner] = self._per_client.get(owner, 0) + 1
+            # Under the lock, so a racing unsubscribe cannot unwatch first
+            if len(subscribers) == 1:
+                self.watcher.watch(path)
+
+    def unsubscribe(self, owner: Hashable, uri: Any):
+        """Cancel a client's subscription to a resource.
+
+        Args:
+            owner: Identity of the client
+            uri: The resource URI
+
+        Raises:
+            ResourceNotFoundError: If the resource does not exist
+        """
+        path = self.resources.resolve(uri)
+        with self._lock:
+            subscribers = self._subscribers.get(path)
+            if not subscribers or owner not in subscribers:
+                return
+            subscribers.discard(owner)
+            self._per_client[owner] -= 1
+            if not self._per_client[owner]:
+                del self._per_client[owner]
+            if not subscribers:
+                del self._subscribers[path]
+                self.watcher.unwatch(path)
+
+    def _on_change(self, path: str):
+        """Notify every subscriber of a changed file."""
+        with self._lock:
+            owners = list(self._subscribers.get(path, ()))
+        if not owners:
+            return
+        message = {
+            "jsonrpc": "2.0",
+            "method": "notifications/resources/updated",
+            "params": {"uri": Path(path).as_uri()}
+        }
+        for owner in owners:
+            self.hub.publish(owner, message)
+        with self._lock:
+            self.notified += len(owners)
+
+    def close(self):
+        """Stop watching for changes."""
+        self.watcher.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscription statistics.
+
+        Returns:
+            Dictionary with subscription counts and the watcher's statistics
+        """
+        with self._lock:
+            stats = {
+                "subscribed_resources": len(self._subscribers),
+                "subscriptions": sum(self._per_client.values()),
+                "notified": self.notified
+            }
+        stats["watcher"] = self.watcher.get_stats()
+        return stats
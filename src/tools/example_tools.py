@@ -17,6 +17,15 @@ class SystemInfoTool:
         self.name = "system_info"
         self.description = "Get system information including OS, CPU, memory, and disk usage"
         self.version = "1.0.0"
+        # Detailed calls sample CPU for a full second, so keep them from
+        # taking every worker away from cheap tools like echo
+        self.max_concurrency = 2
+        self.max_queue = 4
+        self.tags = ["system"]
+    
+    def rate_cost(self, parameters: Dict[str, Any]) -> int:
+        """Rate limit units of a call: detailed calls hold a worker for a second."""
+        return 20 if parameters.get("detail_level") == "detailed" else 1
     
     def get_schema(self) -> Dict[str, Any]:
         """Get the tool schema for MCP protocol."""
@@ -40,8 +49,13 @@ class SystemInfoTool:
             }
         }
     
-    def execute(self, parameters: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute the system info tool."""
+    def execute(self, parameters: Dict[str, Any] = None, context=None) -> Dict[str, Any]:
+        """Execute the system info tool.
+        
+        Args:
+            parameters: Tool parameters
+            context: Optional ToolContext for progress reporting and cancellation
+        """
         if parameters is None:
             parameters = {}
         
@@ -63,7 +77,20 @@ class SystemInfoTool:
             if detail_level == "detailed":
                 # Detailed system info
                 memory = psutil.virtual_memory()
-                cpu_percent = psutil.cpu_percent(interval=1)
+                
+                # Sample CPU usage over one second, waking early if cancelled
+                psutil.cpu_percent(interval=None)
+                if context is not None:
+                    context.report_progress(0, 1, "Sampling CPU usage")
+                    if context.wait(1):
+                        return {
+                            "success": False,
+                            "error": "Cancelled",
+                            "detail_level": detail_level
+                        }
+                else:
+                    time.sleep(1)
+                cpu_percent = psutil.cpu_percent(interval=None)
                 disk_path = '/' if platform.system() != "Windows" else 'C:'
                 disk = psutil.disk_usage(disk_path)
                 
@@ -104,6 +131,9 @@ class EchoTool:
         self.name = "echo"
         self.description = "Echo back the input message"
         self.version = "1.0.0"
+        # Echo has no dependencies that could fail
+        self.circuit_breaker = False
+        self.tags = ["utility"]
     
     def get_schema(self) -> Dict[str, Any]:
         """Get the tool schema for MCP protocol."""
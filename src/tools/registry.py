@@ -1,20 +1,66 @@
 
 """Tool registry for MCP server."""
 
-from typing import Dict, List, Any, Callable, Optional
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from fnmatch import fnmatchcase
+import base64
+import binascii
 import importlib
 import os
 import sys
 import json
 import inspect
+import threading
+
+# Sorts after any character that can follow a name prefix
+_PREFIX_END = '\U0010ffff'
+
+
+class _ToolIndex:
+    """Sorted, immutable snapshot of the registry used to serve list pages."""
+
+    __slots__ = ('version', 'names', 'descriptors', 'tags')
+
+    def __init__(self, version: int, tools: Dict[str, Dict[str, Any]]):
+        """Build the index.
+        
+        Args:
+            version: Registry version the index was built from
+            tools: Tool definitions keyed by name
+        """
+        self.version = version
+        self.names = sorted(tools)
+        self.descriptors = {
+            name: {
+                'name': name,
+                'description': tools[name].get('description', ''),
+                'schema': tools[name].get('schema', {})
+            }
+            for name in self.names
+        }
+        tags: Dict[str, List[str]] = {}
+        for name in self.names:
+            for tag in tools[name].get('tags') or ():
+                tags.setdefault(tag, []).append(name)
+        self.tags = tags
 
 
 class ToolRegistry:
     """Registry for MCP tools."""
 
-    def __init__(self):
-        """Initialize the tool registry and load available tools."""
+    def __init__(self, page_size: int = 100):
+        """Initialize the tool registry and load available tools.
+        
+        Args:
+            page_size: Maximum number of tools returned per list page
+        """
         self.tools: Dict[str, Dict[str, Any]] = {}
+        self.page_size = page_size
+        self._version = 0
+        self._tool_ids: Dict[str, int] = {}
+        self._index: Optional[_ToolIndex] = None
+        self._index_lock = threading.Lock()
         self._load_default_tools()
     
     def _load_default_tools(self):
@@ -50,10 +96,22 @@ class ToolRegistry:
             'handler': tool_instance.execute,
             'description': tool_instance.description,
             'schema': schema,
-            'instance': tool_instance
+            'instance': tool_instance,
+            'max_concurrency': getattr(tool_instance, 'max_concurrency', None),
+            'max_queue': getattr(tool_instance, 'max_queue', 0),
+            'circuit_breaker': getattr(tool_instance, 'circuit_breaker', None),
+            'rate_cost': getattr(tool_instance, 'rate_cost', 1),
+            'rate_limit': getattr(tool_instance, 'rate_limit', None),
+            'accepts_context': _accepts_context(tool_instance.execute),
+            'is_async': inspect.iscoroutinefunction(tool_instance.execute),
+            'tags': list(getattr(tool_instance, 'tags', []))
         }
+        self._assign_id(tool_name)
     
-    def register_tool(self, name: str, handler: Callable, description: str, schema: Dict[str, Any]):
+    def register_tool(self, name: str, handler: Callable, description: str, schema: Dict[str, Any],
+                      max_concurrency: Optional[int] = None, max_queue: int = 0,
+                      circuit_breaker: Any = None, tags: Optional[List[str]] = None,
+                      rate_cost: Any = 1, rate_limit: Optional[int] = None):
         """Register a new tool.
         
         Args:
@@ -61,13 +119,69 @@ class ToolRegistry:
             handler: The function that implements the tool
             description: A description of the tool
             schema: The JSON schema for the tool's parameters
+            max_concurrency: Maximum concurrent executions (None for unlimited)
+            max_queue: Maximum calls waiting for a slot once max_concurrency is reached
+            circuit_breaker: Circuit breaker options, or False to disable the breaker
+            tags: Tags used to filter tool listings
+            rate_cost: Rate limit units used by a call, or a function of the call's
+                arguments returning them
+            rate_limit: Units per minute of this tool across all clients (None for unlimited)
         """
         self.tools[name] = {
             'name': name,
             'handler': handler,
             'description': description,
-            'schema': schema
+            'schema': schema,
+            'max_concurrency': max_concurrency,
+            'max_queue': max_queue,
+            'circuit_breaker': circuit_breaker,
+            'rate_cost': rate_cost,
+            'rate_limit': rate_limit,
+            'accepts_context': _accepts_context(handler),
+            'is_async': inspect.iscoroutinefunction(handler),
+            'tags': list(tags or [])
         }
+        self._assign_id(name)
+    
+    def _assign_id(self, name: str):
+        """Give a newly registered tool a stable id and mark the registry changed."""
+        if name not in self._tool_ids:
+            self._tool_ids[name] = len(self._tool_ids)
+        self._version += 1
+    
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever a tool is registered."""
+        return self._version
+    
+    def tool_id(self, name: str) -> Optional[int]:
+        """Get the stable numeric id of a tool.
+        
+        Ids are assigned in registration order and never reused, so they
+        can index bitsets of tools.
+        
+        Args:
+            name: The name of the tool
+        
+        Returns:
+            The tool id, or None if the tool is not registered
+        """
+        return self._tool_ids.get(name) if name in self.tools else None
+    
+    def tool_mask(self, patterns) -> int:
+        """Build a bitset of the ids of tools matching any glob pattern.
+        
+        Args:
+            patterns: Glob patterns over tool names, such as ``billing_*``
+        
+        Returns:
+            Bitset with bit ``tool_id`` set for every matching tool
+        """
+        mask = 0
+        for name in list(self.tools):
+            if any(fnmatchcase(name, pattern) for pattern in patterns):
+                mask |= 1 << self._tool_ids[name]
+        return mask
     
     def get_tool(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a tool by name.
@@ -80,6 +194,22 @@ class ToolRegistry:
         """
         return self.tools.get(name)
     
+    def call_cost(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> int:
+        """Get the rate limit units used by a call to a tool.
+        
+        Args:
+            name: The name of the tool
+            arguments: The call's arguments
+        
+        Returns:
+            The tool's declared cost for these arguments (1 for unknown tools)
+        """
+        tool_info = self.tools.get(name)
+        cost = tool_info.get('rate_cost', 1) if tool_info else 1
+        if callable(cost):
+            cost = cost(arguments if isinstance(arguments, dict) else {})
+        return max(0, int(cost))
+    
     def list_tools(self) -> List[Dict[str, Any]]:
         """List all available tools.
         
@@ -95,6 +225,80 @@ class ToolRegistry:
             for tool in self.tools.values()
         ]
     
+    def _get_index(self) -> _ToolIndex:
+        """Get the list index, rebuilding it if tools changed since it was built.
+        
+        Returns:
+            The current tool index
+        """
+        index = self._index
+        if index is not None and index.version == self._version and len(index.names) == len(self.tools):
+            return index
+        
+        with self._index_lock:
+            index = self._index
+            if index is None or index.version != self._version or len(index.names) != len(self.tools):
+                index = _ToolIndex(self._version, dict(self.tools))
+                self._index = index
+        return index
+    
+    def list_tools_page(self, cursor: Optional[str] = None, limit: Optional[int] = None,
+                        prefix: Optional[str] = None, tag: Optional[str] = None,
+                        allowed: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List one page of tools in stable name order.
+        
+        Cursors encode the last tool name of the previous page and are
+        resolved by binary search over the precomputed index, so they stay
+        valid when tools are added or removed between pages.
+        
+        Args:
+            cursor: Opaque cursor from a previous page, or None for the first page
+            limit: Maximum tools to return, capped at page_size
+            prefix: Only list tools whose name starts with this prefix
+            tag: Only list tools with this tag
+            allowed: Bitset of tool ids to list (see tool_mask()), or None for all tools
+        
+        Returns:
+            Tuple of (tools, next_cursor); next_cursor is None on the last page
+        
+        Raises:
+            ValueError: If the cursor is malformed, or the cursor, prefix or tag is not a string
+        """
+        for param, value in (("cursor", cursor), ("prefix", prefix), ("tag", tag)):
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{param} must be a string")
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int)):
+            raise ValueError("limit must be an integer")
+        index = self._get_index()
+        names = index.tags.get(tag, []) if tag else index.names
+        page_size = min(limit, self.page_size) if limit and limit > 0 else self.page_size
+        
+        start, end = 0, len(names)
+        if prefix:
+            start = bisect_left(names, prefix)
+            end = bisect_left(names, prefix + _PREFIX_END)
+        if cursor:
+            start = max(start, bisect_right(names, _decode_cursor(cursor)))
+        
+        if allowed is None:
+            stop = min(end, start + page_size)
+            page = [index.descriptors[name] for name in names[start:stop]]
+            next_cursor = _encode_cursor(names[stop - 1]) if page and stop < end else None
+            return page, next_cursor
+        
+        # Skip tools outside the allowed bitset, looking one tool past the page
+        # to know whether another page follows
+        page = []
+        tool_ids = self._tool_ids
+        for position in range(start, end):
+            name = names[position]
+            if not allowed >> tool_ids[name] & 1:
+                continue
+            if len(page) == page_size:
+                return page, _encode_cursor(page[-1]['name'])
+            page.append(index.descriptors[name])
+        return page, None
+    
     def load_from_directory(self, directory: str) -> int:
         """Load tools from a directory.
         
@@ -130,7 +334,13 @@ class ToolRegistry:
                                         name=obj._mcp_tool_name,
                                         handler=obj,
                                         description=obj._mcp_tool_description,
-                                        schema=obj._mcp_tool_schema
+                                        schema=obj._mcp_tool_schema,
+                                        max_concurrency=obj._mcp_tool_max_concurrency,
+                                        max_queue=obj._mcp_tool_max_queue,
+                                        circuit_breaker=obj._mcp_tool_circuit_breaker,
+                                        tags=obj._mcp_tool_tags,
+                                        rate_cost=obj._mcp_tool_rate_cost,
+                                        rate_limit=obj._mcp_tool_rate_limit
                                     )
                                     count += 1
                         except Exception as e:
@@ -142,13 +352,55 @@ class ToolRegistry:
         return count
 
 
-def tool(name: str, description: str, schema: Dict[str, Any]):
+def _encode_cursor(name: str) -> str:
+    """Encode a tool name as an opaque list cursor."""
+    return base64.urlsafe_b64encode(name.encode('utf-8')).decode('ascii')
+
+
+def _decode_cursor(cursor: str) -> str:
+    """Decode a list cursor back into a tool name.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        return base64.b64decode(cursor.encode('ascii'), altchars=b'-_', validate=True).decode('utf-8')
+    except (binascii.Error, UnicodeError, AttributeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def _accepts_context(handler: Callable) -> bool:
+    """Check whether a tool handler takes a ``context`` argument.
+    
+    Args:
+        handler: The tool handler
+    
+    Returns:
+        True if the handler should be passed a ToolContext
+    """
+    try:
+        return 'context' in inspect.signature(handler).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def tool(name: str, description: str, schema: Dict[str, Any],
+         max_concurrency: Optional[int] = None, max_queue: int = 0,
+         circuit_breaker: Any = None, tags: Optional[List[str]] = None,
+         rate_cost: Any = 1, rate_limit: Optional[int] = None):
     """Decorator to mark a function as an MCP tool.
     
     Args:
         name: The name of the tool
         description: A description of the tool
         schema: The JSON schema for the tool's parameters
+        max_concurrency: Maximum concurrent executions (None for unlimited)
+        max_queue: Maximum calls waiting for a slot once max_concurrency is reached
+        circuit_breaker: Circuit breaker options, or False to disable the breaker
+        tags: Tags used to filter tool listings
+        rate_cost: Rate limit units used by a call, or a function of the call's
+            arguments returning them
+        rate_limit: Units per minute of this tool across all clients (None for unlimited)
     
     Returns:
         Decorator function
@@ -158,5 +410,11 @@ def tool(name: str, description: str, schema: Dict[str, Any]):
         func._mcp_tool_name = name
         func._mcp_tool_description = description
         func._mcp_tool_schema = schema
+        func._mcp_tool_max_concurrency = max_concurrency
+        func._mcp_tool_max_queue = max_queue
+        func._mcp_tool_circuit_breaker = circuit_breaker
+        func._mcp_tool_tags = tags
+        func._mcp_tool_rate_cost = rate_cost
+        func._mcp_tool_rate_limit = rate_limit
         return func
     return decorator
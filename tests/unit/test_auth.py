@@ -44,3 +44,22 @@ def test_empty_api_keys():
     """Test authentication with no API keys."""
     auth = Authentication([])
     assert auth.verify_key("any-key") is False
+
+
+def test_add_key():
+    """Test that keys added after construction are accepted."""
+    auth = Authentication([])
+    auth.add_key("late-key")
+    
+    assert auth.verify_key("late-key") is True
+    assert auth.verify_key("late-key-2") is False
+
+
+def test_verify_key_many_keys():
+    """Test verification against a large key set."""
+    keys = [f"key-{i}" for i in range(10000)]
+    auth = Authentication(keys)
+    
+    assert auth.verify_key("key-0") is True
+    assert auth.verify_key("key-9999") is True
+    assert auth.verify_key("key-10000") is False
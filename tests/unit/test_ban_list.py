@@ -0,0 +1,67 @@
+"""Unit tests for the brute-force ban list."""
+
+import time
+
+from src.server.ban_list import BanList
+
+
+def test_ip_banned_after_threshold():
+    """Test that an IP is banned once it reaches the failure threshold."""
+    bans = BanList(max_failures=3)
+
+    assert not bans.record_failure("10.0.0.1")
+    assert not bans.record_failure("10.0.0.1")
+    assert not bans.is_ip_banned("10.0.0.1")
+    assert bans.record_failure("10.0.0.1")
+
+    assert bans.is_ip_banned("10.0.0.1")
+    assert not bans.is_ip_banned("10.0.0.2")
+    stats = bans.get_stats()
+    assert stats["bans"] == 1
+    assert stats["banned_ips"] == 1
+    assert stats["rejected_ips"] == 1
+
+
+def test_credential_prefix_banned_across_ips():
+    """Test that failures with one key prefix from many IPs ban the prefix."""
+    bans = BanList(max_failures=3)
+    for i in range(3):
+        bans.record_failure(f"10.0.0.{i}", "abcdefgh-guess-number-" + str(i))
+
+    assert bans.is_credential_banned("abcdefgh-another-guess-123")
+    assert not bans.is_credential_banned("zyxwvuts-another-guess-123")
+    assert not bans.is_credential_banned("short")
+    assert bans.get_stats()["rejected_prefixes"] == 1
+
+
+def test_failures_outside_window_are_forgotten():
+    """Test that failures older than the window do not count."""
+    bans = BanList(max_failures=2, window=0.05)
+    bans.record_failure("10.0.0.1")
+    time.sleep(0.1)
+
+    assert not bans.record_failure("10.0.0.1")
+    assert not bans.is_ip_banned("10.0.0.1")
+
+
+def test_ban_expires():
+    """Test that a ban lifts after its duration and the entry is swept."""
+    bans = BanList(max_failures=1, window=0.05, ban_duration=0.05)
+    bans.record_failure("10.0.0.1")
+    assert bans.is_ip_banned("10.0.0.1")
+    time.sleep(0.1)
+
+    assert not bans.is_ip_banned("10.0.0.1")
+    bans.record_failure("10.0.0.2")
+    assert bans.get_stats()["tracked_ips"] == 1
+
+
+def test_tables_are_bounded():
+    """Test that the least recently failing subjects are evicted past the bound."""
+    bans = BanList(max_failures=100, max_entries=10)
+    for i in range(25):
+        bans.record_failure(f"10.0.0.{i}")
+
+    stats = bans.get_stats()
+    assert stats["tracked_ips"] == 10
+    assert stats["evicted"] == 15
@@ -0,0 +1,86 @@
+"""Unit tests for bulkhead module."""
+
+import threading
+import time
+
+import pytest
+from src.server.bulkhead import Bulkhead, BulkheadFullError
+from src.server.executor import ToolExecutor
+
+
+def test_acquire_within_limit():
+    """Test that calls under the concurrency limit do not wait."""
+    bulkhead = Bulkhead("tool", max_concurrency=2)
+
+    assert bulkhead.acquire() == 0.0
+    assert bulkhead.acquire() == 0.0
+    assert bulkhead.get_stats()["active"] == 2
+
+
+def test_reject_when_queue_full():
+    """Test that calls beyond the queue fail fast with a retryable error."""
+    bulkhead = Bulkhead("tool", max_concurrency=1, max_queue=0)
+    bulkhead.acquire()
+
+    with pytest.raises(BulkheadFullError) as exc_info:
+        bulkhead.acquire()
+
+    error = exc_info.value.to_dict()
+    assert error["data"]["retryable"] is True
+    assert error["data"]["reason"] == "queue_full"
+    assert bulkhead.get_stats()["rejected"] == 1
+
+
+def test_queued_call_runs_after_release():
+    """Test that a queued call gets the slot once it is released."""
+    bulkhead = Bulkhead("tool", max_concurrency=1, max_queue=1)
+    bulkhead.acquire()
+    waits = []
+
+    worker = threading.Thread(target=lambda: waits.append(bulkhead.acquire()))
+    worker.start()
+    time.sleep(0.05)
+    assert bulkhead.get_stats()["queued"] == 1
+
+    bulkhead.release()
+    worker.join(timeout=1)
+
+    assert waits and waits[0] > 0
+    stats = bulkhead.get_stats()
+    assert stats["active"] == 1
+    assert stats["max_queue_wait_ms"] > 0
+
+
+def test_queue_timeout():
+    """Test that a queued call gives up after max_wait."""
+    bulkhead = Bulkhead("tool", max_concurrency=1, max_queue=1, max_wait=0.05)
+    bulkhead.acquire()
+
+    with pytest.raises(BulkheadFullError) as exc_info:
+        bulkhead.acquire()
+
+    assert exc_info.value.reason == "queue_timeout"
+    assert bulkhead.get_stats()["timed_out"] == 1
+
+
+def test_executor_isolates_tools():
+    """Test that a saturated tool does not block other tools."""
+    release = threading.Event()
+    tools = {
+        "slow": {"handler": lambda args: release.wait(1), "max_concurrency": 1, "max_queue": 0},
+        "echo": {"handler": lambda args: args["message"]}
+    }
+    executor = ToolExecutor(tools)
+
+    worker = threading.Thread(target=executor.execute, args=("slow", {}))
+    worker.start()
+    time.sleep(0.05)
+
+    with pytest.raises(BulkheadFullError):
+        executor.execute("slow", {})
+    assert executor.execute("echo", {"message": "hi"}) == "hi"
+
+    release.set()
+    worker.join(timeout=1)
+    assert executor.get_stats()["slow"]["bulkhead"]["rejected"] == 1
+    assert "bulkhead" not in executor.get_stats()["echo"]
@@ -0,0 +1,88 @@
+"""Unit tests for circuit breaker module."""
+
+import time
+
+import pytest
+from src.server.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.server.executor import ToolExecutor
+
+
+def _fail(breaker, count):
+    """Record a number of failed calls."""
+    for _ in range(count):
+        breaker.before_call()
+        breaker.record(False, 0.01)
+
+
+def test_opens_on_error_rate():
+    """Test that the breaker opens once the failure rate crosses the threshold."""
+    breaker = CircuitBreaker("tool", failure_rate_threshold=0.5, window_size=4, minimum_calls=4)
+
+    _fail(breaker, 3)
+    assert breaker.get_stats()["state"] == "closed"
+    _fail(breaker, 1)
+    assert breaker.get_stats()["state"] == "open"
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+
+    error = exc_info.value.to_dict()
+    assert error["code"] == -32002
+    assert error["data"]["circuit_state"] == "open"
+    assert breaker.get_stats()["rejected"] == 1
+
+
+def test_opens_on_slow_calls():
+    """Test that slow calls open the breaker even when they succeed."""
+    breaker = CircuitBreaker("tool", slow_call_duration=0.5, slow_call_rate_threshold=0.5,
+                             window_size=2, minimum_calls=2)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record(True, 1.0)
+
+    assert breaker.get_stats()["state"] == "open"
+
+
+def test_half_open_probes_close_breaker():
+    """Test that successful probe calls close the breaker again."""
+    breaker = CircuitBreaker("tool", window_size=2, minimum_calls=2,
+                             open_duration=0.05, half_open_max_calls=2)
+    _fail(breaker, 2)
+    time.sleep(0.06)
+
+    breaker.before_call()
+    breaker.before_call()
+    assert breaker.get_stats()["state"] == "half_open"
+
+    # Only the configured number of probes are allowed through
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record(True, 0.01)
+    breaker.record(True, 0.01)
+    assert breaker.get_stats()["state"] == "closed"
+
+
+def test_failed_probe_reopens_breaker():
+    """Test that a failed probe call reopens the breaker."""
+    breaker = CircuitBreaker("tool", window_size=2, minimum_calls=2, open_duration=0.05)
+    _fail(breaker, 2)
+    time.sleep(0.06)
+
+    _fail(breaker, 1)
+    assert breaker.get_stats()["state"] == "open"
+    assert breaker.get_stats()["times_opened"] == 2
+
+
+def test_executor_counts_unsuccessful_results():
+    """Test that results with success False count as failures."""
+    tools = {"flaky": {"handler": lambda args: {"success": False}}}
+    executor = ToolExecutor(tools, breaker_defaults={"window_size": 2, "minimum_calls": 2})
+
+    executor.execute("flaky", {})
+    executor.execute("flaky", {})
+
+    with pytest.raises(CircuitOpenError):
+        executor.execute("flaky", {})
+    assert executor.get_tool_stats("flaky")["circuit_breaker"]["state"] == "open"
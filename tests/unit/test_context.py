@@ -0,0 +1,204 @@
+"""Unit tests for tool context, progress and cancellation."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from src.server.context import DeadlineExceededError, ToolCancelledError, ToolContext, resolve_deadline
+from src.server.executor import ToolExecutor
+from src.server.scheduler import FairScheduler, SchedulerTimeoutError
+
+
+def test_report_progress():
+    """Test that progress notifications carry the client's progress token."""
+    sent = []
+    context = ToolContext(request_id=1, progress_token="tok", notify=sent.append)
+
+    context.report_progress(1, 4, "working")
+
+    assert sent == [{
+        "jsonrpc": "2.0",
+        "method": "notifications/progress",
+        "params": {"progressToken": "tok", "progress": 1, "total": 4, "message": "working"}
+    }]
+
+
+def test_progress_without_token_is_dropped():
+    """Test that progress is only sent when the client asked for it."""
+    sent = []
+    context = ToolContext(request_id=1, notify=sent.append)
+
+    context.report_progress(1)
+
+    assert sent == []
+
+
+def test_failed_progress_delivery_cancels():
+    """Test that a disconnected client cancels the call."""
+    def notify(message):
+        raise BrokenPipeError()
+
+    context = ToolContext(progress_token="tok", notify=notify)
+    context.report_progress(1)
+
+    assert context.cancelled
+    with pytest.raises(ToolCancelledError):
+        context.check_cancelled()
+
+
+def test_cancel_cooperative_sync_tool():
+    """Test that cancelling by call key signals a cooperative sync tool."""
+    started = threading.Event()
+
+    def handler(args, context):
+        started.set()
+        context.wait(5)
+        return {"success": True}
+
+    executor = ToolExecutor({"slow": {"handler": handler, "accepts_context": True}})
+    errors = []
+
+    def run():
+        try:
+            executor.execute("slow", {}, ToolContext(call_key=("key", 1)))
+        except ToolCancelledError as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    started.wait(1)
+
+    assert executor.cancel(("key", 1), "user abort") is True
+    worker.join(timeout=1)
+
+    assert not worker.is_alive()
+    assert errors and errors[0].reason == "user abort"
+    assert executor.get_execution_stats()["cancelled"] == 1
+    assert executor.get_execution_stats()["in_flight"] == 0
+    # Cancelled calls do not count against the circuit breaker
+    assert executor.get_tool_stats("slow")["circuit_breaker"]["window_calls"] == 0
+
+
+def test_cancel_async_tool():
+    """Test that cancelling an async tool cancels its task."""
+    started = threading.Event()
+
+    async def handler(args):
+        started.set()
+        await asyncio.sleep(5)
+
+    executor = ToolExecutor({"slow": {"handler": handler, "is_async": True}})
+    errors = []
+
+    def run():
+        try:
+            executor.execute("slow", {}, ToolContext(call_key=("key", 2)))
+        except ToolCancelledError as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    started.wait(1)
+    start = time.monotonic()
+
+    executor.cancel(("key", 2))
+    worker.join(timeout=1)
+
+    assert errors
+    assert time.monotonic() - start < 1
+
+
+def test_cancel_unknown_call():
+    """Test that cancelling an unknown call is a no-op."""
+    executor = ToolExecutor({})
+    assert executor.cancel(("key", 99)) is False
+
+
+def test_resolve_deadline():
+    """Test converting client deadlines to the monotonic clock."""
+    assert resolve_deadline() is None
+
+    deadline = resolve_deadline(timeout="2.5")
+    assert 2.4 < deadline - time.monotonic() <= 2.5
+
+    # The earlier of an absolute deadline and a relative timeout wins
+    deadline = resolve_deadline(deadline=time.time() + 1, timeout=10)
+    assert deadline - time.monotonic() <= 1
+
+    with pytest.raises(ValueError):
+        resolve_deadline(timeout="soon")
+
+
+def test_expired_call_is_dropped_before_execution():
+    """Test that calls past their deadline never run and are counted."""
+    calls = []
+    executor = ToolExecutor({"echo": {"handler": calls.append}})
+    context = ToolContext(deadline=time.monotonic() - 1)
+
+    with pytest.raises(DeadlineExceededError):
+        executor.execute("echo", {}, context)
+
+    assert calls == []
+    assert executor.get_execution_stats()["expired_before_execution"] == 1
+
+
+def test_deadline_bounds_queue_wait():
+    """Test that a call expiring while queued is dropped and counted."""
+    release = threading.Event()
+    executor = ToolExecutor({
+        "slow": {"handler": lambda args: release.wait(1), "max_concurrency": 1, "max_queue": 1}
+    })
+    worker = threading.Thread(target=executor.execute, args=("slow", {}))
+    worker.start()
+    time.sleep(0.05)
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        executor.execute("slow", {}, ToolContext(deadline=time.monotonic() + 0.05))
+    assert time.monotonic() - start < 0.5
+
+    release.set()
+    worker.join(timeout=1)
+    assert executor.get_execution_stats()["expired_before_execution"] == 1
+
+
+def test_remaining_budget_is_passed_to_tools():
+    """Test that handlers can read their remaining time budget."""
+    def handler(args, context):
+        return context.remaining_time()
+
+    executor = ToolExecutor({"budget": {"handler": handler, "accepts_context": True}})
+    remaining = executor.execute("budget", {}, ToolContext(deadline=time.monotonic() + 5))
+
+    assert 4 < remaining <= 5
+
+
+def _busy_scheduler_executor(**options):
+    """Build an executor whose single scheduler slot is already taken."""
+    scheduler = FairScheduler(max_concurrent=1)
+    scheduler.acquire("other")
+    return ToolExecutor({"echo": {"handler": lambda args: args}}, scheduler=scheduler, **options)
+
+
+def test_scheduler_wait_without_deadline_uses_default_max_wait():
+    """Test that a call with no deadline still stops waiting after default_max_wait."""
+    executor = _busy_scheduler_executor(default_max_wait=0.05)
+
+    start = time.monotonic()
+    with pytest.raises(SchedulerTimeoutError):
+        executor.execute("echo", {}, ToolContext(client_id="a"))
+    assert time.monotonic() - start < 1
+
+
+def test_cancel_while_waiting_for_scheduler():
+    """Test that a cancelled call leaves the scheduler queue without waiting for a slot."""
+    executor = _busy_scheduler_executor()
+    context = ToolContext(client_id="a")
+    threading.Timer(0.05, context.cancel, args=("client cancelled",)).start()
+
+    start = time.monotonic()
+    with pytest.raises(ToolCancelledError):
+        executor.execute("echo", {}, context)
+    assert time.monotonic() - start < 1
+    assert executor.scheduler.get_stats()["queued"] == 0
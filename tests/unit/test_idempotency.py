@@ -0,0 +1,193 @@
+"""Unit tests for the idempotency replay cache."""
+
+import threading
+import time
+
+import pytest
+from src.server.idempotency import IdempotencyCache, IdempotencyKeyInProgressError, IdempotencyKeyReusedError
+
+
+def _response(result, request_id=1):
+    return {"jsonrpc": "2.0", "result": result, "id": request_id}
+
+
+def test_repeat_replays_stored_response():
+    """Test that a repeated key returns the first response without running again."""
+    cache = IdempotencyCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return _response(len(calls))
+
+    first = cache.run("client", "k1", "fp", compute)
+    second = cache.run("client", "k1", "fp", compute)
+
+    assert first == second == _response(1)
+    assert len(calls) == 1
+    stats = cache.get_stats()
+    assert stats["executed"] == 1
+    assert stats["replayed"] == 1
+
+
+def test_keys_are_scoped_to_owner():
+    """Test that two clients using the same key do not share responses."""
+    cache = IdempotencyCache()
+
+    assert cache.run("a", "k1", "fp", lambda: _response("a"))["result"] == "a"
+    assert cache.run("b", "k1", "fp", lambda: _response("b"))["result"] == "b"
+
+
+def test_reused_key_with_different_request_is_rejected():
+    """Test that a key cannot be reused for a different request body."""
+    cache = IdempotencyCache()
+    cache.run("client", "k1", "fp1", lambda: _response(1))
+
+    with pytest.raises(IdempotencyKeyReusedError) as exc_info:
+        cache.run("client", "k1", "fp2", lambda: _response(2))
+
+    assert exc_info.value.code == -32009
+    assert cache.get_stats()["conflicts"] == 1
+
+
+def test_fingerprint_ignores_key_order():
+    """Test that fingerprints are stable under argument reordering."""
+    assert (IdempotencyCache.fingerprint({"tool": "echo", "arguments": {"a": 1, "b": 2}})
+            == IdempotencyCache.fingerprint({"arguments": {"b": 2, "a": 1}, "tool": "echo"}))
+    assert (IdempotencyCache.fingerprint({"tool": "echo", "arguments": {"a": 1}})
+            != IdempotencyCache.fingerprint({"tool": "echo", "arguments": {"a": 2}}))
+
+
+def test_control_errors_are_not_stored():
+    """Test that retryable rejections let the retry run the tool."""
+    cache = IdempotencyCache()
+    busy = {"jsonrpc": "2.0", "error": {"code": -32001, "message": "busy"}, "id": 1}
+
+    assert cache.run("client", "k1", "fp", lambda: busy) == busy
+    assert cache.run("client", "k1", "fp", lambda: _response("ok"))["result"] == "ok"
+    assert cache.get_stats()["executed"] == 2
+
+
+def test_tool_errors_are_stored():
+    """Test that errors raised by the tool itself are replayed."""
+    cache = IdempotencyCache()
+    failed = {"jsonrpc": "2.0", "error": {"code": -32603, "message": "boom"}, "id": 1}
+
+    cache.run("client", "k1", "fp", lambda: failed)
+
+    assert cache.run("client", "k1", "fp", lambda: _response("ok")) == failed
+
+
+def test_exception_in_compute_frees_key():
+    """Test that a crashed first call does not block retries."""
+    cache = IdempotencyCache()
+
+    def crash():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.run("client", "k1", "fp", crash)
+
+    assert cache.run("client", "k1", "fp", lambda: _response("ok"))["result"] == "ok"
+
+
+def test_concurrent_duplicate_waits_for_first_call():
+    """Test that a duplicate arriving mid-flight joins the first call."""
+    cache = IdempotencyCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(1)
+        return _response("done")
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.run("client", "k1", "fp", slow)))
+    first.start()
+    started.wait(1)
+    second = threading.Thread(target=lambda: results.append(cache.run("client", "k1", "fp", slow)))
+    second.start()
+    time.sleep(0.05)
+    release.set()
+    first.join(1)
+    second.join(1)
+
+    assert results == [_response("done"), _response("done")]
+    assert len(calls) == 1
+    assert cache.get_stats()["joined_in_flight"] == 1
+
+
+def test_waiting_on_duplicate_is_bounded():
+    """Test that a duplicate gives up once its timeout passes."""
+    cache = IdempotencyCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(1)
+        return _response("done")
+
+    thread = threading.Thread(target=cache.run, args=("client", "k1", "fp", slow))
+    thread.start()
+    started.wait(1)
+    try:
+        with pytest.raises(IdempotencyKeyInProgressError) as exc_info:
+            cache.run("client", "k1", "fp", slow, timeout=0.05)
+        assert exc_info.value.to_dict()["data"]["retryable"] is True
+    finally:
+        release.set()
+        thread.join(1)
+
+
+def test_ttl_expiry():
+    """Test that stored responses expire after the TTL."""
+    cache = IdempotencyCache(ttl=0.05)
+    cache.run("client", "k1", "fp", lambda: _response(1))
+    time.sleep(0.1)
+
+    assert cache.run("client", "k1", "fp", lambda: _response(2))["result"] == 2
+    assert cache.get_stats()["evicted"] == 1
+
+
+def test_size_bound_evicts_oldest():
+    """Test that the oldest stored responses are evicted at capacity."""
+    cache = IdempotencyCache(max_entries=2)
+    for i in range(3):
+        cache.run("client", f"k{i}", "fp", lambda i=i: _response(i))
+
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["evicted"] == 1
+    assert cache.run("client", "k0", "fp", lambda: _response("new"))["result"] == "new"
+
+
+def test_expiry_skips_in_flight_entries():
+    """Test that an older in-flight call does not hold back expiry of finished entries."""
+    cache = IdempotencyCache(ttl=0.05)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(1)
+        return _response("slow")
+
+    thread = threading.Thread(target=cache.run, args=("client", "in-flight", "fp", slow))
+    thread.start()
+    started.wait(1)
+    try:
+        cache.run("client", "k1", "fp", lambda: _response(1))
+        time.sleep(0.1)
+        assert cache.run("client", "k2", "fp", lambda: _response(2))["result"] == 2
+
+        stats = cache.get_stats()
+        assert stats["evicted"] == 1
+        # The in-flight call and k2 remain
+        assert stats["entries"] == 2
+    finally:
+        release.set()
+        thread.join(1)
@@ -0,0 +1,138 @@
+"""Unit tests for the asynchronous job mode."""
+
+import os
+import threading
+import time
+
+import pytest
+from src.server.executor import ToolExecutor
+from src.server.jobs import (Job, JobManager, JobNotFinishedError, JobNotFoundError,
+                             JobStore, JobStoreFullError)
+from src.server.context import ToolContext
+from src.server.notifications import NotificationHub
+
+
+def _wait_finished(manager, job_id, owner, timeout=2.0):
+    """Poll until a job has finished and return its response."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return manager.get_response(job_id, owner)
+        except JobNotFinishedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Create a job manager with a blocking and a large-result tool."""
+    release = threading.Event()
+    tools = {
+        "echo": {"handler": lambda args: {"success": True, "message": args["message"]}},
+        "blocking": {"handler": lambda args: release.wait(5) and {"success": True}},
+        "big": {"handler": lambda args: {"success": True, "data": "x" * 5000}}
+    }
+    store = JobStore(max_jobs=10, spill_threshold=1000, spill_dir=str(tmp_path))
+    manager = JobManager(ToolExecutor(tools), store=store, hub=NotificationHub())
+    manager.release = release
+    yield manager
+    release.set()
+    manager.shutdown()
+
+
+def test_job_result(manager):
+    """Test that a job runs in the background and its result can be fetched."""
+    job = manager.submit("key", "echo", {"message": "hi"})
+    response = _wait_finished(manager, job.id, "key")
+
+    assert response["status"] == "completed"
+    assert response["result"] == {"success": True, "message": "hi"}
+
+
+def test_unfinished_job(manager):
+    """Test that fetching an unfinished job's result is a retryable error."""
+    job = manager.submit("key", "blocking", {})
+
+    with pytest.raises(JobNotFinishedError) as exc_info:
+        manager.get_response(job.id, "key")
+    assert exc_info.value.to_dict()["data"]["retryable"] is True
+
+    manager.release.set()
+    assert _wait_finished(manager, job.id, "key")["status"] == "completed"
+
+
+def test_jobs_are_private_to_owner(manager):
+    """Test that other clients cannot see a job."""
+    job = manager.submit("key", "echo", {"message": "hi"})
+
+    with pytest.raises(JobNotFoundError):
+        manager.store.get(job.id, "other-key")
+
+
+def test_large_results_spill_to_disk(manager):
+    """Test that large results are written to disk instead of memory."""
+    job = manager.submit("key", "big", {})
+    response = _wait_finished(manager, job.id, "key")
+
+    assert len(response["result"]["data"]) == 5000
+    assert job.result_path is not None and os.path.exists(job.result_path)
+    assert manager.store.get_stats()["spilled"] == 1
+
+
+def test_cancel_job(manager):
+    """Test that a cancelled job ends in the cancelled state."""
+    started = threading.Event()
+
+    def handler(args, context):
+        started.set()
+        context.wait(5)
+        return {"success": True}
+
+    manager.executor.tools["cooperative"] = {"handler": handler, "accepts_context": True}
+    job = manager.submit("key", "cooperative", {})
+    started.wait(1)
+
+    manager.cancel(job.id, "key")
+    assert _wait_finished(manager, job.id, "key")["status"] == "cancelled"
+
+
+def test_completion_is_pushed_to_streams(manager):
+    """Test that job completions are published to the owner's streams."""
+    stream = manager.hub.subscribe("key")
+    job = manager.submit("key", "echo", {"message": "pushed"})
+
+    message = stream.get(timeout=2)
+    assert message["method"] == "notifications/jobs/completed"
+    assert message["params"]["jobId"] == job.id
+    assert message["params"]["result"]["message"] == "pushed"
+
+
+def test_store_ttl_eviction(tmp_path):
+    """Test that finished jobs are evicted after their TTL."""
+    store = JobStore(ttl=0.05, spill_dir=str(tmp_path))
+    job = Job("job1", "key", "echo", ToolContext())
+    store.add(job)
+    job.status = "completed"
+    job.finished_at = time.time()
+
+    time.sleep(0.1)
+    with pytest.raises(JobNotFoundError):
+        store.get("job1", "key")
+    assert store.get_stats()["evicted"] == 1
+
+
+def test_store_capacity(tmp_path):
+    """Test that the store evicts finished jobs first and refuses when all are running."""
+    store = JobStore(max_jobs=2, spill_dir=str(tmp_path))
+    first = Job("a", "key", "echo", ToolContext())
+    first.status = "completed"
+    store.add(first)
+    store.add(Job("b", "key", "echo", ToolContext()))
+
+    # The finished job makes room for a new one
+    store.add(Job("c", "key", "echo", ToolContext()))
+    assert [job.id for job in store.list_jobs()] == ["b", "c"]
+
+    with pytest.raises(JobStoreFullError):
+        store.add(Job("d", "key", "echo", ToolContext()))
@@ -0,0 +1,176 @@
+"""Unit tests for the hot-reloadable API key store."""
+
+import json
+import os
+import signal
+import sqlite3
+import threading
+import time
+
+import pytest
+from src.server.auth import Authentication
+from src.server.key_store import KeyStore, load_keys
+
+
+def _wait_for(condition, timeout=3.0):
+    """Poll until condition() is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_load_text_file(tmp_path):
+    """Test one key per line with comments and blank lines."""
+    path = tmp_path / "keys.txt"
+    path.write_text("# agents\nkey-a\n\n  key-b  \n")
+
+    assert load_keys(str(path)) == ["key-a", "key-b"]
+
+
+def test_load_json_file(tmp_path):
+    """Test JSON lists and objects with a keys list."""
+    path = tmp_path / "keys.json"
+    path.write_text(json.dumps({"keys": ["key-a", "key-b"]}))
+    assert load_keys(str(path)) == ["key-a", "key-b"]
+
+    path.write_text(json.dumps({"keys": "key-a"}))
+    with pytest.raises(ValueError):
+        load_keys(str(path))
+
+
+def test_load_sqlite(tmp_path):
+    """Test reading keys from an api_keys table."""
+    path = tmp_path / "keys.db"
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE api_keys (key TEXT PRIMARY KEY)")
+    connection.executemany("INSERT INTO api_keys VALUES (?)", [("key-a",), ("key-b",)])
+    connection.commit()
+    connection.close()
+
+    assert sorted(load_keys(str(path))) == ["key-a", "key-b"]
+
+
+@pytest.mark.parametrize("schema, row", [
+    ("CREATE TABLE tiers (tier TEXT, requests_per_minute INTEGER)", ("gold", 10)),
+    ("CREATE TABLE tiers (name, requests_per_minute INTEGER)", (None, 10)),
+    ("CREATE TABLE tiers (name, requests_per_minute INTEGER)", (b"gold", 10)),
+])
+def test_sqlite_tier_without_name_fails_reload(tmp_path, schema, row):
+    """Test that a tier row without a usable name is a load error, not a crash."""
+    path = tmp_path / "keys.db"
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE api_keys (key TEXT PRIMARY KEY)")
+    connection.execute("INSERT INTO api_keys VALUES ('key-a')")
+    connection.execute(schema)
+    connection.execute("INSERT INTO tiers VALUES (?, ?)", row)
+    connection.commit()
+    connection.close()
+
+    with pytest.raises(ValueError):
+        load_keys(str(path))
+    store = KeyStore(Authentication([]), str(path), use_inotify=False)
+    assert store.reload() is False
+    assert "ValueError" in store.get_stats()["last_error"]
+
+
+def test_reload_swaps_keys_and_keeps_static(tmp_path):
+    """Test that reloading replaces file keys but keeps static keys."""
+    path = tmp_path / "keys.txt"
+    path.write_text("key-a\n")
+    auth = Authentication([])
+    store = KeyStore(auth, str(path), static_keys=["static"], use_inotify=False)
+
+    assert store.reload() is True
+    assert auth.verify_key("key-a") and auth.verify_key("static")
+
+    path.write_text("key-b\n")
+    store.reload()
+
+    assert not auth.verify_key("key-a")
+    assert auth.verify_key("key-b") and auth.verify_key("static")
+    stats = store.get_stats()
+    assert stats["keys"] == 2
+    assert stats["source_keys"] == 1
+    assert stats["reloads"] == 2
+    assert stats["last_reload_ms"] is not None
+
+
+def test_failed_reload_keeps_previous_keys(tmp_path):
+    """Test that a broken source leaves the current keys in place."""
+    path = tmp_path / "keys.json"
+    path.write_text('["key-a"]')
+    auth = Authentication([])
+    store = KeyStore(auth, str(path), use_inotify=False)
+    store.reload()
+
+    path.write_text("{broken")
+
+    assert store.reload() is False
+    assert auth.verify_key("key-a")
+    assert store.get_stats()["failures"] == 1
+    assert store.get_stats()["last_error"]
+
+
+def test_reloads_when_file_changes(tmp_path):
+    """Test that editing the key file is picked up without a restart."""
+    path = tmp_path / "keys.txt"
+    path.write_text("key-a\n")
+    auth = Authentication([])
+    store = KeyStore(auth, str(path), debounce=0.05, poll_interval=0.05, use_inotify=False)
+    store.reload("startup")
+    store.start()
+    try:
+        # Replace the file atomically, the way deployment tools do
+        replacement = tmp_path / "keys.txt.new"
+        replacement.write_text("key-a\nkey-b\n")
+        os.replace(replacement, path)
+
+        assert _wait_for(lambda: auth.verify_key("key-b"))
+        assert store.get_stats()["last_reason"] == "file changed"
+    finally:
+        store.close()
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP not available")
+def test_reloads_on_sighup(tmp_path):
+    """Test that SIGHUP triggers a reload."""
+    path = tmp_path / "keys.txt"
+    path.write_text("key-a\n")
+    auth = Authentication([])
+    store = KeyStore(auth, str(path), use_inotify=False)
+    previous = signal.getsignal(signal.SIGHUP)
+    try:
+        assert store.install_signal_handler() is True
+        os.kill(os.getpid(), signal.SIGHUP)
+
+        assert _wait_for(lambda: auth.verify_key("key-a"))
+        assert store.get_stats()["last_reason"] == "SIGHUP"
+    finally:
+        signal.signal(signal.SIGHUP, previous)
+
+
+def test_lookups_during_reload(tmp_path):
+    """Test that verification keeps working while keys are swapped."""
+    path = tmp_path / "keys.txt"
+    path.write_text("\n".join(f"key-{i}" for i in range(5000)))
+    auth = Authentication(["static"])
+    store = KeyStore(auth, str(path), static_keys=["static"], use_inotify=False)
+    failures = []
+    stop = threading.Event()
+
+    def verify():
+        while not stop.is_set():
+            if not auth.verify_key("static"):
+                failures.append(1)
+
+    thread = threading.Thread(target=verify)
+    thread.start()
+    for _ in range(5):
+        store.reload()
+    stop.set()
+    thread.join()
+
+    assert failures == []
@@ -0,0 +1,120 @@
+"""Unit tests for the latency histograms."""
+
+import json
+import random
+
+from src.server.latency import LatencyHistogram, LatencyTracker, bucket_bounds, bucket_index
+from src.server.monitoring import Monitoring
+
+
+def test_buckets_are_ordered_and_narrow():
+    """Test that every value falls in its bucket and buckets stay within ~3%."""
+    previous = -1
+    for value in list(range(5000)) + [10 ** 6, 10 ** 6 + 12345, 3600 * 10 ** 6]:
+        index = bucket_index(value)
+        low, high = bucket_bounds(index)
+        assert low <= value <= high
+        assert index >= previous
+        assert high - low <= max(1, low / 32)
+        previous = index
+
+
+def test_percentiles_close_to_exact():
+    """Test percentiles against exact order statistics."""
+    rng = random.Random(7)
+    samples = [rng.expovariate(50) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+
+    samples.sort()
+    for quantile in (0.5, 0.9, 0.99, 0.999):
+        exact = samples[round(quantile * len(samples)) - 1]
+        assert abs(histogram.percentile(quantile) - exact) <= exact * 0.03
+    assert histogram.count == 20000
+    assert histogram.max == samples[-1]
+    assert histogram.percentile(1.0) <= histogram.max
+
+
+def test_merge_matches_single_histogram():
+    """Test that merging serialized histograms equals recording into one."""
+    rng = random.Random(3)
+    combined = LatencyHistogram()
+    parts = [LatencyHistogram() for _ in range(3)]
+    for i in range(3000):
+        duration = rng.uniform(0.0001, 2.0)
+        combined.record(duration)
+        parts[i % 3].record(duration)
+
+    merged = LatencyHistogram()
+    for part in parts:
+        merged.merge(LatencyHistogram.from_dict(json.loads(json.dumps(part.to_dict()))))
+
+    assert merged.counts == combined.counts
+    assert merged.count == combined.count
+    assert merged.summary() == combined.summary()
+
+
+def test_tracker_window_slides():
+    """Test that slices older than the window are dropped."""
+    tracker = LatencyTracker(window=60, slices=6)
+    tracker.start_time = 0
+    tracker.record("POST /mcp", "echo", "2xx", 0.010, now=1000)
+    tracker.record("POST /mcp", "echo", "2xx", 0.020, now=1035)
+    tracker.record("POST /mcp", None, "4xx", 0.001, now=1055)
+
+    histograms = tracker.histograms(now=1055)
+    assert histograms[("POST /mcp", "echo", "2xx")].count == 2
+    assert histograms[("POST /mcp", "", "4xx")].count == 1
+
+    # The slice holding the first request has left the window
+    assert tracker.histograms(now=1065)[("POST /mcp", "echo", "2xx")].count == 1
+    assert tracker.histograms(now=1200) == {}
+
+    stats = tracker.get_stats(now=1055)
+    assert stats["endpoints"]["POST /mcp"]["count"] == 3
+    assert stats["tools"] == {"echo": stats["tools"]["echo"]}
+    assert stats["tools"]["echo"]["max_ms"] == 20.0
+    assert set(stats["status"]) == {"2xx", "4xx"}
+
+
+def test_tracker_keys_are_bounded():
+    """Test that keys beyond max_keys are folded into other, in the window and the totals."""
+    tracker = LatencyTracker(max_keys=3)
+    for i in range(50):
+        tracker.record(f"GET /junk-{i}", f"tool-{i}", "4xx", 0.001)
+        tracker.record(f"GET /junk-{i}", None, "5xx", 0.001)
+
+    totals = tracker.totals()
+    assert set(totals) == {("GET /junk-0", "tool-0", "4xx"), ("GET /junk-0", "", "5xx"),
+                           ("GET /junk-1", "tool-1", "4xx"), ("other", "", "4xx"), ("other", "", "5xx")}
+    assert totals[("other", "", "4xx")].count == 48
+    assert set(tracker.histograms()) == set(totals)
+
+
+def test_snapshots_merge_across_processes():
+    """Test that snapshots from several trackers merge per key."""
+    workers = [LatencyTracker(), LatencyTracker()]
+    workers[0].record("POST /mcp", "echo", "2xx", 0.005)
+    workers[1].record("POST /mcp", "echo", "2xx", 0.050)
+    workers[1].record("GET /api/status", None, "2xx", 0.002)
+
+    snapshots = [json.loads(json.dumps(worker.snapshot())) for worker in workers]
+    merged = LatencyTracker.merge_snapshots(snapshots)
+
+    assert merged[("POST /mcp", "echo", "2xx")].count == 2
+    assert merged[("POST /mcp", "echo", "2xx")].max == 0.050
+    summary = LatencyTracker.summarize(merged)
+    assert summary["status"]["2xx"]["count"] == 3
+
+
+def test_monitoring_reports_latency():
+    """Test that recorded requests feed the latency statistics."""
+    monitor = Monitoring(log_level="WARNING")
+    monitor.record_request("1.2.3.4", "POST /mcp", 200, True, 0.004, tool="echo")
+    monitor.record_request("1.2.3.4", "POST /mcp", 200, True, 0.2, tool="echo", status_label="rpc_error")
+
+    latency = monitor.get_stats()["latency"]
+    assert latency["tools"]["echo"]["count"] == 2
+    assert latency["status"]["rpc_error"]["count"] == 1
+    assert monitor.requests.total == 2
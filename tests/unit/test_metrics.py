@@ -0,0 +1,83 @@
+"""Unit tests for the Prometheus metrics exporter."""
+
+from src.server.latency import LatencyHistogram
+from src.server.metrics import MetricFamily, MetricsExporter, histogram_family, process_families
+from src.server.monitoring import Monitoring
+
+
+def test_family_renders_exposition_format():
+    """Test HELP/TYPE lines, labels and label escaping."""
+    family = MetricFamily("mcp_auth_failures_total", "counter", "Failed authentications.")
+    family.add(3, reason="invalid").add(1.5, reason='quote " and \\ and\nnewline')
+
+    assert family.render() == (
+        "# HELP mcp_auth_failures_total Failed authentications.\n"
+        "# TYPE mcp_auth_failures_total counter\n"
+        'mcp_auth_failures_total{reason="invalid"} 3\n'
+        'mcp_auth_failures_total{reason="quote \\" and \\\\ and\\nnewline"} 1.5\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test that log buckets are folded into cumulative le buckets."""
+    histogram = LatencyHistogram()
+    for duration in (0.0004, 0.003, 0.003, 0.2, 12.0):
+        histogram.record(duration)
+
+    family = histogram_family("mcp_request_duration_seconds", "Durations.",
+                              {("POST /mcp", "echo", "2xx"): histogram},
+                              buckets=(0.001, 0.005, 0.25, 1.0))
+    buckets = {labels["le"]: value for suffix, labels, value in family.samples if suffix == "_bucket"}
+    assert buckets == {"0.001": 1, "0.005": 3, "0.25": 4, "1.0": 4, "+Inf": 5}
+
+    samples = {suffix: value for suffix, _, value in family.samples if suffix != "_bucket"}
+    assert samples["_count"] == 5
+    assert abs(samples["_sum"] - 12.2064) < 1e-9
+    assert 'endpoint="POST /mcp",tool="echo",status="2xx",le="+Inf"} 5' in family.render()
+
+
+def test_render_is_cached():
+    """Test that scrapes within the cache interval reuse the rendering."""
+    calls = []
+
+    def collector():
+        calls.append(1)
+        return [MetricFamily("mcp_requests_in_flight", "gauge", "In flight.").add(len(calls))]
+
+    exporter = MetricsExporter(cache_seconds=60)
+    exporter.add_collector(collector)
+    first = exporter.render()
+    assert exporter.render() is first
+    assert len(calls) == 1
+    assert b"mcp_requests_in_flight 1\n" in first
+
+    exporter.cache_seconds = 0
+    assert b"mcp_requests_in_flight 2\n" in exporter.render()
+    stats = exporter.get_stats()
+    assert stats["renders"] == 2
+    assert stats["cache_hits"] == 1
+
+
+def test_process_families():
+    """Test that the standard process metrics are exported."""
+    sample = Monitoring(log_level="WARNING").sampler.latest()
+    names = {family.name for family in process_families(sample)}
+    assert {"process_cpu_seconds_total", "process_resident_memory_bytes",
+            "process_start_time_seconds", "process_threads", "process_context_switches_total"} <= names
+
+
+def test_monitoring_counters_and_in_flight():
+    """Test the event counters and in-flight gauge kept for the exporter."""
+    monitor = Monitoring(log_level="WARNING")
+    monitor.increment("rate_limited", "key")
+    monitor.increment("rate_limited", "key")
+    monitor.increment("rate_limited", "tool")
+    monitor.request_started()
+    monitor.request_started()
+    monitor.request_finished()
+    monitor.record_request("1.2.3.4", "POST /mcp", 200, True, 0.01, tool="echo")
+
+    assert monitor.get_counters() == {"rate_limited": {"key": 2, "tool": 1}}
+    assert monitor.in_flight == 1
+    totals = monitor.latency.totals()
+    assert totals[("POST /mcp", "echo", "2xx")].count == 1
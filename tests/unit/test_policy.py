@@ -0,0 +1,159 @@
+"""Unit tests for per-key access policies."""
+
+import json
+import sqlite3
+
+import pytest
+from src.server.auth import Authentication
+from src.server.key_store import load_key_entries
+from src.server.policy import DEFAULT_POLICY, KeyPolicy, parse_tiers, resolve_policy
+from src.server.rate_limiter import RateLimiter
+from src.tools.registry import ToolRegistry
+
+
+def _registry(names):
+    """Build a registry holding only the given tools."""
+    registry = ToolRegistry()
+    registry.tools.clear()
+    for name in names:
+        registry.register_tool(name, lambda: None, name, {})
+    return registry
+
+
+def test_default_policy_allows_everything():
+    """Test that keys without metadata keep full access."""
+    registry = _registry(["echo"])
+
+    assert DEFAULT_POLICY.allows_method("tools/call")
+    assert DEFAULT_POLICY.allows_tool(registry, "echo")
+    assert DEFAULT_POLICY.tool_mask(registry) is None
+
+
+def test_method_allowlist():
+    """Test exact and namespace method entries."""
+    policy = KeyPolicy(methods=["tools/*", "jobs/get"])
+
+    assert policy.allows_method("tools/list")
+    assert policy.allows_method("tools/call")
+    assert policy.allows_method("jobs/get")
+    assert not policy.allows_method("jobs/list")
+    assert not policy.allows_method("resources/read")
+
+
+def test_tool_allowlist_bitset():
+    """Test that tool patterns compile to a bitset over tool ids."""
+    registry = _registry(["billing_read", "billing_write", "echo"])
+    policy = KeyPolicy(tools=["billing_*"])
+
+    mask = policy.tool_mask(registry)
+    assert mask == (1 << registry.tool_id("billing_read")) | (1 << registry.tool_id("billing_write"))
+    assert policy.allows_tool(registry, "billing_read")
+    assert not policy.allows_tool(registry, "echo")
+    assert not policy.allows_tool(registry, "missing")
+
+
+def test_tool_mask_follows_new_tools():
+    """Test that tools registered later are matched by existing patterns."""
+    registry = _registry(["billing_read"])
+    policy = KeyPolicy(tools=["billing_*"])
+    policy.tool_mask(registry)
+
+    registry.register_tool("billing_export", lambda: None, "", {})
+
+    assert policy.allows_tool(registry, "billing_export")
+
+
+def test_filtered_tool_listing():
+    """Test that listings only show allowed tools and paginate over them."""
+    registry = _registry([f"tool_{i:02d}" for i in range(10)])
+    policy = KeyPolicy(tools=["tool_0[13579]"])
+    mask = policy.tool_mask(registry)
+
+    names, cursor = [], None
+    while True:
+        page, cursor = registry.list_tools_page(cursor=cursor, limit=2, allowed=mask)
+        names.extend(tool["name"] for tool in page)
+        if cursor is None:
+            break
+
+    assert names == ["tool_01", "tool_03", "tool_05", "tool_07", "tool_09"]
+
+
+def test_tiers_and_overrides():
+    """Test tier resolution and sharing of tier policies."""
+    tiers = parse_tiers({"free": {"requests_per_minute": 10, "tools": ["echo"]}})
+
+    free = resolve_policy({"key": "a", "tier": "free"}, tiers)
+    assert free is tiers["free"]
+    assert free.requests_per_minute == 10
+
+    custom = resolve_policy({"key": "b", "tier": "free", "requests_per_minute": 50}, tiers)
+    assert custom.requests_per_minute == 50
+    assert custom.tools == ("echo",)
+    assert custom.tier == "free"
+
+    with pytest.raises(ValueError):
+        resolve_policy({"key": "c", "tier": "gold"}, tiers)
+    with pytest.raises(ValueError):
+        parse_tiers({"bad": {"requests_per_minute": -1}})
+
+
+def test_json_key_file_with_tiers(tmp_path):
+    """Test loading keys with tiers and overrides from JSON."""
+    path = tmp_path / "keys.json"
+    path.write_text(json.dumps({
+        "tiers": {"pro": {"requests_per_minute": 600}},
+        "keys": ["plain", {"key": "pro-key", "tier": "pro"},
+                 {"key": "narrow", "tools": ["echo"], "methods": ["tools/*"]}]
+    }))
+
+    keys, policies = load_key_entries(str(path))
+
+    assert keys == ["plain", "pro-key", "narrow"]
+    assert policies["plain"] is DEFAULT_POLICY
+    assert policies["pro-key"].requests_per_minute == 600
+    assert policies["narrow"].tools == ("echo",)
+    assert not policies["narrow"].allows_method("jobs/list")
+
+
+def test_sqlite_key_metadata(tmp_path):
+    """Test loading keys with metadata columns and a tiers table from SQLite."""
+    path = tmp_path / "keys.db"
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE tiers (name TEXT, requests_per_minute INTEGER, tools TEXT, methods TEXT)")
+    connection.execute("INSERT INTO tiers VALUES ('free', 10, 'echo', NULL)")
+    connection.execute("CREATE TABLE api_keys (key TEXT, tier TEXT, tools TEXT)")
+    connection.execute("INSERT INTO api_keys VALUES ('a', 'free', NULL)")
+    connection.execute("INSERT INTO api_keys VALUES ('b', NULL, 'echo, system_*')")
+    connection.commit()
+    connection.close()
+
+    keys, policies = load_key_entries(str(path))
+
+    assert keys == ["a", "b"]
+    assert policies["a"].requests_per_minute == 10
+    assert policies["a"].tools == ("echo",)
+    assert policies["b"].tools == ("echo", "system_*")
+
+
+def test_authenticate_returns_policy():
+    """Test that authentication resolves the key's policy in the same lookup."""
+    policy = KeyPolicy(tier="pro", requests_per_minute=600)
+    auth = Authentication([])
+    auth.replace_keys(["a", "b"], {"a": policy})
+
+    record = auth.authenticate("a")
+    assert record.policy is policy
+    assert record.key_id == Authentication.key_id("a")
+    assert auth.authenticate("b").policy is DEFAULT_POLICY
+    assert auth.authenticate("c") is None
+
+
+def test_rate_limit_per_client_limit():
+    """Test that a per-call limit overrides the limiter default."""
+    limiter = RateLimiter(limit=1, window=60)
+
+    assert limiter.check_rate_limit("pro", limit=3)[0] is True
+    assert limiter.check_rate_limit("pro", limit=3)[0] is True
+    assert limiter.check_rate_limit("pro", limit=3)[0] is True
+    assert limiter.check_rate_limit("pro", limit=3)[0] is False
@@ -0,0 +1,57 @@
+"""Unit tests for the background process sampler."""
+
+import time
+
+from src.server.monitoring import Monitoring
+from src.server.process_sampler import ProcessSampler
+
+
+def test_first_sample_taken_on_creation():
+    """Test that a snapshot is available before the thread starts."""
+    sampler = ProcessSampler(interval=60)
+    sample = sampler.latest()
+    assert sample["rss_bytes"] > 0
+    assert sample["threads"] >= 1
+    assert sample["ctx_switches_voluntary"] >= 0
+    assert sample["cpu_user_seconds"] + sample["cpu_system_seconds"] > 0
+    assert sampler.get_stats()["running"] is False
+
+
+def test_history_is_bounded():
+    """Test that only the most recent samples are kept."""
+    sampler = ProcessSampler(interval=60, history=3)
+    for _ in range(5):
+        sampler.sample()
+    history = sampler.history()
+    assert len(history) == 3
+    assert history[-1] is sampler.latest()
+    assert [s["timestamp"] for s in history] == sorted(s["timestamp"] for s in history)
+
+
+def test_background_thread_samples_until_stopped():
+    """Test that the thread adds samples on its interval and stops cleanly."""
+    sampler = ProcessSampler(interval=0.02, history=100)
+    sampler.start()
+    try:
+        deadline = time.time() + 5
+        while len(sampler.samples) < 4 and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(sampler.samples) >= 4
+        assert sampler.get_stats()["running"] is True
+    finally:
+        sampler.stop()
+    held = len(sampler.samples)
+    time.sleep(0.1)
+    assert len(sampler.samples) == held
+    assert sampler.get_stats()["running"] is False
+
+
+def test_monitoring_reads_cached_sample():
+    """Test that system stats come from the snapshot without sleeping."""
+    monitor = Monitoring(log_level="WARNING")
+    started = time.perf_counter()
+    stats = monitor.get_system_stats()
+    assert time.perf_counter() - started < 0.05
+    assert stats["sampled_at"] == monitor.sampler.latest()["timestamp"]
+    assert stats["memory_usage_mb"] > 0
+    assert monitor.get_stats()["process"]["rss_bytes"] == monitor.sampler.latest()["rss_bytes"]
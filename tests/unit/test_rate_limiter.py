@@ -2,6 +2,7 @@
 """Unit tests for rate limiter module."""
 
 import pytest
+import threading
 import time
 from src.server.rate_limiter import RateLimiter
 
@@ -69,3 +70,185 @@ def test_clear_old_entries():
     
     # Client should be removed
     assert "temp_client" not in limiter.requests
+
+
+def test_unknown_algorithm():
+    """Test that an unknown algorithm is rejected."""
+    with pytest.raises(ValueError):
+        RateLimiter(algorithm="leaky")
+
+
+def test_gcra_allows_burst_then_limits():
+    """Test that GCRA allows a full burst and then rejects with a retry delay."""
+    limiter = RateLimiter(limit=5, window=60, algorithm="gcra")
+
+    results = [limiter.check_rate_limit("client5") for _ in range(5)]
+    assert all(allowed for allowed, _, _ in results)
+    assert [remaining for _, _, remaining in results] == [4, 3, 2, 1, 0]
+
+    allowed, retry_after, remaining = limiter.check_rate_limit("client5")
+    assert allowed is False
+    assert retry_after == 12
+    assert remaining == 0
+
+    # Other clients and per-call limits are independent
+    assert limiter.check_rate_limit("client6")[0] is True
+    assert limiter.check_rate_limit("client8", limit=10)[2] == 9
+
+
+def test_gcra_refills_over_time():
+    """Test that GCRA allows requests again as the window passes."""
+    limiter = RateLimiter(limit=2, window=0.1, algorithm="gcra")
+    limiter.check_rate_limit("client7")
+    limiter.check_rate_limit("client7")
+    assert limiter.check_rate_limit("client7")[0] is False
+
+    time.sleep(0.06)
+    assert limiter.check_rate_limit("client7")[0] is True
+
+    # One number per client, dropped once the burst is fully restored
+    assert isinstance(limiter.arrivals["client7"], float)
+    time.sleep(0.15)
+    limiter.clear_old_entries()
+    assert "client7" not in limiter.arrivals
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_window", "gcra"])
+def test_client_table_is_bounded(algorithm):
+    """Test that the least recently seen clients are evicted past the cap."""
+    limiter = RateLimiter(limit=5, window=60, algorithm=algorithm, max_clients=100, shards=1)
+    limiter.check_rate_limit("regular")
+    for i in range(1000):
+        limiter.check_rate_limit(f"spray-{i}")
+        if i % 50 == 0:
+            limiter.check_rate_limit("regular")
+
+    stats = limiter.get_stats()
+    assert stats["clients"] == 100
+    assert stats["evicted"] == 901
+    assert stats["expiry_queue"] <= 2 * 100 + 2
+    # Recently seen clients survive the spray
+    assert limiter.check_rate_limit("regular")[2] < 4
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_window", "gcra"])
+def test_expired_clients_removed_incrementally(algorithm):
+    """Test that expired clients are dropped by later checks without a full sweep."""
+    limiter = RateLimiter(limit=5, window=0.05, algorithm=algorithm, shards=1)
+    for i in range(4):
+        limiter.check_rate_limit(f"client-{i}")
+    time.sleep(0.1)
+
+    limiter.check_rate_limit("new-1")
+    limiter.check_rate_limit("new-2")
+
+    stats = limiter.get_stats()
+    assert stats["expired"] == 4
+    assert stats["clients"] == 2
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_window", "gcra"])
+def test_layers_checked_and_debited_together(algorithm):
+    """Test that a request is debited from every layer only if all allow it."""
+    limiter = RateLimiter(limit=100, window=60, algorithm=algorithm)
+    layers = [("global", "*", 10), ("key", "key1", 5)]
+
+    assert limiter.check_layers(layers, cost=3) == (True, None, 2, None)
+    allowed, retry_after, remaining, layer = limiter.check_layers(layers, cost=3)
+    assert (allowed, remaining, layer) == (False, 0, "key")
+    assert retry_after > 0
+
+    # The rejected request did not use any of the global layer
+    assert limiter.check_layers([("global", "*", 10), ("key", "key2", 5)], cost=5)[:2] == (True, None)
+    assert limiter.check_layers([("global", "*", 10), ("key", "key3", 5)], cost=3)[3] == "global"
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_window", "gcra"])
+def test_cost_above_limit_uses_whole_limit(algorithm):
+    """Test that a request costing more than a layer's limit can still pass once."""
+    limiter = RateLimiter(limit=5, window=60, algorithm=algorithm)
+
+    assert limiter.check_layers([("tool", "report", 5)], cost=50)[:3] == (True, None, 0)
+    assert limiter.check_layers([("tool", "report", 5)], cost=1)[0] is False
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_window", "gcra"])
+def test_smoothing_delays_instead_of_rejecting(algorithm):
+    """Test that requests within max_delay of the limit are held, later ones rejected."""
+    limiter = RateLimiter(limit=4, window=1, algorithm=algorithm)
+    layers = [("key", "key1", 4)]
+    assert limiter.check_layers(layers, max_delay=0.5)[:2] == (True, None)
+    time.sleep(0.6)
+    # Use up the rest of the limit until the first request is held
+    for _ in range(5):
+        allowed, wait, remaining, layer = limiter.check_layers(layers, max_delay=0.5)
+        assert allowed is True
+        if wait is not None:
+            break
+    assert 0 < wait <= 0.5
+    assert remaining == 0
+    # Later requests queue behind the held one until the delay budget runs out
+    waits = []
+    while True:
+        allowed, wait, _, layer = limiter.check_layers(layers, max_delay=0.5)
+        if not allowed:
+            break
+        waits.append(wait)
+    assert layer == "key"
+    assert waits == sorted(waits)
+    assert all(w <= 0.5 for w in waits)
+    assert limiter.get_stats()["delayed"] == len(waits) + 1
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_window", "gcra"])
+def test_no_smoothing_by_default(algorithm):
+    """Test that without max_delay requests over the limit are rejected."""
+    limiter = RateLimiter(limit=1, window=1, algorithm=algorithm)
+    assert limiter.check_layers([("key", "key1", 1)])[0] is True
+    assert limiter.check_layers([("key", "key1", 1)])[0] is False
+    assert limiter.get_stats()["delayed"] == 0
+
+
+def test_sharded_table_is_bounded():
+    """Test that the client cap holds across all stripes."""
+    limiter = RateLimiter(limit=5, window=60, max_clients=160, shards=16)
+    for i in range(5000):
+        limiter.check_rate_limit(f"spray-{i}")
+
+    stats = limiter.get_stats()
+    assert stats["shards"] == 16
+    assert stats["clients"] <= 160
+    assert stats["evicted"] == 5000 - stats["clients"]
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_window", "gcra"])
+def test_concurrent_checks_never_exceed_limit(algorithm):
+    """Stress test: many threads on shared and separate clients stay within the limits."""
+    limiter = RateLimiter(limit=200, window=60, algorithm=algorithm, shards=4)
+    allowed = {"shared": 0, "layered": 0}
+    counts_lock = threading.Lock()
+    barrier = threading.Barrier(16)
+
+    def worker(index):
+        barrier.wait()
+        own = 0
+        for _ in range(100):
+            if limiter.check_rate_limit("shared")[0]:
+                with counts_lock:
+                    allowed["shared"] += 1
+            layers = [("global", "*", 300), ("key", f"key-{index % 4}", 100)]
+            if limiter.check_layers(layers, cost=2)[0]:
+                with counts_lock:
+                    allowed["layered"] += 1
+            own += limiter.check_rate_limit(f"own-{index}")[0]
+        assert own == 100
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert allowed["shared"] == 200
+    # 150 requests of 2 units fill the global layer; each key allows 50
+    assert allowed["layered"] == 150
@@ -0,0 +1,100 @@
+"""Unit tests for tool registry listing."""
+
+import pytest
+from src.tools.registry import ToolRegistry
+
+
+@pytest.fixture
+def registry():
+    """Create a registry with a few hundred generated tools."""
+    registry = ToolRegistry(page_size=50)
+    registry.tools.clear()
+    for i in range(300):
+        prefix = "billing" if i % 3 == 0 else "crm"
+        registry.register_tool(
+            name=f"{prefix}_{i:04d}",
+            handler=lambda args: args,
+            description=f"Generated tool {i}",
+            schema={},
+            tags=["read"] if i % 2 == 0 else ["write"]
+        )
+    return registry
+
+
+def _collect(registry, **filters):
+    """Walk every page and return all listed names."""
+    names, cursor = [], None
+    while True:
+        page, cursor = registry.list_tools_page(cursor=cursor, **filters)
+        names.extend(tool["name"] for tool in page)
+        if cursor is None:
+            return names
+
+
+def test_pages_cover_registry_in_order(registry):
+    """Test that paging returns every tool once in stable name order."""
+    first_page, cursor = registry.list_tools_page()
+    assert len(first_page) == 50
+    assert cursor is not None
+
+    names = _collect(registry)
+    assert names == sorted(registry.tools)
+
+
+def test_limit_is_capped_at_page_size(registry):
+    """Test that clients cannot request pages larger than page_size."""
+    page, _ = registry.list_tools_page(limit=10)
+    assert len(page) == 10
+
+    page, _ = registry.list_tools_page(limit=1000)
+    assert len(page) == 50
+
+
+def test_prefix_filter(registry):
+    """Test filtering by name prefix."""
+    names = _collect(registry, prefix="billing_")
+    assert len(names) == 100
+    assert all(name.startswith("billing_") for name in names)
+
+
+def test_tag_filter(registry):
+    """Test filtering by tag, combined with a prefix."""
+    names = _collect(registry, tag="read", prefix="crm_")
+    expected = sorted(n for n, t in registry.tools.items() if "read" in t["tags"] and n.startswith("crm_"))
+    assert names == expected
+    assert _collect(registry, tag="missing") == []
+
+
+def test_cursor_survives_registry_changes(registry):
+    """Test that a cursor stays valid after tools are added."""
+    page, cursor = registry.list_tools_page()
+    registry.register_tool("aaa_new", lambda args: args, "New tool", {})
+
+    next_page, _ = registry.list_tools_page(cursor=cursor)
+    assert next_page[0]["name"] > page[-1]["name"]
+
+
+def test_invalid_cursor(registry):
+    """Test that malformed cursors are rejected."""
+    with pytest.raises(ValueError):
+        registry.list_tools_page(cursor="***")
+
+
+def test_call_cost():
+    """Test declared tool costs, fixed or depending on the arguments."""
+    registry = ToolRegistry()
+    registry.register_tool("report", lambda **kwargs: None, "Report", {}, rate_cost=25, rate_limit=100)
+
+    assert registry.call_cost("echo", {"message": "hi"}) == 1
+    assert registry.call_cost("system_info", {"detail_level": "detailed"}) == 20
+    assert registry.call_cost("system_info", {}) == 1
+    assert registry.call_cost("report") == 25
+    assert registry.get_tool("report")["rate_limit"] == 100
+    assert registry.call_cost("missing") == 1
+
+
+@pytest.mark.parametrize("filters", [{"prefix": 5}, {"tag": ["read"]}, {"cursor": 3}, {"limit": "10"}])
+def test_wrongly_typed_filters_rejected(registry, filters):
+    """Test that non-string filters raise ValueError rather than TypeError."""
+    with pytest.raises(ValueError):
+        registry.list_tools_page(**filters)
@@ -0,0 +1,61 @@
+"""Unit tests for the request log ring buffer."""
+
+from src.server.monitoring import Monitoring
+from src.server.request_log import RequestLog
+
+
+def test_keeps_most_recent_requests_in_order():
+    """Test that the buffer wraps and iterates oldest first."""
+    log = RequestLog(capacity=3)
+    for i in range(5):
+        log.append(float(i), f"client-{i}", "/mcp", 200, True, 0.01)
+
+    entries = list(log)
+    assert len(log) == 3
+    assert log.total == 5
+    assert [e['timestamp'] for e in entries] == [2.0, 3.0, 4.0]
+    assert entries[-1] == {
+        'timestamp': 4.0,
+        'client_id': 'client-4',
+        'endpoint': '/mcp',
+        'status': 200,
+        'authenticated': True,
+        'duration': 0.01
+    }
+
+
+def test_recent_errors_newest_first():
+    """Test error queries over the status column."""
+    log = RequestLog(capacity=10)
+    for i, status in enumerate([200, 403, 200, 429, 500, 200]):
+        log.append(float(i), "client", "/mcp", status, status != 403, 0.0)
+
+    assert [e['status'] for e in log.recent_errors(2)] == [500, 429]
+    assert [e['status'] for e in log.recent_errors()] == [500, 429, 403]
+    stats = log.get_stats()
+    assert stats['errors'] == 3
+    assert stats['error_rate'] == 0.5
+
+
+def test_intern_table_stays_bounded():
+    """Test that many distinct clients do not grow memory past the buffer."""
+    log = RequestLog(capacity=10)
+    for i in range(1000):
+        log.append(float(i), f"10.0.{i // 256}.{i % 256}", "/mcp", 200, True, 0.0)
+
+    stats = log.get_stats()
+    assert stats['interned_strings'] <= 4 * 10 + 16 + 2
+    assert stats['compactions'] > 0
+    # Entries still resolve to the right strings after compaction
+    assert [e['client_id'] for e in log][-2:] == ["10.0.3.230", "10.0.3.231"]
+
+
+def test_monitoring_uses_ring_buffer():
+    """Test that Monitoring records into a fixed-size log."""
+    monitor = Monitoring(max_requests=5)
+    for i in range(12):
+        monitor.log_request("client", "/health", 500 if i == 11 else 200, True, 0.001)
+
+    assert len(monitor.requests) == 5
+    assert monitor.get_stats()["total_requests"] == 12
+    assert monitor.get_recent_errors()[0]['status'] == 500
@@ -0,0 +1,129 @@
+"""Unit tests for file resources."""
+
+import base64
+import json
+import os
+
+import pytest
+from src.server.resources import ResourceManager, ResourceNotFoundError, ResourceTooLargeError
+
+
+def _read(manager, uri, offset=0, length=None, request_id=1):
+    """Read a resource and parse the streamed response."""
+    with manager.open_read(uri, offset, length) as read:
+        body = b"".join(bytes(piece) for piece in read.iter_response(request_id))
+    return json.loads(body)
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "notes.txt").write_text("héllo world\n" * 3, encoding="utf-8")
+    (tmp_path / "data.bin").write_bytes(bytes(range(256)) * 40)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.json").write_text('{"a": 1}')
+    (tmp_path / "sub-file.txt").write_text("x")
+    return tmp_path
+
+
+def test_list_resources_in_path_order(root):
+    """Test that files are listed depth first in sorted order."""
+    manager = ResourceManager([str(root)])
+
+    resources, next_cursor = manager.list_resources()
+
+    assert [r["name"] for r in resources] == ["data.bin", "notes.txt", "sub/a.json", "sub-file.txt"]
+    assert next_cursor is None
+    assert resources[0]["uri"] == (root / "data.bin").resolve().as_uri()
+    assert resources[0]["size"] == 10240
+    assert resources[1]["mimeType"] == "text/plain"
+
+
+def test_list_resources_pagination(root):
+    """Test that cursors walk every resource exactly once."""
+    manager = ResourceManager([str(root)])
+
+    names, cursor = [], None
+    while True:
+        page, cursor = manager.list_resources(cursor=cursor, limit=1)
+        names.extend(r["name"] for r in page)
+        if cursor is None:
+            break
+
+    assert names == ["data.bin", "notes.txt", "sub/a.json", "sub-file.txt"]
+
+
+def test_invalid_cursor(root):
+    """Test that malformed cursors are rejected."""
+    manager = ResourceManager([str(root)])
+
+    with pytest.raises(ValueError):
+        manager.list_resources(cursor="not a cursor!")
+
+
+def test_read_text(root):
+    """Test that whole text files are returned as text."""
+    manager = ResourceManager([str(root)], chunk_size=5)
+
+    response = _read(manager, (root / "notes.txt").as_uri(), request_id=7)
+
+    assert response["id"] == 7
+    content = response["result"]["contents"][0]
+    assert content["text"] == "héllo world\n" * 3
+    assert content["mimeType"] == "text/plain"
+
+
+def test_read_binary_range(root):
+    """Test that byte ranges are returned as base64 blobs."""
+    manager = ResourceManager([str(root)], chunk_size=100)
+
+    content = _read(manager, (root / "data.bin").as_uri(), offset=250, length=300)["result"]["contents"][0]
+
+    assert base64.b64decode(content["blob"]) == (bytes(range(256)) * 40)[250:550]
+    assert content["_meta"] == {"size": 10240, "offset": 250, "length": 300}
+
+
+def test_read_with_mmap(root):
+    """Test that large files are served through mmap."""
+    manager = ResourceManager([str(root)], chunk_size=999, mmap_threshold=1024)
+
+    content = _read(manager, (root / "data.bin").as_uri())["result"]["contents"][0]
+
+    assert base64.b64decode(content["blob"]) == bytes(range(256)) * 40
+    assert manager.get_stats()["mmap_reads"] == 1
+
+
+def test_read_size_limit(root):
+    """Test that reads above max_file_size_mb must use ranges."""
+    manager = ResourceManager([str(root)], max_file_size_mb=1024 / (1024 * 1024))
+    uri = (root / "data.bin").as_uri()
+
+    with pytest.raises(ResourceTooLargeError):
+        manager.open_read(uri)
+
+    content = _read(manager, uri, offset=0, length=1024)["result"]["contents"][0]
+    assert len(base64.b64decode(content["blob"])) == 1024
+
+
+def test_paths_outside_roots_are_not_found(root, tmp_path_factory):
+    """Test that traversal and symlinks cannot escape the roots."""
+    outside = tmp_path_factory.mktemp("outside") / "secret.txt"
+    outside.write_text("secret")
+    os.symlink(outside, root / "link.txt")
+    manager = ResourceManager([str(root)])
+
+    for uri in [outside.as_uri(), (root / "link.txt").as_uri(),
+                f"file://{root}/../{outside.parent.name}/secret.txt", "http://example.com/x", None]:
+        with pytest.raises(ResourceNotFoundError):
+            manager.open_read(uri)
+    assert "link.txt" not in [r["name"] for r in manager.list_resources()[0]]
+
+
+def test_invalid_range(root):
+    """Test that invalid byte ranges are rejected."""
+    manager = ResourceManager([str(root)])
+    uri = (root / "notes.txt").as_uri()
+
+    with pytest.raises(ValueError):
+        manager.open_read(uri, offset=-1)
+    with pytest.raises(ValueError):
+        manager.open_read(uri, offset=10 ** 6)
@@ -0,0 +1,131 @@
+"""Unit tests for the weighted fair scheduler."""
+
+import threading
+import time
+
+import pytest
+from src.server.scheduler import FairScheduler, SchedulerQueueFullError, SchedulerTimeoutError
+
+
+def _queue_calls(scheduler, calls, order):
+    """Queue calls for the given tenants, recording the order they are granted."""
+    threads = []
+    for tenant in calls:
+        def run(tenant=tenant):
+            scheduler.acquire(tenant)
+            order.append(tenant)
+        thread = threading.Thread(target=run)
+        thread.start()
+        threads.append(thread)
+        # Keep enqueue order deterministic
+        time.sleep(0.01)
+    return threads
+
+
+def _drain(scheduler, threads, count):
+    """Release slots one at a time until count calls were granted."""
+    for _ in range(count):
+        scheduler.release()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join(timeout=1)
+
+
+def test_immediate_grant_when_idle():
+    """Test that calls run without queueing while slots are free."""
+    scheduler = FairScheduler(max_concurrent=2)
+
+    assert scheduler.acquire("a") == 0.0
+    assert scheduler.acquire("b") == 0.0
+    assert scheduler.get_stats()["active"] == 2
+
+
+def test_round_robin_between_tenants():
+    """Test that a backlogged tenant cannot starve another tenant."""
+    scheduler = FairScheduler(max_concurrent=1)
+    scheduler.acquire("batch")
+    order = []
+
+    threads = _queue_calls(scheduler, ["batch"] * 4 + ["interactive"] * 2, order)
+    assert scheduler.get_stats()["tenants"]["batch"]["queued"] == 4
+
+    _drain(scheduler, threads, 6)
+
+    # The interactive tenant is served second, not after the whole batch backlog
+    assert order[:4] == ["batch", "interactive", "batch", "interactive"]
+
+
+def test_weights():
+    """Test that tenants are served in proportion to their weights."""
+    scheduler = FairScheduler(max_concurrent=1, weights={"gold": 2})
+    scheduler.acquire("gold")
+    order = []
+
+    threads = _queue_calls(scheduler, ["gold"] * 4 + ["basic"] * 2, order)
+    _drain(scheduler, threads, 6)
+
+    assert order == ["gold", "gold", "basic", "gold", "gold", "basic"]
+
+
+def test_queue_limit_per_tenant():
+    """Test that a tenant's queue is bounded."""
+    scheduler = FairScheduler(max_concurrent=1, max_queue_per_tenant=1)
+    scheduler.acquire("a")
+    threads = _queue_calls(scheduler, ["a"], [])
+
+    with pytest.raises(SchedulerQueueFullError):
+        scheduler.acquire("a")
+    assert scheduler.get_stats()["tenants"]["a"]["rejected"] == 1
+
+    _drain(scheduler, threads, 1)
+
+
+def test_wait_timeout():
+    """Test that a queued call gives up after its timeout."""
+    scheduler = FairScheduler(max_concurrent=1)
+    scheduler.acquire("a")
+
+    with pytest.raises(SchedulerTimeoutError):
+        scheduler.acquire("b", timeout=0.05)
+
+    stats = scheduler.get_stats()
+    assert stats["queued"] == 0
+    assert stats["tenants"]["b"]["timed_out"] == 1
+
+
+@pytest.mark.parametrize("options", [{"weights": {"a": 0}}, {"default_weight": -1}, {"quantum": 0}])
+def test_non_positive_weights_rejected(options):
+    """Test that weights which would stall round robin are refused."""
+    with pytest.raises(ValueError):
+        FairScheduler(**options)
+
+
+def test_set_weight_rejects_non_positive():
+    """Test that set_weight refuses weights that earn no credit."""
+    scheduler = FairScheduler()
+    with pytest.raises(ValueError):
+        scheduler.set_weight("a", 0)
+    assert scheduler.get_stats()["tenants"] == {}
+
+
+def test_cancel_wakes_queued_call():
+    """Test that cancelling a queued call stops its wait at once."""
+    scheduler = FairScheduler(max_concurrent=1)
+    scheduler.acquire("a")
+    callbacks = []
+
+    start = time.monotonic()
+    timer = threading.Timer(0.05, lambda: callbacks[0]())
+    timer.start()
+    with pytest.raises(SchedulerTimeoutError):
+        scheduler.acquire("b", timeout=5, on_cancel=callbacks.append)
+    assert time.monotonic() - start < 1
+
+    stats = scheduler.get_stats()
+    assert stats["queued"] == 0
+    assert stats["tenants"]["b"]["cancelled"] == 1
+    assert stats["tenants"]["b"]["timed_out"] == 0
+
+    # The released slot is not lost to the cancelled call
+    scheduler.release()
+    assert scheduler.acquire("c", timeout=0.1) == 0.0
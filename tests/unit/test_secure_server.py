@@ -0,0 +1,264 @@
+"""Tests of the secure server's request handler over real HTTP connections."""
+
+import base64
+import http.client
+import json
+import socket
+import threading
+import time
+from unittest import mock
+
+import pytest
+from src.server.policy import KeyPolicy
+from src.server.secure_server import GuardedHTTPServer, SecureMCPServer
+from src.server.tokens import TokenSigner
+
+API_KEY = "test-key-0123456789abcdef"
+LIST_ONLY_KEY = "list-only-key-0123456789abcdef"
+
+
+def serve(mcp_server):
+    """Start serving a SecureMCPServer on an ephemeral local port."""
+    mcp_server.server = GuardedHTTPServer(("127.0.0.1", 0), mcp_server._create_handler(),
+                                          mcp_server.ban_list)
+    thread = threading.Thread(target=mcp_server.server.serve_forever, daemon=True)
+    thread.start()
+    return mcp_server
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Serve a SecureMCPServer with one unrestricted key and one limited to tools/list."""
+    (tmp_path / "notes.txt").write_text("hello")
+    key_file = tmp_path / "keys.json"
+    key_file.write_text(json.dumps({"keys": [{"key": LIST_ONLY_KEY, "methods": ["tools/list"]}]}))
+    mcp_server = serve(SecureMCPServer(api_keys=[API_KEY], host="127.0.0.1", port=0,
+                                       resource_roots=[str(tmp_path)], key_file=str(key_file)))
+    yield mcp_server
+    mcp_server.stop()
+
+
+def request(server, method, path, body=None, key=API_KEY, headers=None, source="127.0.0.1"):
+    """Send a request from the source address and return (status, decoded body)."""
+    connection = http.client.HTTPConnection("127.0.0.1", server.server.server_address[1], timeout=10,
+                                            source_address=(source, 0))
+    all_headers = {"Content-Type": "application/json"}
+    if key is not None:
+        all_headers["Authorization"] = f"Bearer {key}"
+    all_headers.update(headers or {})
+    data = body if isinstance(body, (bytes, type(None))) else json.dumps(body).encode("utf-8")
+    try:
+        connection.request(method, path, body=data, headers=all_headers)
+        response = connection.getresponse()
+        return response.status, response.read().decode("utf-8")
+    finally:
+        connection.close()
+
+
+def endpoints_recorded(server, expected=3, timeout=3.0):
+    """Get the recorded endpoints once at least the expected number are in.
+
+    Requests are recorded after their response is sent, so the last one
+    may still be in progress when the client has its response.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        endpoints = {endpoint for endpoint, _, _ in server.monitor.latency.totals()}
+        if len(endpoints) >= expected or time.monotonic() > deadline:
+            return endpoints
+        time.sleep(0.02)
+
+
+def rpc(server, method, params=None, key=API_KEY):
+    """Send a JSON-RPC request to /mcp and return (status, response)."""
+    status, body = request(server, "POST", "/mcp",
+                           {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}, key=key)
+    return status, json.loads(body)
+
+
+@pytest.mark.parametrize("params", [{"prefix": 5}, {"tag": ["read"]}, {"cursor": {"a": 1}}, {"limit": "10"}])
+def test_tools_list_rejects_wrongly_typed_params(server, params):
+    """Test that non-string filters get invalid params instead of a dropped connection."""
+    status, response = rpc(server, "tools/list", params)
+    assert status == 200
+    assert response["error"]["code"] == -32602
+
+
+@pytest.mark.parametrize("method, params", [
+    ("resources/read", {"uri": "notes.txt"}),
+    ("resources/list", {}),
+    ("tools/call", {"name": "echo", "arguments": {"message": "hi"}}),
+])
+def test_method_allowlist_applies_to_every_dispatch_path(server, method, params):
+    """Test that a key limited to tools/list is refused other methods, streamed or not."""
+    status, response = rpc(server, method, params, key=LIST_ONLY_KEY)
+    assert status == 200
+    assert response["error"]["code"] == -32003
+
+    status, body = request(server, "POST", "/mcp",
+                           {"jsonrpc": "2.0", "id": 2, "method": method, "params": params},
+                           key=LIST_ONLY_KEY, headers={"Accept": "text/event-stream"})
+    assert json.loads(body)["error"]["code"] == -32003
+
+    status, response = rpc(server, "tools/list", key=LIST_ONLY_KEY)
+    assert "result" in response
+
+
+def test_method_allowlist_applies_to_notifications(server):
+    """Test that notifications are refused for keys not allowed to send them."""
+    status, body = request(server, "POST", "/mcp",
+                           {"jsonrpc": "2.0", "method": "notifications/cancelled",
+                            "params": {"requestId": 1}}, key=LIST_ONLY_KEY)
+    assert json.loads(body)["error"]["code"] == -32003
+
+    status, body = request(server, "POST", "/mcp",
+                           {"jsonrpc": "2.0", "method": "notifications/cancelled",
+                            "params": {"requestId": 1}})
+    assert status == 202
+
+
+def test_bad_tokens_do_not_ban_valid_tokens(tmp_path):
+    """Test that garbage tokens from one client do not lock out another client's token."""
+    mcp_server = serve(SecureMCPServer(api_keys=[API_KEY], host="127.0.0.1", port=0,
+                                       token_secrets=["secret"], ban_threshold=3))
+    try:
+        status, body = request(mcp_server, "POST", "/auth/token")
+        token = json.loads(body)["access_token"]
+        for i in range(5):
+            try:
+                request(mcp_server, "GET", "/api/tools", key=f"{token[:12]}garbage{i}", source="127.0.0.2")
+            except (ConnectionError, http.client.RemoteDisconnected):
+                pass  # The attacker's IP is banned, which is expected
+
+        assert mcp_server.ban_list.is_ip_banned("127.0.0.2")
+        status, _ = request(mcp_server, "GET", "/api/tools", key=token)
+        assert status == 200
+        assert mcp_server.ban_list.get_stats()["tracked_prefixes"] == 0
+    finally:
+        mcp_server.stop()
+
+
+def test_expired_tokens_do_not_count_as_failures(tmp_path):
+    """Test that a genuine but expired token gets 401 without moving towards a ban."""
+    mcp_server = serve(SecureMCPServer(api_keys=[API_KEY], host="127.0.0.1", port=0,
+                                       token_secrets=["secret"], ban_threshold=3))
+    try:
+        with mock.patch("src.server.tokens.time") as fake_time:
+            fake_time.time.return_value = 1000.0
+            expired, _ = TokenSigner(["secret"]).issue("abc123", KeyPolicy(), ttl=60)
+        for _ in range(5):
+            status, body = request(mcp_server, "GET", "/api/tools", key=expired)
+            assert status == 401
+            assert "expired" in json.loads(body)["message"]
+
+        assert mcp_server.ban_list.get_stats()["failures"] == 0
+        status, _ = request(mcp_server, "GET", "/api/tools")
+        assert status == 200
+    finally:
+        mcp_server.stop()
+
+
+def test_malformed_bodies_are_rate_limited(tmp_path):
+    """Test that bodies which fail to parse are charged against the rate limit."""
+    mcp_server = serve(SecureMCPServer(api_keys=[API_KEY], host="127.0.0.1", port=0, ip_rate_limit=3))
+    try:
+        for body in (b"{broken", b"[1, 2]", b'{"method": 5}'):
+            status, _ = request(mcp_server, "POST", "/mcp", body)
+            assert status == 400
+
+        status, body = request(mcp_server, "POST", "/mcp", b"{broken")
+        assert status == 429
+        assert json.loads(body)["error"]["data"]["layer"] == "ip"
+        status, _ = rpc(mcp_server, "tools/list")
+        assert status == 429
+    finally:
+        mcp_server.stop()
+
+
+def test_unknown_requests_share_one_endpoint(server):
+    """Test that junk paths and methods are recorded as other, whatever their status."""
+    for i in range(5):
+        request(server, "OPTIONS", f"/junk-{i}")
+        request(server, "GET", f"/junk-{i}", key=None)
+        request(server, "GET", f"/junk-{i}")
+        request(server, "PUT", f"/junk-{i}")
+        request(server, "DELETE", "/mcp")
+    request(server, "OPTIONS", "/mcp")
+    rpc(server, "tools/list")
+
+    assert endpoints_recorded(server) == {"other", "OPTIONS /mcp", "POST /mcp"}
+
+
+def test_junk_requests_do_not_add_metric_series(tmp_path):
+    """Test that the number of exported series stays fixed however many junk requests arrive."""
+    mcp_server = serve(SecureMCPServer(api_keys=[API_KEY], host="127.0.0.1", port=0,
+                                       metrics_token="scrape", ban_threshold=1000))
+    mcp_server.metrics.cache_seconds = 0
+
+    def series():
+        status, body = request(mcp_server, "GET", "/metrics", key="scrape")
+        assert status == 200
+        return [line for line in body.splitlines() if line.startswith("mcp_request_duration_seconds_count")]
+
+    def junk(round_):
+        for i in range(20):
+            request(mcp_server, "OPTIONS", f"/junk-{round_}-{i}")
+            request(mcp_server, "GET", f"/junk-{round_}-{i}", key=None)
+            request(mcp_server, "PUT", f"/junk-{round_}-{i}")
+            request(mcp_server, "POST", f"/junk-{round_}-{i}", b"{}")
+
+    try:
+        series()  # Scrapes are recorded too, so the first one adds a series
+        junk(0)
+        before = len(series())
+        junk(1)
+        assert len(series()) == before
+    finally:
+        mcp_server.stop()
+
+
+@pytest.mark.parametrize("meta", ["async", ["async"], 5])
+def test_tools_call_rejects_non_object_meta(server, meta):
+    """Test that a malformed _meta gets invalid params instead of a dropped connection."""
+    status, response = rpc(server, "tools/call", {"name": "echo", "arguments": {"message": "hi"}, "_meta": meta})
+    assert status == 200
+    assert response["error"]["code"] == -32602
+
+
+def test_notification_with_list_params_is_ignored(server):
+    """Test that a notification with non-object params is acknowledged and dropped."""
+    status, body = request(server, "POST", "/mcp",
+                           {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": [1, "why"]})
+    assert status == 202
+    assert body == ""
+
+
+@pytest.mark.parametrize("method", ["jobs/get", "jobs/result", "jobs/cancel"])
+@pytest.mark.parametrize("job_id", [["abc"], {"id": "abc"}, 5])
+def test_jobs_reject_non_string_job_id(server, method, job_id):
+    """Test that a wrongly typed jobId gets invalid params instead of a dropped connection."""
+    status, response = rpc(server, method, {"jobId": job_id})
+    assert status == 200
+    assert response["error"]["code"] == -32602
+
+
+def test_token_with_malformed_claims_is_a_failed_authentication(server):
+    """Test that an unhashable sid claim gets 403 and counts as a failure."""
+    payload = base64.urlsafe_b64encode(json.dumps({"sid": [], "exp": "soon"}).encode("utf-8"))
+    token = f"mcp1.{payload.decode('ascii').rstrip('=')}.AAAA"
+
+    status, _ = request(server, "GET", "/api/tools", key=token)
+    assert status == 403
+    assert server.ban_list.get_stats()["failures"] == 1
+
+
+@pytest.mark.parametrize("request_line", [b"GET /health HTTP/9.x\r\n\r\n",
+                                          b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n"])
+def test_rejected_request_lines_are_recorded_as_other(server, request_line):
+    """Test that requests refused while parsing the request line are still recorded."""
+    with socket.create_connection(("127.0.0.1", server.server.server_address[1]), timeout=10) as sock:
+        sock.sendall(request_line)
+        assert b"Error response" in sock.makefile("rb").read()
+
+    assert endpoints_recorded(server, expected=1) == {"other"}
+    assert [status for _, _, status in server.monitor.latency.totals()] == ["4xx"]
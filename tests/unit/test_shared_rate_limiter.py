@@ -0,0 +1,105 @@
+"""Unit tests for the shared-memory rate limiter."""
+
+import multiprocessing
+
+import pytest
+from src.server.shared_rate_limiter import SharedRateLimiter, shared_memory_available
+
+pytestmark = pytest.mark.skipif(not shared_memory_available(), reason="requires fcntl")
+
+
+def _use_limit(path, client_id, count, results):
+    """Make count checks from another process and report how many were allowed."""
+    limiter = SharedRateLimiter(path, limit=50, window=60)
+    results.put(sum(limiter.check_rate_limit(client_id)[0] for _ in range(count)))
+    limiter.close()
+
+
+def test_limits_like_gcra(tmp_path):
+    """Test the burst, remaining count and retry delay."""
+    limiter = SharedRateLimiter(str(tmp_path / "limits"), limit=5, window=60)
+
+    remaining = [limiter.check_rate_limit("client1")[2] for _ in range(5)]
+    assert remaining == [4, 3, 2, 1, 0]
+    assert limiter.check_rate_limit("client1") == (False, 12, 0)
+    assert limiter.check_rate_limit("client2")[0] is True
+    limiter.close()
+
+
+def test_state_shared_between_instances(tmp_path):
+    """Test that two limiters on the same file enforce one limit."""
+    path = str(tmp_path / "limits")
+    first = SharedRateLimiter(path, limit=3, window=60)
+    second = SharedRateLimiter(path, limit=3, window=60)
+
+    assert first.check_rate_limit("client1")[0] is True
+    assert second.check_rate_limit("client1")[0] is True
+    assert first.check_rate_limit("client1")[0] is True
+    assert second.check_rate_limit("client1")[0] is False
+    assert second.get_stats()["clients"] == 1
+    first.close()
+    second.close()
+
+
+def test_state_shared_between_processes(tmp_path):
+    """Test that concurrent worker processes together stay within the limit."""
+    path = str(tmp_path / "limits")
+    SharedRateLimiter(path, limit=50, window=60).close()
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_use_limit, args=(path, "client1", 40, results))
+               for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+
+    assert sum(results.get(timeout=5) for _ in workers) == 50
+
+
+def test_full_bucket_replaces_oldest(tmp_path):
+    """Test that a full table replaces clients instead of growing."""
+    limiter = SharedRateLimiter(str(tmp_path / "limits"), limit=5, window=60, buckets=1)
+    for i in range(20):
+        assert limiter.check_rate_limit(f"client-{i}")[0] is True
+
+    stats = limiter.get_stats()
+    assert stats["capacity"] == 8
+    assert stats["clients"] == 8
+    assert stats["evicted"] == 12
+    limiter.close()
+
+
+def test_rejects_other_files(tmp_path):
+    """Test that a file that is not a rate limit table is refused."""
+    path = tmp_path / "other"
+    path.write_bytes(b"not a table" * 10)
+    with pytest.raises(ValueError):
+        SharedRateLimiter(str(path))
+
+
+def test_layers_share_buckets(tmp_path):
+    """Test layered checks, including layers that land in the same bucket."""
+    limiter = SharedRateLimiter(str(tmp_path / "limits"), limit=100, window=60, buckets=1)
+    layers = [("global", "*", 10), ("key", "key1", 5), ("ip", "10.0.0.1", 100)]
+
+    assert limiter.check_layers(layers, cost=3) == (True, None, 2, None)
+    assert limiter.check_layers(layers, cost=3)[3] == "key"
+    assert limiter.check_layers([("global", "*", 10), ("key", "key2", 5)], cost=5)[0] is True
+    assert limiter.get_stats()["clients"] == 4
+    limiter.close()
+
+
+def test_smoothing(tmp_path):
+    """Test that the shared limiter holds requests within max_delay."""
+    limiter = SharedRateLimiter(str(tmp_path / "limits"), limit=4, window=1)
+    layers = [("key", "key1", 4)]
+    for _ in range(4):
+        assert limiter.check_layers(layers, max_delay=0.5)[:2] == (True, None)
+
+    allowed, wait, _, _ = limiter.check_layers(layers, max_delay=0.5)
+    assert allowed is True and 0.2 <= wait <= 0.26
+    assert limiter.check_layers(layers, max_delay=0.5)[1] == pytest.approx(0.5, abs=0.01)
+    assert limiter.check_layers(layers, max_delay=0.5)[:3] == (False, 1, 0)
+    assert limiter.get_stats()["delayed"] == 2
+    limiter.close()
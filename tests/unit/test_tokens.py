@@ -0,0 +1,116 @@
+"""Unit tests for signed access tokens."""
+
+import json
+import time
+
+import pytest
+from src.server.policy import KeyPolicy
+from src.server.tokens import TOKEN_PREFIX, TokenSigner, _b64encode
+
+
+def test_issue_and_verify():
+    """Test that a token carries the key id and policy."""
+    signer = TokenSigner(["secret"])
+    policy = KeyPolicy(tier="pro", requests_per_minute=600, tools=["echo"], methods=["tools/*"])
+
+    token, expires_at = signer.issue("abc123", policy, ttl=60)
+    identity = signer.verify(token)
+
+    assert TokenSigner.is_token(token)
+    assert identity.key_id == "abc123"
+    assert identity.policy.tier == "pro"
+    assert identity.policy.requests_per_minute == 600
+    assert identity.policy.tools == ("echo",)
+    assert identity.policy.allows_method("tools/call")
+    assert identity.expires_at == expires_at
+    assert 55 <= expires_at - time.time() <= 60
+
+
+def test_verification_is_stateless_across_workers():
+    """Test that another signer with the same secret accepts the token."""
+    token, _ = TokenSigner(["shared"]).issue("abc123", KeyPolicy())
+
+    assert TokenSigner(["shared"]).verify(token).key_id == "abc123"
+    assert TokenSigner(["other"]).verify(token) is None
+
+
+def test_tampered_token_rejected():
+    """Test that changing the payload or signature invalidates the token."""
+    signer = TokenSigner(["secret"])
+    token, _ = signer.issue("abc123", KeyPolicy(tools=["echo"]))
+    prefix, payload, signature = token.split(".")
+    other, _ = signer.issue("abc123", KeyPolicy())
+    other_payload = other.split(".")[1]
+
+    assert signer.verify(f"{prefix}.{other_payload}.{signature}") is None
+    assert signer.verify(f"{prefix}.{payload}.{signature[:-2]}AA") is None
+    assert signer.verify("mcp1.not-base64!.x") is None
+    assert signer.verify("mcp1.") is None
+    assert signer.get_stats()["rejected"] == 4
+    assert not signer.is_expired(f"{prefix}.{other_payload}.{signature}")
+
+
+@pytest.mark.parametrize("claims", [
+    {"kid": "abc123", "sid": [], "exp": 4102444800},
+    {"kid": "abc123", "sid": {"a": 1}, "exp": 4102444800},
+    {"kid": "abc123", "exp": 4102444800},
+    {"kid": "abc123", "sid": "0123abcd", "exp": "soon"},
+    {"kid": "abc123", "sid": "0123abcd", "exp": True},
+])
+def test_malformed_claims_rejected(claims):
+    """Test that wrongly typed claims make a token invalid rather than raising."""
+    signer = TokenSigner(["secret"])
+    payload = _b64encode(json.dumps(claims).encode("utf-8"))
+    token = f"{TOKEN_PREFIX}{payload}.{_b64encode(b'not-a-signature')}"
+
+    assert signer.verify(token) is None
+    assert not signer.is_expired(token)
+
+
+def test_expired_token_rejected():
+    """Test that tokens stop working at their expiry, even when cached."""
+    signer = TokenSigner(["secret"])
+    token, _ = signer.issue("abc123", KeyPolicy(), ttl=1)
+    assert signer.verify(token) is not None
+    assert not signer.is_expired(token)
+
+    time.sleep(1.1)
+
+    assert signer.verify(token) is None
+    assert signer.is_expired(token)
+
+
+def test_ttl_capped():
+    """Test that requested lifetimes are capped at max_ttl."""
+    signer = TokenSigner(["secret"], max_ttl=120)
+
+    _, expires_at = signer.issue("abc123", KeyPolicy(), ttl=10 ** 6)
+
+    assert expires_at - time.time() <= 120
+
+
+def test_secret_rotation():
+    """Test that tokens signed with an older secret stay valid after rotation."""
+    old_token, _ = TokenSigner(["old"]).issue("abc123", KeyPolicy())
+    rotated = TokenSigner(["new", "old"])
+    new_token, _ = rotated.issue("abc123", KeyPolicy())
+
+    assert rotated.verify(old_token) is not None
+    assert TokenSigner(["new"]).verify(new_token) is not None
+    assert TokenSigner(["old"]).verify(new_token) is None
+
+
+def test_verified_tokens_cached():
+    """Test that repeat verifications hit the cache, which stays bounded."""
+    signer = TokenSigner(["secret"], cache_size=2)
+    tokens = [signer.issue(f"key{i}", KeyPolicy())[0] for i in range(3)]
+
+    signer.verify(tokens[0])
+    signer.verify(tokens[0])
+    for token in tokens[1:]:
+        signer.verify(token)
+
+    stats = signer.get_stats()
+    assert stats["cache_hits"] == 1
+    assert stats["verified"] == 3
+    assert stats["cached"] == 2
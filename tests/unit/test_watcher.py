@@ -0,0 +1,171 @@
+"""Unit tests for resource change detection and subscriptions."""
+
+import os
+import threading
+import time
+
+import pytest
+from src.server.notifications import NotificationHub
+from src.server.resources import ResourceManager, ResourceNotFoundError
+from src.server.watcher import ResourceSubscriptions, ResourceWatcher, inotify_available
+
+BACKENDS = [False] + ([True] if inotify_available() else [])
+
+
+class _Recorder:
+    """Collects reported changes and lets tests wait for them."""
+
+    def __init__(self):
+        self.paths = []
+        self.changed = threading.Event()
+
+    def __call__(self, path):
+        self.paths.append(path)
+        self.changed.set()
+
+
+@pytest.fixture(params=BACKENDS, ids=lambda inotify: "inotify" if inotify else "polling")
+def watcher(request):
+    recorder = _Recorder()
+    watcher = ResourceWatcher(recorder, debounce=0.05, poll_interval=0.05, use_inotify=request.param)
+    watcher.recorder = recorder
+    yield watcher
+    watcher.close()
+
+
+def test_reports_change(watcher, tmp_path):
+    """Test that modifying a watched file is reported."""
+    path = tmp_path / "a.txt"
+    path.write_text("one")
+    watcher.watch(str(path))
+    time.sleep(0.1)
+
+    path.write_text("two, longer")
+
+    assert watcher.recorder.changed.wait(2)
+    assert watcher.recorder.paths == [str(path)]
+
+
+def test_ignores_unwatched_files(watcher, tmp_path):
+    """Test that changes to other files in the directory are not reported."""
+    path = tmp_path / "a.txt"
+    path.write_text("one")
+    watcher.watch(str(path))
+
+    (tmp_path / "b.txt").write_text("other")
+
+    assert not watcher.recorder.changed.wait(0.3)
+
+
+def test_debounces_bursts(watcher, tmp_path):
+    """Test that a burst of writes is reported once."""
+    path = tmp_path / "a.txt"
+    path.write_text("start")
+    watcher.watch(str(path))
+    time.sleep(0.1)
+
+    with open(path, "a") as f:
+        for i in range(5):
+            f.write(f"line {i}\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    assert watcher.recorder.changed.wait(2)
+    time.sleep(0.3)
+    assert watcher.recorder.paths == [str(path)]
+
+
+def test_shared_watch_until_last_unwatch(watcher, tmp_path):
+    """Test that a path is watched once and kept until every watcher leaves."""
+    path = tmp_path / "a.txt"
+    path.write_text("one")
+
+    watcher.watch(str(path))
+    watcher.watch(str(path))
+    assert watcher.get_stats()["watched_paths"] == 1
+
+    watcher.unwatch(str(path))
+    assert watcher.get_stats()["watched_paths"] == 1
+    watcher.unwatch(str(path))
+    assert watcher.get_stats()["watched_paths"] == 0
+
+
+def test_subscriptions_publish_updates(tmp_path):
+    """Test that subscribers get notifications/resources/updated."""
+    path = tmp_path / "a.txt"
+    path.write_text("one")
+    hub = NotificationHub()
+    subscriptions = ResourceSubscriptions(ResourceManager([str(tmp_path)]), hub,
+                                          debounce=0.05, poll_interval=0.05, use_inotify=False)
+    stream_a = hub.subscribe("a")
+    stream_b = hub.subscribe("b")
+    try:
+        subscriptions.subscribe("a", path.as_uri())
+        subscriptions.subscribe("b", path.as_uri())
+        assert subscriptions.get_stats()["watcher"]["watched_paths"] == 1
+        time.sleep(0.1)
+
+        path.write_text("two, longer")
+
+        for stream in (stream_a, stream_b):
+            message = stream.get(timeout=2)
+            assert message["method"] == "notifications/resources/updated"
+            assert message["params"]["uri"] == path.resolve().as_uri()
+
+        subscriptions.unsubscribe("a", path.as_uri())
+        subscriptions.unsubscribe("b", path.as_uri())
+        assert subscriptions.get_stats()["subscriptions"] == 0
+        assert subscriptions.get_stats()["watcher"]["watched_paths"] == 0
+    finally:
+        subscriptions.close()
+
+
+def test_subscribe_requires_known_resource(tmp_path):
+    """Test that subscribing to an unknown resource fails."""
+    subscriptions = ResourceSubscriptions(ResourceManager([str(tmp_path)]), NotificationHub(),
+                                          use_inotify=False)
+
+    with pytest.raises(ResourceNotFoundError):
+        subscriptions.subscribe("a", (tmp_path / "missing.txt").as_uri())
+
+
+def test_subscription_limit(tmp_path):
+    """Test that a client cannot hold more than max_per_client subscriptions."""
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text(name)
+    subscriptions = ResourceSubscriptions(ResourceManager([str(tmp_path)]), NotificationHub(),
+                                          max_per_client=1, use_inotify=False)
+    try:
+        subscriptions.subscribe("a", (tmp_path / "a.txt").as_uri())
+        with pytest.raises(ValueError):
+            subscriptions.subscribe("a", (tmp_path / "b.txt").as_uri())
+        assert subscriptions.get_stats()["subscribed_resources"] == 1
+    finally:
+        subscriptions.close()
+
+
+def test_concurrent_subscribe_unsubscribe_keeps_watch_consistent(tmp_path):
+    """Test that racing subscribes and unsubscribes leave the watch matching the subscribers."""
+    path = tmp_path / "a.txt"
+    path.write_text("one")
+    uri = path.as_uri()
+    subscriptions = ResourceSubscriptions(ResourceManager([str(tmp_path)]), NotificationHub(),
+                                          use_inotify=False)
+
+    def churn(owner):
+        for _ in range(200):
+            subscriptions.subscribe(owner, uri)
+            subscriptions.unsubscribe(owner, uri)
+
+    try:
+        threads = [threading.Thread(target=churn, args=(f"client-{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert subscriptions.watcher.get_stats()["watched_paths"] == 0
+
+        subscriptions.subscribe("client-0", uri)
+        assert subscriptions.watcher.get_stats()["watched_paths"] == 1
+    finally:
+        subscriptions.close()